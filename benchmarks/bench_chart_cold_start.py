@@ -0,0 +1,65 @@
+"""Benchmark: cold-start cost of the chart renderer.
+
+Each scenario runs in a fresh interpreter, so module imports and font loading
+are measured as a new worker would see them:
+
+- import: importing analysis_tools
+- first chart: import plus the first uncached generate_charts call
+- warm-up: warm_up_charts() on its own
+- after warm-up: a first uncached generate_charts call once warmed up
+
+Run from the repository root:
+
+    python -m benchmarks.bench_chart_cold_start [--repeat 5] [--commits 1000]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+_SCENARIO = """
+import logging, tempfile, time
+logging.disable(logging.CRITICAL)
+start = time.perf_counter()
+from src.tools import analysis_tools
+imported = time.perf_counter()
+from benchmarks.bench_commit_analytics import synthetic_history
+from src.tools.commit_analytics import analyze_commits
+analysis = analyze_commits(synthetic_history({commits})[0])
+warm_up = analysis_tools.warm_up_charts() if {warm} else 0.0
+chart_start = time.perf_counter()
+analysis_tools.generate_charts(analysis, output_dir=tempfile.mkdtemp(), chart_format="{chart_format}")
+print(imported - start, warm_up, time.perf_counter() - chart_start)
+"""
+
+
+def _run(commits, warm, chart_format):
+    code = _SCENARIO.format(commits=commits, warm=warm, chart_format=chart_format)
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True,
+                            capture_output=True, text=True).stdout
+    return [float(value) for value in output.split()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--commits", type=int, default=1_000)
+    args = parser.parse_args()
+
+    print(f"{'scenario':>22} {'median (s)':>11}")
+    for chart_format in ("png", "vega"):
+        cold = [_run(args.commits, False, chart_format) for _ in range(args.repeat)]
+        warm = [_run(args.commits, True, chart_format) for _ in range(args.repeat)]
+        rows = {
+            "import": [r[0] for r in cold],
+            f"first chart ({chart_format})": [r[0] + r[2] for r in cold],
+            "warm-up": [r[1] for r in warm],
+            f"after warm-up ({chart_format})": [r[2] for r in warm],
+        }
+        for name, samples in rows.items():
+            print(f"{name:>22} {statistics.median(samples):>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
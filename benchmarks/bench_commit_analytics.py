@@ -0,0 +1,94 @@
+"""Microbenchmark: vectorized commit analytics vs. the per-commit Python loops.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_commit_analytics [--sizes 1000 10000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from src.tools.commit_analytics import (
+    author_stats,
+    category_counts,
+    classify_messages,
+    daily_histogram,
+    timestamps_of
+)
+from src.tools.commit_table import CommitTable
+
+_WORDS = ["fix", "add", "update", "docs", "remove", "merge", "refactor", "parser", "cache", "bug",
+          "feature", "readme", "test", "client", "release", "typo", "pull", "request", "ci", "deps"]
+
+
+def synthetic_history(size, seed=0):
+    """Build a CommitTable and the matching ISO dates for ``size`` commits."""
+    rng = random.Random(seed)
+    table = CommitTable()
+    start = 1_500_000_000
+    for i in range(size):
+        message = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(2, 8)))
+        table.append(f"{i:040x}", f"author{rng.randint(0, 200)}", start + rng.randint(0, 5 * 365 * 86400), message)
+    return table, table.dates()
+
+
+def legacy_pass(messages, authors, dates):
+    """The pre-vectorization loops: per-message parsing, Counter and defaultdict."""
+    day_counts = defaultdict(int)
+    for date_str in dates:
+        day_counts[datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()] += 1
+    categories = Counter()
+    for message in messages:
+        lowered = message.lower()
+        if any(kw in lowered for kw in ["fix", "bug"]):
+            categories["🐛 Bug Fixes"] += 1
+        elif any(kw in lowered for kw in ["add", "feature", "implement"]):
+            categories["✨ Features"] += 1
+        elif any(kw in lowered for kw in ["doc", "readme"]):
+            categories["📄 Documentation"] += 1
+        elif any(kw in lowered for kw in ["remove", "delete"]):
+            categories["🔥 Removals"] += 1
+        elif any(kw in lowered for kw in ["update", "upgrade"]):
+            categories["🔧 Updates"] += 1
+        elif any(kw in lowered for kw in ["merge", "pull"]):
+            categories["🔀 Merges"] += 1
+        else:
+            categories["📦 Others"] += 1
+    return day_counts, categories, Counter(authors)
+
+
+def vectorized_pass(table):
+    """The NumPy pass over a CommitTable, whose timestamps were parsed at fetch time."""
+    daily_histogram(timestamps_of(table))
+    category_counts(classify_messages(table.message))
+    author_stats(table)
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'commits':>10} {'python (s)':>12} {'numpy (s)':>12} {'speedup':>9}")
+    for size in args.sizes:
+        table, dates = synthetic_history(size)
+        legacy = _best_of(lambda: legacy_pass(table.message, table.author, dates), args.repeat)
+        vectorized = _best_of(lambda: vectorized_pass(table), args.repeat)
+        print(f"{size:>10} {legacy:>12.4f} {vectorized:>12.4f} {legacy / vectorized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Microbenchmark: compiled commit classifier vs. the original keyword scans.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_commit_classifier [--sizes 1000 100000 1000000]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.bench_commit_analytics import synthetic_history
+from src.tools.commit_classifier import CommitClassifier
+
+# Template messages resembling real histories, with the repetition they have
+_TEMPLATES = [
+    "Merge pull request #{n} from user{n}/branch-{n}",
+    "Bump requests from 2.{n}.0 to 2.{n}.1",
+    "Update README.md",
+    "Fix typo in the {word} docstring",
+    "Add support for {word} in the parser",
+    "Refactor {word} handling for clarity",
+    "Increase padding of the {word} panel",
+    "Release v1.{n}.0",
+]
+_WORDS = ["cache", "client", "config", "logging", "prefix", "address", "retry", "schema"]
+
+
+def realistic_messages(size, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice(_TEMPLATES).format(n=rng.randint(1, 500), word=rng.choice(_WORDS)) for _ in range(size)]
+
+
+def legacy_categorize(message):
+    """The original substring-based categorize_commit."""
+    message = message.lower()
+    if any(kw in message for kw in ["fix", "bug"]):
+        return "🐛 Bug Fixes"
+    elif any(kw in message for kw in ["add", "feature", "implement"]):
+        return "✨ Features"
+    elif any(kw in message for kw in ["doc", "readme"]):
+        return "📄 Documentation"
+    elif any(kw in message for kw in ["remove", "delete"]):
+        return "🔥 Removals"
+    elif any(kw in message for kw in ["update", "upgrade"]):
+        return "🔧 Updates"
+    elif any(kw in message for kw in ["merge", "pull"]):
+        return "🔀 Merges"
+    else:
+        return "📦 Others"
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    classifier = CommitClassifier()
+    print(f"{'corpus':>10} {'commits':>10} {'legacy (s)':>11} {'single (s)':>11} {'batch (s)':>10} {'speedup':>8}")
+    for size in args.sizes:
+        corpora = {"realistic": realistic_messages(size), "dense": synthetic_history(size)[0].message}
+        for name, messages in corpora.items():
+            legacy = _best_of(lambda: [legacy_categorize(m) for m in messages], args.repeat)
+            single = _best_of(lambda: [classifier.categorize(m) for m in messages], args.repeat)
+            batch = _best_of(lambda: classifier.classify(messages), args.repeat)
+            print(f"{name:>10} {size:>10} {legacy:>11.4f} {single:>11.4f} {batch:>10.4f} {legacy / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
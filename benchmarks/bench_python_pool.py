@@ -0,0 +1,50 @@
+"""Benchmark: execute_python_code in a warm worker vs. a fresh interpreter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_python_pool [--repeat 10]
+"""
+
+import argparse
+import logging
+import statistics
+import time
+
+from src.tools.python_pool import get_python_pool
+from src.tools.python_tools import _execute_in_subprocess
+
+_SNIPPETS = {
+    "print": "print(sum(range(1000)))",
+    "numpy+pandas+pyplot": "import numpy, pandas, matplotlib.pyplot as plt\nprint(numpy.__version__)",
+}
+
+
+def _median(run, code, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run(code, 30)
+        samples.append(time.perf_counter() - start)
+        assert result["success"], result["stderr"]
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    pool = get_python_pool()
+    print(f"pool start (fork server + workers): {time.perf_counter() - start:.3f}s")
+
+    print(f"{'snippet':>22} {'subprocess (s)':>15} {'pool (s)':>10}")
+    for name, code in _SNIPPETS.items():
+        cold = _median(_execute_in_subprocess, code, args.repeat)
+        warm = _median(pool.run, code, args.repeat)
+        print(f"{name:>22} {cold:>15.4f} {warm:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Main entry point for LangManus Demo."""
 
 from src.main_app import LangManusAgent
+from src.tools.metrics import format_summary
 
 if __name__ == '__main__':
     # Use the new LangManus-powered agent
@@ -20,4 +21,9 @@ if __name__ == '__main__':
         if chart_paths:
             print(f"\n📊 Generated {len(chart_paths)} charts:")
             for path in chart_paths:
-                print(f"  - {path}")
\ No newline at end of file
+                print(f"  - {path}")
+        
+        latency_summary = format_summary()
+        if latency_summary:
+            print("\n⏱️ Latency summary:")
+            print(latency_summary)
\ No newline at end of file
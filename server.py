@@ -1,20 +1,43 @@
 """FastAPI server for LangManus Demo."""
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from contextlib import asynccontextmanager
 import json
 import logging
+from src.config.tools import CHART_WARM_UP_ON_STARTUP, PYTHON_POOL_ENABLED, PYTHON_POOL_START_ON_STARTUP
 from src.main_app import LangManusAgent
+from src.tools.analysis_tools import warm_up_charts
+from src.tools.metrics import snapshot, export_prometheus
+from src.tools.python_pool import get_python_pool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up the chart renderer and Python workers before serving the first request."""
+    if CHART_WARM_UP_ON_STARTUP:
+        try:
+            warm_up_charts()
+        except Exception as e:
+            logger.warning(f"Chart warm-up failed: {e}")
+    if PYTHON_POOL_ENABLED and PYTHON_POOL_START_ON_STARTUP:
+        try:
+            get_python_pool()
+        except Exception as e:
+            logger.warning(f"Python worker pool start failed: {e}")
+    yield
+
+
 app = FastAPI(
     title="LangManus Demo API",
     description="GitHub Repository Analyzer powered by LangManus",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 
@@ -46,6 +69,18 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Latency histograms in Prometheus text format."""
+    return export_prometheus()
+
+
+@app.get("/metrics/json")
+async def metrics_json():
+    """Latency histogram snapshot with p50/p95/p99 estimates."""
+    return {"histograms": snapshot()}
+
+
 @app.post("/api/chat")
 async def chat(request: ChatRequest):
     """Non-streaming chat endpoint."""
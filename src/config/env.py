@@ -41,6 +41,8 @@ VL_LLM = LLMConfig(
 # Tool API Keys
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+# Optional comma-separated token pool; requests rotate to the token with most budget left
+GITHUB_TOKENS = [t.strip() for t in os.getenv("GITHUB_TOKENS", "").split(",") if t.strip()]
 
 # Browser Configuration
 CHROME_INSTANCE_PATH = os.getenv("CHROME_INSTANCE_PATH", "") 
\ No newline at end of file
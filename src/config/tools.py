@@ -9,20 +9,110 @@ TAVILY_MAX_RESULTS = 5
 
 # GitHub tools configuration (Business-specific tools)
 # These tools provide GitHub-specific functionality and can be attached to agents as needed
-GITHUB_MAX_COMMITS = 20
+GITHUB_BACKEND = "rest"  # "rest", "graphql" (one query) or "git" (local partial clone)
+GITHUB_MAX_COMMITS = 20  # Default history depth when no time window is given
+GITHUB_COMMITS_PER_PAGE = 100  # GitHub's maximum page size
+GITHUB_FETCH_CONCURRENCY = 4  # Commit pages fetched in parallel
 GITHUB_TOKEN = None  # Set via environment variable
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_POOL_SIZE = 10  # Keep-alive connections shared by all GitHub calls
+GITHUB_HTTP2 = True  # Use HTTP/2 when httpx and h2 are installed
+GITHUB_HTTP_CACHE_ENABLED = True  # Revalidate API responses with ETags
+GITHUB_HTTP_CACHE_DIR = ".cache/github"
+
+# Rate-limit budget shared by all processes using the same tokens
+GITHUB_RATE_LIMIT_ENABLED = True
+GITHUB_RATE_LIMIT_STORE = ".cache/github/ratelimit.sqlite"
+GITHUB_RATE_LIMIT_RESERVE = 500  # Requests kept back for high-priority calls (at most a tenth of a quota)
+GITHUB_RATE_LIMIT_MAX_WAIT = 60  # Seconds a call may wait for a budget reset
+GITHUB_REQUEST_TIMEOUT = 10  # Seconds before a GitHub request is abandoned
+GITHUB_RESULT_CACHE_TTL = 300  # Seconds successful GitHub lookups are reused
+
+# Incremental sync: per-repo commit history with a high-water mark
+COMMIT_STORE_ENABLED = True
+COMMIT_STORE_DIR = ".cache/commits"
+COMMIT_STORE_MAX_COMMITS = 100000  # Oldest commits beyond this are dropped
+
+# Trending index: ranked trending pages kept in memory and on disk
+TRENDING_LANGUAGES = ["python"]  # "" is the all-languages page
+TRENDING_WINDOWS = ["daily"]  # Any of "daily", "weekly", "monthly"
+TRENDING_REFRESH_INTERVAL = 3600  # Seconds between refreshes of each page
+TRENDING_BACKGROUND_REFRESH = True  # Refresh from a daemon thread instead of on lookup
+TRENDING_INDEX_PATH = ".cache/trending.json"
+
+# Local git-clone backend for large histories
+GIT_CACHE_DIR = ".cache/git"  # Blobless mirrors, updated with incremental fetches
+GIT_COMMAND_TIMEOUT = 600  # Seconds allowed for a clone or fetch
+
+# Retry policy for GitHub requests
+GITHUB_RETRY_MAX_ATTEMPTS = 3
+GITHUB_RETRY_BASE_DELAY = 0.5  # Seconds, upper bound of the first jittered delay
+GITHUB_RETRY_MAX_DELAY = 10  # Seconds, cap for any single delay
+GITHUB_RETRY_DEADLINE = 20  # Seconds, total budget for one call including retries
+
+# Circuit breaker settings for external endpoints
+CIRCUIT_FAILURE_THRESHOLD = 0.5  # Failure rate that opens the circuit
+CIRCUIT_MINIMUM_CALLS = 5
+CIRCUIT_WINDOW_SIZE = 20
+CIRCUIT_RECOVERY_TIMEOUT = 30  # Seconds before a trial call is allowed
+
+# Multi-repository mode: analyze the top trending repos in parallel
+MULTI_REPO_COUNT = 1  # Repositories per run; 1 keeps the single-repo workflow
+MULTI_REPO_CONCURRENCY = 4  # Per-repo branches running at the same time
+
+# Warm worker pool for execute_python_code
+PYTHON_POOL_ENABLED = True  # Run code in pre-forked workers instead of a fresh interpreter per call
+PYTHON_POOL_SIZE = 2  # Workers kept ready; calls beyond this wait for a free worker
+PYTHON_POOL_PRELOAD = ["numpy", "pandas", "matplotlib.pyplot"]  # Imported once by the fork server
+PYTHON_POOL_MAX_RUNS = 50  # Runs before a worker is replaced with a fresh one
+PYTHON_POOL_MAX_MEMORY_MB = 512  # Peak worker RSS beyond which it is replaced
+PYTHON_POOL_START_ON_STARTUP = True  # Server forks the workers before the first request
+REPL_MAX_KERNELS = 8  # Live REPL sessions; the least recently used idle one is reclaimed beyond this
+REPL_IDLE_TIMEOUT = 900  # Seconds a REPL session may sit unused before its kernel is stopped
 
 # Analysis tools configuration
+# Commit categories in priority order: a message mentioning several gets the
+# first. Keywords match at the start of a word ("fix" matches "fixes" but not
+# "prefix"); keywords shorter than three characters must match a whole word.
 COMMIT_CATEGORIES = {
-    'feature': ['feat', 'feature', 'add', 'implement', 'create'],
+    'merge': ['merge', 'pull'],
     'fix': ['fix', 'bug', 'patch', 'resolve', 'correct'],
+    'feature': ['feat', 'feature', 'add', 'implement', 'create'],
     'docs': ['docs', 'doc', 'documentation', 'readme'],
     'refactor': ['refactor', 'refact', 'restructure', 'optimize'],
     'test': ['test', 'tests', 'testing', 'spec'],
     'style': ['style', 'format', 'lint', 'prettier'],
-    'chore': ['chore', 'update', 'upgrade', 'deps', 'dependencies'],
+    'remove': ['remove', 'delete', 'drop'],
+    'chore': ['chore', 'update', 'upgrade', 'deps', 'dependencies', 'bump'],
     'ci': ['ci', 'build', 'deploy', 'pipeline']
 }
+COMMIT_CATEGORY_LABELS = {
+    'merge': "🔀 Merges",
+    'fix': "🐛 Bug Fixes",
+    'feature': "✨ Features",
+    'docs': "📄 Documentation",
+    'refactor': "♻️ Refactoring",
+    'test': "🧪 Tests",
+    'style': "🎨 Style",
+    'remove': "🔥 Removals",
+    'chore': "🔧 Updates",
+    'ci': "👷 CI/Build"
+}
+COMMIT_DEFAULT_CATEGORY_LABEL = "📦 Others"
+
+# Streaming commit aggregation (OnlineCommitAggregator)
+ONLINE_AGGREGATION_CHUNK = 1024  # Commits classified and counted per batch
+ONLINE_TOKEN_CAPACITY = 2000  # Topic words tracked by the heavy-hitters sketch
+ONLINE_AUTHOR_CAPACITY = 1000  # Authors tracked by the heavy-hitters sketch
+
+# Contributor analytics
+CONTRIBUTOR_BUS_FACTOR_SHARE = 0.5  # Bus factor: fewest authors covering this share of commits
+CONTRIBUTOR_RECENT_WEEKS = 4  # First-time contributors are reported for this many recent weeks
+
+# TF-IDF topics across analyzed repositories
+TOPIC_CORPUS_ENABLED = True  # Rank topics by TF-IDF when the repository is known
+TOPIC_CORPUS_DIR = ".cache/topics"  # One term-count file per analyzed repository
+TOPIC_TERMS_PER_REPO = 1000  # Most frequent terms kept per repository
 
 # Chart generation settings
 CHART_DPI = 150
@@ -37,4 +127,9 @@ CHART_OUTPUT_DIR = OUTPUT_DIR  # Alias for backward compatibility
 CHART_FIGURE_SIZE = (10, 6)
 COMMIT_CHART_NAME = "commit_chart.png"
 CATEGORY_CHART_NAME = "category_chart.png"
-TOPICS_CHART_NAME = "topics_chart.png" 
\ No newline at end of file
+TOPICS_CHART_NAME = "topics_chart.png"
+CONTRIBUTORS_CHART_NAME = "contributors_chart.png"
+CHART_FORMAT = "png"  # "png", "svg", or "vega" (Vega-Lite JSON rendered by the client)
+CHART_RENDER_CONCURRENCY = 3  # Charts of one report rendered in parallel
+CHART_WARM_UP_ON_STARTUP = True  # Server imports matplotlib and loads fonts before the first request
+CHART_CACHE_MAX_BYTES = 200 * 1024 * 1024  # Least recently used charts evicted beyond this
@@ -1,18 +1,36 @@
 """LangGraph workflow for LangManus Demo."""
 
-from typing import TypedDict, Dict, Any, List
+import os
+import re
+from typing import Annotated, TypedDict, Dict, Any, List
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode
+from langgraph.types import Send
 from langchain_core.messages import HumanMessage, SystemMessage
+from src.config.tools import CHART_OUTPUT_DIR, MULTI_REPO_COUNT
 from src.core.llm import basic_llm, reasoning_llm
 from src.prompts.template import prompt_template
-from src.tools.github_tools import find_trending_repo, scrape_github_activity
+from src.tools.github_tools import find_trending_repo, find_trending_repos, scrape_github_activity
 from src.tools.analysis_tools import analyze_code_activity
+from src.tools.chart_cache import chart_title
+from src.tools.commit_analytics import analyze_commits
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+def merge_repo_results(current: List[Dict[str, Any]], update: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reduce per-repository results, keeping the latest result per repo_url.
+
+    Idempotent, so nodes that hand back the whole state do not duplicate
+    results already merged.
+    """
+    merged = {result['repo_url']: result for result in current or []}
+    for result in update or []:
+        merged[result['repo_url']] = result
+    return sorted(merged.values(), key=lambda result: result.get('rank', 0))
+
+
 class WorkflowState(TypedDict):
     """State structure for the workflow."""
     messages: List[Dict[str, Any]]
@@ -24,6 +42,16 @@ class WorkflowState(TypedDict):
     chart_paths: List[str]
     report: str
     error: str
+    repo_count: int
+    repo_urls: List[str]
+    repo_results: Annotated[List[Dict[str, Any]], merge_repo_results]
+
+
+class RepoTask(TypedDict):
+    """Input of one analyze_repo branch in multi-repo mode."""
+    task: str
+    repo_url: str
+    rank: int
 
 
 def coordinator_node(state: WorkflowState) -> WorkflowState:
@@ -128,32 +156,46 @@ def researcher_node(state: WorkflowState) -> WorkflowState:
             state["error"] = "Basic LLM not configured"
             return state
             
-        print("📡 Finding trending repository...")
+        repo_count = state.get("repo_count") or MULTI_REPO_COUNT
+        if repo_count > 1:
+            print(f"📡 Finding top {repo_count} trending repositories...")
+            repo_urls = [repo['url'] for repo in find_trending_repos(k=repo_count)]
+        else:
+            print("📡 Finding trending repository...")
+            repo_urls = []
         # Find trending repository
-        repo_url = find_trending_repo()
+        repo_urls = repo_urls or [find_trending_repo()]
+        repo_url = repo_urls[0]
+        state["repo_urls"] = repo_urls
         state["repo_url"] = repo_url
-        print(f"🎯 Found target repository: {repo_url}")
-        logger.info(f"Found target URL: {repo_url}")
+        print(f"🎯 Found target repositories: {', '.join(repo_urls)}")
+        logger.info(f"Found target URLs: {repo_urls}")
         
+        found = (f"I found {len(repo_urls)} trending repositories: {', '.join(repo_urls)}"
+                 if len(repo_urls) > 1 else f"I found a trending repository: {repo_url}")
         messages = [
             SystemMessage(content=prompt),
-            HumanMessage(content=f"I found a trending repository: {repo_url}")
+            HumanMessage(content=found)
         ]
         
         print("💭 Researcher is analyzing the repository...")
         response = basic_llm.invoke(messages)
         
-        print(f"✅ [RESEARCHER] Research complete. Found: {repo_url}")
+        print(f"✅ [RESEARCHER] Research complete. Found: {', '.join(repo_urls)}")
         logger.info(f"Research phase completed")
         
         state["messages"].append({
             "agent": "researcher", 
-            "content": f"Found trending repo: {repo_url}\n\nAnalysis: {response.content}",
+            "content": f"Found trending repo: {', '.join(repo_urls)}\n\nAnalysis: {response.content}",
             "timestamp": "now"
         })
         
-        state["current_step"] = "browser"
-        print("➡️  Handing off to Browser Agent...")
+        if len(repo_urls) > 1:
+            state["current_step"] = "analyze_repo"
+            print(f"➡️  Fanning out to {len(repo_urls)} repository analyses...")
+        else:
+            state["current_step"] = "browser"
+            print("➡️  Handing off to Browser Agent...")
         return state
         
     except Exception as e:
@@ -162,6 +204,121 @@ def researcher_node(state: WorkflowState) -> WorkflowState:
         return state
 
 
+def route_repositories(state: WorkflowState):
+    """Fan out one analyze_repo branch per repository in multi-repo mode."""
+    repo_urls = state.get("repo_urls") or []
+    if state.get("error") or len(repo_urls) <= 1:
+        return "browser"
+    return [
+        Send("analyze_repo", {"task": state["task"], "repo_url": repo_url, "rank": rank})
+        for rank, repo_url in enumerate(repo_urls, 1)
+    ]
+
+
+def _repo_output_dir(repo_url: str) -> str:
+    """Per-repository chart directory, so parallel branches never share files."""
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', "_".join(repo_url.rstrip('/').split('/')[-2:]))
+    return os.path.join(CHART_OUTPUT_DIR, name)
+
+
+def analyze_repo_node(task: RepoTask) -> Dict[str, Any]:
+    """Browser and coder work for one repository in multi-repo mode."""
+    repo_url = task["repo_url"]
+    result = {
+        "repo_url": repo_url,
+        "rank": task["rank"],
+        "metadata": {},
+        "commit_count": 0,
+        "top_category": "N/A",
+        "analysis": [],
+        "chart_paths": [],
+        "insights": "",
+        "error": ""
+    }
+    try:
+        print(f"\n🌐 [REPO {task['rank']}] Collecting and analyzing {repo_url}...")
+        logger.info(f"Analyzing repository {task['rank']}: {repo_url}")
+        
+        repo_data = scrape_github_activity(repo_url)
+        if repo_data.get("error"):
+            result["error"] = repo_data["error"]
+            return {"repo_results": [result]}
+        
+        commit_analysis = analyze_commits(repo_data.get('commits'))
+        commits = commit_analysis.commits
+        analysis, chart_paths = analyze_code_activity(repo_data, output_dir=_repo_output_dir(repo_url),
+                                                      commit_analysis=commit_analysis)
+        result.update({
+            "metadata": repo_data.get('metadata', {}),
+            "commit_count": len(commits),
+            "top_category": commit_analysis.top_category,
+            "analysis": analysis,
+            "chart_paths": chart_paths
+        })
+        
+        if basic_llm:
+            messages = [
+                SystemMessage(content=prompt_template.load_prompt("coder")),
+                HumanMessage(content=f"Generated analysis and {len(chart_paths)} charts for {repo_url}:\n" + "\n".join(analysis))
+            ]
+            result["insights"] = basic_llm.invoke(messages).content
+        
+        print(f"✅ [REPO {task['rank']}] {repo_url}: {len(commits)} commits, {len(chart_paths)} charts")
+        
+    except Exception as e:
+        logger.error(f"Error analyzing {repo_url}: {e}")
+        result["error"] = str(e)
+    
+    return {"repo_results": [result]}
+
+
+def _build_comparative_report(results: List[Dict[str, Any]]) -> str:
+    """Reduce per-repository results into one comparative report."""
+    report_parts = [
+        f"# 🧠 GitHub Repository Comparison",
+        f"",
+        f"## 📊 Overview ({len(results)} repositories)",
+        f"",
+        f"| # | Repository | Language | Stars | Commits | Most active category |",
+        f"|---|------------|----------|-------|---------|----------------------|"
+    ]
+    
+    for result in results:
+        metadata = result.get('metadata', {})
+        name = metadata.get('full_name') or result['repo_url'].rstrip('/').split('/')[-1]
+        report_parts.append(
+            f"| {result.get('rank', '')} | [{name}]({result['repo_url']}) | {metadata.get('language') or 'N/A'} "
+            f"| {metadata.get('stars', 0)} | {result.get('commit_count', 0)} | {result.get('top_category', 'N/A')} |"
+        )
+    
+    for result in results:
+        report_parts.extend([
+            f"",
+            f"## 🔗 {result.get('rank', '')}. [{result['repo_url']}]({result['repo_url']})",
+            f""
+        ])
+        
+        if result.get('error'):
+            report_parts.append(f"⚠️ Analysis failed: {result['error']}")
+            continue
+        
+        description = result.get('metadata', {}).get('description')
+        if description:
+            report_parts.extend([f"_{description}_", f""])
+        
+        report_parts.extend(result.get('analysis', []))
+        
+        if result.get('insights'):
+            report_parts.extend([f"", f"**Insights:** {result['insights']}"])
+        
+        if result.get('chart_paths'):
+            report_parts.extend([f"", f"**Charts:**"])
+            for chart_path in result['chart_paths']:
+                report_parts.append(f"- `{chart_path}`")
+    
+    return "\n".join(report_parts)
+
+
 def browser_node(state: WorkflowState) -> WorkflowState:
     """Browser agent node."""
     try:
@@ -273,6 +430,15 @@ def reporter_node(state: WorkflowState) -> WorkflowState:
             state["error"] = "Basic LLM not configured"
             return state
             
+        repo_results = state.get("repo_results") or []
+        if repo_results:
+            print(f"📋 Comparing {len(repo_results)} repositories...")
+            report = _build_comparative_report(repo_results)
+            state["report"] = report
+            state["analysis"] = [line for result in repo_results for line in result.get('analysis', [])]
+            state["chart_paths"] = [path for result in repo_results for path in result.get('chart_paths', [])]
+            return _finish_report(state, prompt, f"Generated comparative analysis report for {len(repo_results)} repositories")
+            
         print("📋 Gathering report components...")
         print(f"   • Repository: {state['repo_url']}")
         print(f"   • Commits analyzed: {len(state['repo_data'].get('commits', []))}")
@@ -327,32 +493,12 @@ def reporter_node(state: WorkflowState) -> WorkflowState:
                 f""
             ])
             for chart_path in chart_paths:
-                chart_name = chart_path.split('/')[-1].replace('_', ' ').replace('.png', '').title()
-                report_parts.append(f"- {chart_name}: `{chart_path}`")
+                report_parts.append(f"- {chart_title(chart_path)}: `{chart_path}`")
         
         report = "\n".join(report_parts)
         state["report"] = report
         
-        print("💭 Reporter is synthesizing the final report...")
-        messages = [
-            SystemMessage(content=prompt),
-            HumanMessage(content="Generated comprehensive repository analysis report")
-        ]
-        
-        response = basic_llm.invoke(messages)
-        
-        print(f"✅ [REPORTER] Report complete ({len(report)} characters)")
-        logger.info(f"Reporter generated final report with {len(report)} characters")
-        
-        state["messages"].append({
-            "agent": "reporter",
-            "content": f"Generated final report\n\nSummary: {response.content}",
-            "timestamp": "now"
-        })
-        
-        state["current_step"] = "complete"
-        print("\n🎉 [WORKFLOW] All agents completed successfully!")
-        return state
+        return _finish_report(state, prompt, "Generated comprehensive repository analysis report")
         
     except Exception as e:
         logger.error(f"Error in reporter node: {e}")
@@ -360,6 +506,32 @@ def reporter_node(state: WorkflowState) -> WorkflowState:
         return state
 
 
+def _finish_report(state: WorkflowState, prompt: str, summary_request: str) -> WorkflowState:
+    """Have the reporter summarize the built report and complete the workflow."""
+    report = state["report"]
+    
+    print("💭 Reporter is synthesizing the final report...")
+    messages = [
+        SystemMessage(content=prompt),
+        HumanMessage(content=summary_request)
+    ]
+    
+    response = basic_llm.invoke(messages)
+    
+    print(f"✅ [REPORTER] Report complete ({len(report)} characters)")
+    logger.info(f"Reporter generated final report with {len(report)} characters")
+    
+    state["messages"].append({
+        "agent": "reporter",
+        "content": f"Generated final report\n\nSummary: {response.content}",
+        "timestamp": "now"
+    })
+    
+    state["current_step"] = "complete"
+    print("\n🎉 [WORKFLOW] All agents completed successfully!")
+    return state
+
+
 def create_workflow() -> StateGraph:
     """Create the LangGraph workflow.
     
@@ -375,12 +547,15 @@ def create_workflow() -> StateGraph:
     workflow.add_node("browser", browser_node)
     workflow.add_node("coder", coder_node)
     workflow.add_node("reporter", reporter_node)
+    workflow.add_node("analyze_repo", analyze_repo_node)
     
     # Add edges
     workflow.add_edge(START, "coordinator")
     workflow.add_edge("coordinator", "planner")
     workflow.add_edge("planner", "researcher")
-    workflow.add_edge("researcher", "browser")
+    # Single repo: browser -> coder; multi-repo: one analyze_repo branch per repo
+    workflow.add_conditional_edges("researcher", route_repositories, ["browser", "analyze_repo"])
+    workflow.add_edge("analyze_repo", "reporter")
     workflow.add_edge("browser", "coder")
     workflow.add_edge("coder", "reporter")
     workflow.add_edge("reporter", END)
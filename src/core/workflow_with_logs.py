@@ -8,6 +8,7 @@ from src.core.llm import basic_llm, reasoning_llm
 from src.prompts.template import prompt_template
 from src.tools.github_tools import find_trending_repo, scrape_github_activity
 from src.tools.analysis_tools import analyze_code_activity
+from src.tools.commit_table import as_commit_table
 import logging
 
 logger = logging.getLogger(__name__)
@@ -304,14 +305,14 @@ def reporter_node(state: WorkflowState) -> WorkflowState:
             ])
         
         # Add recent commits
-        commits = repo_data.get('commits', [])
+        commits = as_commit_table(repo_data.get('commits'))
         if commits:
             report_parts.extend([
                 f"## 📝 Recent Commits:",
                 f""
             ])
             for commit in commits[:10]:  # Show last 10 commits
-                report_parts.append(f"- [{commit.get('sha', 'N/A')[:7]}] {commit.get('message', 'N/A')}")
+                report_parts.append(f"- [{commit.sha[:7] or 'N/A'}] {commit.message}")
             report_parts.append("")
         
         # Add analysis results
@@ -2,7 +2,9 @@
 
 import logging
 from typing import Dict, Any
+from src.config.tools import MULTI_REPO_COUNT, MULTI_REPO_CONCURRENCY
 from src.core.workflow import create_workflow, WorkflowState
+from src.tools.metrics import format_summary
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,14 +13,36 @@ logger = logging.getLogger(__name__)
 class LangManusAgent:
     """LangManus-powered GitHub repository analyzer."""
     
-    def __init__(self, task: str = None):
+    def __init__(self, task: str = None, repo_count: int = None, max_concurrency: int = None):
         """Initialize the agent with a task.
         
         Args:
             task: Task description for the agent
+            repo_count: Trending repositories to analyze (more than one
+                enables the comparative multi-repo mode)
+            max_concurrency: Cap on repositories analyzed in parallel
         """
         self.task = task or "Find a popular open-source project updated recently and summarize its new features with examples and charts."
+        self.repo_count = repo_count or MULTI_REPO_COUNT
+        self.max_concurrency = max_concurrency or MULTI_REPO_CONCURRENCY
         self.workflow = create_workflow()
+    
+    def _initial_state(self) -> WorkflowState:
+        """Build the initial workflow state."""
+        return {
+            "messages": [],
+            "task": self.task,
+            "current_step": "start",
+            "repo_url": "",
+            "repo_data": {},
+            "analysis": [],
+            "chart_paths": [],
+            "report": "",
+            "error": "",
+            "repo_count": self.repo_count,
+            "repo_urls": [],
+            "repo_results": []
+        }
         
     def run(self) -> Dict[str, Any]:
         """Run the complete workflow.
@@ -28,22 +52,12 @@ class LangManusAgent:
         """
         try:
             # Initialize workflow state
-            initial_state: WorkflowState = {
-                "messages": [],
-                "task": self.task,
-                "current_step": "start",
-                "repo_url": "",
-                "repo_data": {},
-                "analysis": [],
-                "chart_paths": [],
-                "report": "",
-                "error": ""
-            }
+            initial_state = self._initial_state()
             
             logger.info(f"Starting workflow with task: {self.task}")
             
             # Execute workflow
-            final_state = self.workflow.invoke(initial_state)
+            final_state = self.workflow.invoke(initial_state, config={"max_concurrency": self.max_concurrency})
             
             if final_state.get("error"):
                 logger.error(f"Workflow failed: {final_state['error']}")
@@ -73,20 +87,10 @@ class LangManusAgent:
         """Run workflow with streaming updates."""
         try:
             # Initialize workflow state
-            initial_state: WorkflowState = {
-                "messages": [],
-                "task": self.task,
-                "current_step": "start",
-                "repo_url": "",
-                "repo_data": {},
-                "analysis": [],
-                "chart_paths": [],
-                "report": "",
-                "error": ""
-            }
+            initial_state = self._initial_state()
             
             # Stream workflow execution
-            for state in self.workflow.stream(initial_state):
+            for state in self.workflow.stream(initial_state, config={"max_concurrency": self.max_concurrency}):
                 yield state
                 
         except Exception as e:
@@ -112,6 +116,11 @@ def main():
             print(f"\n📊 Generated {len(chart_paths)} charts:")
             for path in chart_paths:
                 print(f"  - {path}")
+        
+        latency_summary = format_summary()
+        if latency_summary:
+            print("\n⏱️ Latency summary:")
+            print(latency_summary)
 
 
 if __name__ == "__main__":
@@ -20,21 +20,32 @@ from .bash_tool import (
 )
 from .decorators import (
     retry,
+    RetryPolicy,
     timeout,
     log_execution,
-    safe_execute
+    safe_execute,
+    circuit_breaker,
+    CircuitOpenError,
+    instrument
+)
+from .metrics import (
+    snapshot as metrics_snapshot,
+    export_prometheus,
+    format_summary as format_metrics_summary
 )
 
 # Tools requiring external dependencies (optional import)
 try:
     from .github_tools import (
         find_trending_repo,
+        find_trending_repos,
         scrape_github_activity,
         get_repo_metadata
     )
     _github_tools_available = True
 except ImportError:
     find_trending_repo = None
+    find_trending_repos = None
     scrape_github_activity = None
     get_repo_metadata = None
     _github_tools_available = False
@@ -88,6 +99,7 @@ except ImportError:
 __all__ = [
     # GitHub tools
     "find_trending_repo",
+    "find_trending_repos",
     "scrape_github_activity", 
     "get_repo_metadata",
     
@@ -127,9 +139,18 @@ __all__ = [
     
     # Decorator utilities
     "retry",
+    "RetryPolicy",
     "timeout",
     "log_execution",
-    "safe_execute"
+    "safe_execute",
+    "circuit_breaker",
+    "CircuitOpenError",
+    "instrument",
+    
+    # Metrics
+    "metrics_snapshot",
+    "export_prometheus",
+    "format_metrics_summary"
 ] 
 
 
@@ -140,6 +161,7 @@ def get_github_tools():
         return {}
     return {
         "find_trending_repo": find_trending_repo,
+        "find_trending_repos": find_trending_repos,
         "scrape_github_activity": scrape_github_activity,
         "get_repo_metadata": get_repo_metadata
     }
@@ -225,7 +247,9 @@ def get_decorator_tools():
         "retry": retry,
         "timeout": timeout,
         "log_execution": log_execution,
-        "safe_execute": safe_execute
+        "safe_execute": safe_execute,
+        "circuit_breaker": circuit_breaker,
+        "instrument": instrument
     }
 
 
@@ -1,24 +1,159 @@
-"""Analysis tools for repository data processing."""
+"""Analysis tools for repository data processing.
 
-import matplotlib.pyplot as plt
-from collections import defaultdict, Counter
-from datetime import datetime
-import matplotlib.dates as mdates
-import re
+matplotlib is imported on the first render rather than with this module, so
+workers that never draw a chart (or only emit Vega-Lite specs) do not pay for
+it. Call warm_up_charts() at startup to move that cost out of the first
+request.
+"""
+
+import io
+import json
 import os
-from typing import Dict, List, Tuple, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Any, Union
 import logging
 from src.config.tools import (
     CHART_FIGURE_SIZE, 
     CHART_DPI,
+    CHART_RENDER_CONCURRENCY,
+    CHART_CACHE_MAX_BYTES,
+    CHART_FORMAT,
     CHART_OUTPUT_DIR,
     COMMIT_CHART_NAME,
     CATEGORY_CHART_NAME, 
-    TOPICS_CHART_NAME
+    TOPICS_CHART_NAME,
+    CONTRIBUTORS_CHART_NAME,
+    CONTRIBUTOR_BUS_FACTOR_SHARE,
+    CONTRIBUTOR_RECENT_WEEKS,
+    TOPIC_CORPUS_ENABLED
+)
+from src.tools.chart_cache import chart_filename, evict_charts, eviction_root, render_cached
+from src.tools.commit_analytics import (
+    CommitAnalysis,
+    OnlineCommitAggregator,
+    analyze_commits,
+    daily_histogram,
+    parse_iso_timestamps
 )
+from src.tools.commit_classifier import get_commit_classifier
+from src.tools.commit_table import CommitTable
+from src.tools.decorators import instrument
+from src.tools.topics import get_topic_corpus
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 logger = logging.getLogger(__name__)
 
+# Part of every chart's cache key; bump when the drawing code changes
+_CHART_STYLE_VERSION = 1
+
+# File extension per chart format; "vega" writes a Vega-Lite spec instead of an image
+CHART_EXTENSIONS = {'png': ".png", 'svg': ".svg", 'vega': ".json"}
+
+_VEGA_LITE_SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+
+
+_backend_lock = threading.Lock()
+_backend_ready = False
+
+
+def _use_agg_backend():
+    """Import matplotlib and select the non-interactive Agg backend, once."""
+    global _backend_ready
+    with _backend_lock:
+        if not _backend_ready:
+            import matplotlib
+            matplotlib.use("Agg")
+            _backend_ready = True
+
+
+def _new_figure() -> "Figure":
+    """Create a figure with its own Agg canvas, independent of pyplot's global state."""
+    _use_agg_backend()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    figure = Figure(figsize=CHART_FIGURE_SIZE, dpi=CHART_DPI)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def warm_up_charts() -> float:
+    """Import matplotlib and load its fonts ahead of the first chart.
+    
+    Returns:
+        float: Seconds spent warming up
+    """
+    start = time.perf_counter()
+    figure = _new_figure()
+    ax = figure.add_subplot()
+    ax.plot([0, 1], [0, 1], marker='o', label="warm-up")
+    ax.set_title("warm-up")
+    ax.legend()
+    figure.savefig(io.BytesIO(), format="png", dpi=CHART_DPI)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Chart renderer warmed up in {elapsed:.2f}s")
+    return elapsed
+
+
+def _vega_lite_spec(title: str, records: List[Dict[str, Any]], mark: Dict[str, Any],
+                    encoding: Dict[str, Any], transform: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """Vega-Lite spec with the chart data inline."""
+    spec = {
+        "$schema": _VEGA_LITE_SCHEMA,
+        "title": title,
+        "data": {"values": records},
+        "mark": mark,
+        "encoding": encoding
+    }
+    if transform:
+        spec["transform"] = transform
+    return spec
+
+
+def _render_chart(output_dir: Optional[str], name: str, records: List[Dict[str, Any]],
+                  draw: Callable[["Figure"], None], spec: Dict[str, Any],
+                  chart_format: Optional[str] = None) -> str:
+    """Write a chart to its content-addressed path unless it is already there.
+    
+    Args:
+        output_dir: Directory for the chart (defaults to CHART_OUTPUT_DIR)
+        name: Base file name; the format decides its extension
+        records: The values plotted, hashed into the file name
+        draw: Draws the chart onto a fresh figure (png and svg)
+        spec: Vega-Lite spec of the chart (vega)
+        chart_format: "png", "svg" or "vega" (defaults to CHART_FORMAT)
+        
+    Returns:
+        str: Path to the chart
+    """
+    chart_format = chart_format or CHART_FORMAT
+    if chart_format not in CHART_EXTENSIONS:
+        raise ValueError(f"Unsupported chart format: {chart_format}")
+    
+    name = os.path.splitext(name)[0] + CHART_EXTENSIONS[chart_format]
+    settings = {'format': chart_format, 'version': _CHART_STYLE_VERSION}
+    if chart_format != 'vega':
+        settings.update(figsize=CHART_FIGURE_SIZE, dpi=CHART_DPI)
+    path = os.path.join(output_dir or CHART_OUTPUT_DIR, chart_filename(name, records, settings))
+    
+    def render(target: str):
+        if chart_format == 'vega':
+            # The client renders the spec; nothing is drawn here
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump(spec, f, ensure_ascii=False)
+            return
+        figure = _new_figure()
+        draw(figure)
+        figure.tight_layout()
+        figure.savefig(target, format=chart_format, dpi=CHART_DPI, bbox_inches='tight')
+    
+    return render_cached(path, render)
+
 
 def categorize_commit(message: str) -> str:
     """Categorize a commit message by type.
@@ -29,226 +164,315 @@ def categorize_commit(message: str) -> str:
     Returns:
         str: Category with emoji
     """
-    message = message.lower()
-    
-    if any(kw in message for kw in ["fix", "bug"]):
-        return "🐛 Bug Fixes"
-    elif any(kw in message for kw in ["add", "feature", "implement"]):
-        return "✨ Features"
-    elif any(kw in message for kw in ["doc", "readme"]):
-        return "📄 Documentation"
-    elif any(kw in message for kw in ["remove", "delete"]):
-        return "🔥 Removals"
-    elif any(kw in message for kw in ["update", "upgrade"]):
-        return "🔧 Updates"
-    elif any(kw in message for kw in ["merge", "pull"]):
-        return "🔀 Merges"
-    else:
-        return "📦 Others"
+    return get_commit_classifier().categorize(message)
 
 
-def generate_commit_timeline_chart(commit_dates: List[str]) -> str:
+def generate_commit_timeline_chart(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, List[str]],
+                                   output_dir: Optional[str] = None, chart_format: Optional[str] = None) -> str:
     """Generate a chart showing commits over time.
     
     Args:
-        commit_dates: List of commit dates in ISO format
+        commits: Analysis result or CommitTable (or list of ISO commit dates)
+        output_dir: Directory for the chart (defaults to CHART_OUTPUT_DIR)
+        chart_format: "png", "svg" or "vega" (defaults to CHART_FORMAT)
         
     Returns:
         str: Path to the generated chart
     """
     try:
-        commit_day_counts = defaultdict(int)
-        for date_str in commit_dates:
-            try:
-                day = datetime.fromisoformat(date_str.replace('Z', '+00:00')).date()
-                commit_day_counts[day] += 1
-            except ValueError:
-                continue
+        if isinstance(commits, list):
+            days, counts = daily_histogram(parse_iso_timestamps(commits))
+        else:
+            analysis = analyze_commits(commits)
+            days, counts = analysis.days, analysis.daily_counts
                 
-        if not commit_day_counts:
+        if not counts.size:
             logger.warning("No valid commit dates found")
             return ""
-            
-        recent_days = sorted(commit_day_counts.keys())
-        counts = [commit_day_counts[day] for day in recent_days]
-
-        plt.figure(figsize=CHART_FIGURE_SIZE, dpi=CHART_DPI)
-        plt.plot(recent_days, counts, marker='o', linestyle='-', color='tab:blue', label='Commits per day')
-        plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
-        plt.gcf().autofmt_xdate()
-        plt.xlabel("Date")
-        plt.ylabel("Commits")
-        plt.title("📈 Commits Over Time")
-        plt.legend()
-        plt.grid(True, alpha=0.3)
         
-        chart_path = os.path.join(CHART_OUTPUT_DIR, COMMIT_CHART_NAME)
-        plt.tight_layout()
-        plt.savefig(chart_path, dpi=CHART_DPI, bbox_inches='tight')
-        plt.close()
+        # Plot only days with commits
+        active = counts > 0
+        recent_days = days[active].astype(object)
+        counts = counts[active]
+
+        def draw(figure: "Figure"):
+            import matplotlib.dates as mdates
+            
+            ax = figure.add_subplot()
+            ax.plot(recent_days, counts, marker='o', linestyle='-', color='tab:blue', label='Commits per day')
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+            figure.autofmt_xdate()
+            ax.set_xlabel("Date")
+            ax.set_ylabel("Commits")
+            ax.set_title("📈 Commits Over Time")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
         
-        return chart_path
+        records = [{'date': str(day), 'commits': count} for day, count in zip(recent_days, counts.tolist())]
+        spec = _vega_lite_spec("📈 Commits Over Time", records, {'type': "line", 'point': True}, {
+            'x': {'field': "date", 'type': "temporal", 'title': "Date", 'axis': {'format': "%b %d"}},
+            'y': {'field': "commits", 'type': "quantitative", 'title': "Commits"}
+        })
+        return _render_chart(output_dir, COMMIT_CHART_NAME, records, draw, spec, chart_format)
         
     except Exception as e:
         logger.error(f"Error generating commit timeline chart: {e}")
         return ""
 
 
-def generate_category_chart(commit_messages: List[str]) -> str:
+def generate_category_chart(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, List[str]],
+                            output_dir: Optional[str] = None, chart_format: Optional[str] = None) -> str:
     """Generate a chart showing commit categories.
     
     Args:
-        commit_messages: List of commit messages
+        commits: Analysis result or CommitTable (or list of formatted commit strings)
+        output_dir: Directory for the chart (defaults to CHART_OUTPUT_DIR)
+        chart_format: "png", "svg" or "vega" (defaults to CHART_FORMAT)
         
     Returns:
         str: Path to the generated chart
     """
     try:
-        category_counter = Counter()
-        
-        for msg in commit_messages:
-            short_msg = re.split(r'—|@', msg)[0].strip()
-            category = categorize_commit(short_msg)
-            category_counter[category] += 1
+        category_counter = analyze_commits(commits).category_counts
 
         if not category_counter:
             logger.warning("No commit categories found")
             return ""
             
-        plt.figure(figsize=CHART_FIGURE_SIZE, dpi=CHART_DPI)
         cats, values = zip(*category_counter.items())
-        plt.bar(cats, values, color='tab:green')
-        plt.ylabel("Commits")
-        plt.title("🧩 Commits by Category")
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True, alpha=0.3)
         
-        chart_path = os.path.join(CHART_OUTPUT_DIR, CATEGORY_CHART_NAME)
-        plt.tight_layout()
-        plt.savefig(chart_path, dpi=CHART_DPI, bbox_inches='tight')
-        plt.close()
+        def draw(figure: "Figure"):
+            ax = figure.add_subplot()
+            ax.bar(cats, values, color='tab:green')
+            ax.set_ylabel("Commits")
+            ax.set_title("🧩 Commits by Category")
+            ax.set_xticks(range(len(cats)), cats, rotation=45, ha='right')
+            ax.grid(True, alpha=0.3)
         
-        return chart_path
+        records = [{'category': cat, 'commits': count} for cat, count in category_counter.items()]
+        spec = _vega_lite_spec("🧩 Commits by Category", records, {'type': "bar", 'color': "#2ca02c"}, {
+            'x': {'field': "category", 'type': "nominal", 'sort': None, 'title': None, 'axis': {'labelAngle': -45}},
+            'y': {'field': "commits", 'type': "quantitative", 'title': "Commits"}
+        })
+        return _render_chart(output_dir, CATEGORY_CHART_NAME, records, draw, spec, chart_format)
         
     except Exception as e:
         logger.error(f"Error generating category chart: {e}")
         return ""
 
 
-def generate_topics_chart(commit_messages: List[str]) -> str:
-    """Generate a chart showing most mentioned topics in commits.
+def generate_topics_chart(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, List[str]],
+                          output_dir: Optional[str] = None, chart_format: Optional[str] = None,
+                          repo_url: Optional[str] = None) -> str:
+    """Generate a chart showing the topics of commit messages.
+    
+    With a repository URL the repository is added to the topic corpus and
+    its most distinctive terms are ranked by TF-IDF; otherwise the most
+    frequent words are shown.
     
     Args:
-        commit_messages: List of commit messages
+        commits: Analysis result or CommitTable (or list of formatted commit strings)
+        output_dir: Directory for the chart (defaults to CHART_OUTPUT_DIR)
+        chart_format: "png", "svg" or "vega" (defaults to CHART_FORMAT)
+        repo_url: Repository the commits belong to
         
     Returns:
         str: Path to the generated chart
     """
     try:
-        word_freq = Counter()
-        
-        for msg in commit_messages:
-            # Extract words with length >= 4
-            words = re.findall(r'\b\w{4,}\b', msg.lower())
-            word_freq.update(words)
+        word_freq = analyze_commits(commits).token_counts
 
         if not word_freq:
             logger.warning("No words found in commit messages")
             return ""
-            
-        most_common = word_freq.most_common(10)
+        
+        if repo_url and TOPIC_CORPUS_ENABLED:
+            corpus = get_topic_corpus()
+            corpus.add(repo_url, word_freq)
+            most_common = corpus.top_terms(repo_url, 10)
+            title, measure, axis_title = "🔥 Distinctive Topics in Commits", "tfidf", "TF-IDF"
+        else:
+            most_common = word_freq.most_common(10)
+            title, measure, axis_title = "🔥 Most Mentioned Topics in Commits", "mentions", "Frequency"
         if not most_common:
             return ""
             
         labels, freqs = zip(*most_common)
         
-        plt.figure(figsize=CHART_FIGURE_SIZE, dpi=CHART_DPI)
-        plt.bar(labels, freqs, color='tab:purple')
-        plt.ylabel("Frequency")
-        plt.title("🔥 Most Mentioned Topics in Commits")
-        plt.xticks(rotation=45, ha='right')
-        plt.grid(True, alpha=0.3)
-        
-        chart_path = os.path.join(CHART_OUTPUT_DIR, TOPICS_CHART_NAME)
-        plt.tight_layout()
-        plt.savefig(chart_path, dpi=CHART_DPI, bbox_inches='tight')
-        plt.close()
+        def draw(figure: "Figure"):
+            ax = figure.add_subplot()
+            ax.bar(labels, freqs, color='tab:purple')
+            ax.set_ylabel(axis_title)
+            ax.set_title(title)
+            ax.set_xticks(range(len(labels)), labels, rotation=45, ha='right')
+            ax.grid(True, alpha=0.3)
         
-        return chart_path
+        records = [{'topic': label, measure: freq} for label, freq in most_common]
+        spec = _vega_lite_spec(title, records, {'type': "bar", 'color': "#9467bd"}, {
+            'x': {'field': "topic", 'type': "nominal", 'sort': None, 'title': None, 'axis': {'labelAngle': -45}},
+            'y': {'field': measure, 'type': "quantitative", 'title': axis_title}
+        })
+        return _render_chart(output_dir, TOPICS_CHART_NAME, records, draw, spec, chart_format)
         
     except Exception as e:
         logger.error(f"Error generating topics chart: {e}")
         return ""
 
 
-def generate_charts(commit_messages: List[str], commit_dates: List[str]) -> List[str]:
+def generate_contributors_chart(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, List[str]],
+                                output_dir: Optional[str] = None, chart_format: Optional[str] = None) -> str:
+    """Generate a chart of active and first-time contributors per week.
+    
+    Args:
+        commits: Analysis result or CommitTable (or list of formatted commit strings)
+        output_dir: Directory for the chart (defaults to CHART_OUTPUT_DIR)
+        chart_format: "png", "svg" or "vega" (defaults to CHART_FORMAT)
+        
+    Returns:
+        str: Path to the generated chart
+    """
+    try:
+        contributors = analyze_commits(commits).contributors
+        weeks = contributors['weeks']
+        
+        if not weeks.size:
+            logger.warning("No dated commits with authors found")
+            return ""
+        
+        active, first_time = contributors['active'], contributors['first_time']
+        
+        def draw(figure: "Figure"):
+            import matplotlib.dates as mdates
+            
+            ax = figure.add_subplot()
+            week_days = weeks.astype(object)
+            ax.plot(week_days, active, marker='o', markersize=3, color='tab:blue', label='Active contributors')
+            ax.plot(week_days, first_time, marker='o', markersize=3, color='tab:orange',
+                    label='First-time contributors')
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%b %d'))
+            figure.autofmt_xdate()
+            ax.set_xlabel("Week")
+            ax.set_ylabel("Contributors")
+            ax.set_title("👥 Contributors per Week")
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+        
+        records = [
+            {'week': str(week), 'active': a, 'first_time': f}
+            for week, a, f in zip(weeks, active.tolist(), first_time.tolist())
+        ]
+        spec = _vega_lite_spec("👥 Contributors per Week", records, {'type': "line", 'point': True}, {
+            'x': {'field': "week", 'type': "temporal", 'title': "Week", 'axis': {'format': "%b %d"}},
+            'y': {'field': "contributors", 'type': "quantitative", 'title': "Contributors"},
+            'color': {'field': "series", 'type': "nominal", 'title': None}
+        }, transform=[{'fold': ["active", "first_time"], 'as': ["series", "contributors"]}])
+        return _render_chart(output_dir, CONTRIBUTORS_CHART_NAME, records, draw, spec, chart_format)
+        
+    except Exception as e:
+        logger.error(f"Error generating contributors chart: {e}")
+        return ""
+
+
+@instrument()
+def generate_charts(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, List[str]],
+                    commit_dates: Optional[List[str]] = None, output_dir: Optional[str] = None,
+                    chart_format: Optional[str] = None, repo_url: Optional[str] = None) -> List[str]:
     """Generate all analysis charts.
     
     Args:
-        commit_messages: List of commit messages
-        commit_dates: List of commit dates
+        commits: Analysis result or CommitTable (or list of formatted commit strings)
+        commit_dates: Commit dates for a legacy string list
+        output_dir: Directory for the charts (defaults to CHART_OUTPUT_DIR)
+        chart_format: "png" or "svg" images, or "vega" for Vega-Lite specs
+            that clients render themselves (defaults to CHART_FORMAT)
+        repo_url: Repository the commits belong to, for TF-IDF topics
         
     Returns:
         List[str]: Paths to generated charts
     """
-    charts = []
+    analysis = analyze_commits(commits, commit_dates)
+    renderers = [generate_commit_timeline_chart, generate_category_chart,
+                 partial(generate_topics_chart, repo_url=repo_url), generate_contributors_chart]
     
-    # Generate timeline chart
-    timeline_chart = generate_commit_timeline_chart(commit_dates)
-    if timeline_chart:
-        charts.append(timeline_chart)
-        
-    # Generate category chart
-    category_chart = generate_category_chart(commit_messages)
-    if category_chart:
-        charts.append(category_chart)
-        
-    # Generate topics chart
-    topics_chart = generate_topics_chart(commit_messages)
-    if topics_chart:
-        charts.append(topics_chart)
+    # Each chart draws on its own Figure, so they render concurrently
+    with ThreadPoolExecutor(max_workers=CHART_RENDER_CONCURRENCY) as executor:
+        futures = [executor.submit(render, analysis, output_dir, chart_format) for render in renderers]
+        charts = [chart for chart in (future.result() for future in futures) if chart]
+    
+    # Keep the chart output bounded, never dropping this run's charts
+    evict_charts(eviction_root(output_dir, CHART_OUTPUT_DIR), CHART_CACHE_MAX_BYTES, keep=charts)
         
     return charts
 
 
-def analyze_code_activity(repo_data: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+def _contributor_insights(contributors: Dict[str, Any], authors: List[Dict[str, Any]], total: int) -> List[str]:
+    """Report section on who contributes and how concentrated the work is."""
+    if not contributors['contributors']:
+        return []
+    
+    lines = [f"\n## 👥 Contributors"]
+    lines.append(f"- Contributors: {contributors['contributors']}")
+    lines.append(f"- Bus factor: {contributors['bus_factor']} "
+                 f"(authors behind {CONTRIBUTOR_BUS_FACTOR_SHARE:.0%} of commits)")
+    top = ", ".join(f"{a['author']} ({a['commits']}, {a['commits'] / total:.0%})" for a in authors[:5])
+    lines.append(f"- Top contributors: {top}")
+    
+    active = contributors['active']
+    if active.size:
+        peak = int(active.argmax())
+        lines.append(f"- Weekly active contributors: {active.mean():.1f} on average, "
+                     f"peak {active[peak]} in the week of {contributors['weeks'][peak]}")
+    
+    new = contributors['new_contributors']
+    if new:
+        names = ", ".join(new[:5]) + (f" and {len(new) - 5} more" if len(new) > 5 else "")
+        lines.append(f"- First-time contributors in the last {CONTRIBUTOR_RECENT_WEEKS} weeks: {len(new)} ({names})")
+    else:
+        lines.append(f"- First-time contributors in the last {CONTRIBUTOR_RECENT_WEEKS} weeks: none")
+    return lines
+
+
+@instrument()
+def analyze_code_activity(repo_data: Dict[str, Any], output_dir: Optional[str] = None,
+                          commit_analysis: Optional[Union[CommitAnalysis, OnlineCommitAggregator]] = None
+                          ) -> Tuple[List[str], List[str]]:
     """Analyze repository activity and generate insights.
     
     Args:
         repo_data: Repository data containing commits and metadata
+        output_dir: Directory for the charts (defaults to CHART_OUTPUT_DIR)
+        commit_analysis: Analysis of the repository's commits, if the
+            caller already computed it; an OnlineCommitAggregator analyzes
+            a streamed history without holding its commits
         
     Returns:
         Tuple of (analysis insights, chart paths)
     """
     try:
-        commit_messages = repo_data.get('commits', [])
-        commit_dates = repo_data.get('commit_dates', [])
+        if commit_analysis is None:
+            commit_analysis = analyze_commits(repo_data.get('commits'), repo_data.get('commit_dates'))
+        result = commit_analysis
         
-        if not commit_messages:
+        if not len(result):
             return ["No commit data available for analysis"], []
             
         # Generate charts
-        chart_paths = generate_charts(commit_messages, commit_dates)
-        
-        # Analyze commit categories
-        commit_categories = defaultdict(list)
-        category_counter = Counter()
+        chart_paths = generate_charts(result, output_dir=output_dir, repo_url=repo_data.get('repo_url'))
         
-        for msg in commit_messages:
-            short_msg = re.split(r'—|@', msg)[0].strip()
-            category = categorize_commit(short_msg)
-            commit_categories[category].append(short_msg)
-            category_counter[category] += 1
+        category_counter = result.category_counts
 
         # Build analysis insights
         analysis = ["## 🔍 Commit Analysis by Category"]
         
-        for cat, msgs in commit_categories.items():
+        # Categories in order of their newest commit
+        for code in result.categories_by_recency():
+            cat = result.labels[code]
             count = category_counter[cat]
             analysis.append(f"\n### {cat} ({count} commits)")
             
             # Show top 3 commits for each category
-            for msg in msgs[:3]:
+            for sha, message in result.examples(code, 3):
+                msg = f"[{sha[:7]}] {message}" if sha else message
                 clean_msg = msg.replace("\n", " ").strip()
                 if len(clean_msg) > 100:
                     clean_msg = clean_msg[:100] + "..."
@@ -256,10 +480,17 @@ def analyze_code_activity(repo_data: Dict[str, Any]) -> Tuple[List[str], List[st
                 
         # Add summary statistics
         analysis.append(f"\n## 📊 Summary Statistics")
-        analysis.append(f"- Total commits analyzed: {len(commit_messages)}")
-        analysis.append(f"- Most active category: {category_counter.most_common(1)[0][0] if category_counter else 'N/A'}")
+        analysis.append(f"- Total commits analyzed: {len(result)}")
+        analysis.append(f"- Most active category: {result.top_category}")
         analysis.append(f"- Number of categories: {len(category_counter)}")
         
+        authors = [stats for stats in result.authors if stats['author']]
+        if authors:
+            analysis.append(f"- Active authors: {len(authors)}")
+            analysis.append(f"- Most active author: {authors[0]['author']} ({authors[0]['commits']} commits)")
+        
+        analysis.extend(_contributor_insights(result.contributors, authors, len(result)))
+        
         return analysis, chart_paths
         
     except Exception as e:
@@ -0,0 +1,142 @@
+"""Content-addressed chart files.
+
+A chart is named after a hash of the data it plots and the settings it is
+rendered with (``commit_chart-3f2a...png``), so concurrent runs never
+overwrite each other's files and a chart whose inputs are unchanged is
+served from disk instead of being drawn again. Files are written through a
+temporary file and renamed into place, and the least recently used charts
+are evicted once the output directory grows past its size budget.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hex digits of the content hash kept in file names
+_DIGEST_LENGTH = 16
+
+_CHART_FILE = re.compile(rf"^\w+-[0-9a-f]{{{_DIGEST_LENGTH}}}\.\w+$")
+
+
+def chart_filename(name: str, data: Any, settings: Any) -> str:
+    """Content-addressed file name for a chart.
+
+    Args:
+        name: Base file name such as ``commit_chart.png``
+        data: JSON-serializable values the chart plots
+        settings: JSON-serializable render settings (size, DPI, format...)
+
+    Returns:
+        str: ``<stem>-<hash><ext>``
+    """
+    stem, ext = os.path.splitext(name)
+    payload = json.dumps({'chart': name, 'data': data, 'settings': settings},
+                         sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:_DIGEST_LENGTH]
+    return f"{stem}-{digest}{ext}"
+
+
+def chart_title(path: str) -> str:
+    """Display title of a chart file (``.../commit_chart-3f2a...svg`` -> ``Commit Chart``)."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return stem.split('-')[0].replace('_', ' ').title()
+
+
+def render_cached(path: str, render: Callable[[str], None]) -> str:
+    """Return ``path``, rendering it atomically unless it already exists.
+
+    Args:
+        path: Content-addressed chart path
+        render: Writes the chart to the path it is given
+
+    Returns:
+        str: ``path``
+    """
+    if os.path.exists(path):
+        try:
+            # Refresh the mtime so eviction treats the chart as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    os.close(fd)
+    try:
+        render(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def evict_charts(directory: str, max_bytes: int, keep: Iterable[str] = ()) -> int:
+    """Delete the least recently used charts until ``directory`` fits ``max_bytes``.
+
+    Only content-addressed chart files are considered, in ``directory`` and
+    its subdirectories; anything else is left alone.
+
+    Args:
+        directory: Root of the chart output
+        max_bytes: Size budget for the charts
+        keep: Paths that must not be evicted (the charts of the current run)
+
+    Returns:
+        int: Number of files removed
+    """
+    keep = {os.path.abspath(path) for path in keep}
+    charts = []
+    total = 0
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            if not _CHART_FILE.match(filename):
+                continue
+            path = os.path.join(root, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            charts.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+    removed = 0
+    for _, size, path in sorted(charts):
+        if total <= max_bytes:
+            break
+        if os.path.abspath(path) in keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    if removed:
+        logger.info(f"Evicted {removed} cached charts from {directory}")
+    return removed
+
+
+def eviction_root(output_dir: Optional[str], default_dir: str) -> str:
+    """Directory whose size budget a chart directory counts against.
+
+    Per-repository directories inside the default output directory share
+    its budget; any other directory has a budget of its own.
+    """
+    output_dir = os.path.abspath(output_dir or default_dir)
+    default_dir = os.path.abspath(default_dir)
+    try:
+        if os.path.commonpath([output_dir, default_dir]) == default_dir:
+            return default_dir
+    except ValueError:
+        pass
+    return output_dir
@@ -0,0 +1,564 @@
+"""NumPy-backed analytics over commit histories.
+
+Everything here works on whole columns at once: timestamps are viewed as an
+``int64`` array straight from the CommitTable buffer (parsed once, when the
+commits were fetched), histograms are built with ``np.bincount``, categories
+are assigned by the compiled commit classifier in one batch and author
+aggregates are bincounts over factorized names. Cost stays linear with a
+small constant up to the largest histories we analyze.
+
+CommitAnalysis bundles these results so a run classifies, tokenizes and
+aggregates its commits once and every chart and insight reads from it.
+OnlineCommitAggregator offers the same interface for histories too large to
+hold in memory: it consumes commits in chunks and keeps bounded summaries.
+"""
+
+import heapq
+import re
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+import numpy as np
+from src.config.tools import (
+    CONTRIBUTOR_BUS_FACTOR_SHARE,
+    CONTRIBUTOR_RECENT_WEEKS,
+    ONLINE_AGGREGATION_CHUNK,
+    ONLINE_AUTHOR_CAPACITY,
+    ONLINE_TOKEN_CAPACITY
+)
+from src.tools.commit_classifier import get_commit_classifier
+from src.tools.commit_table import CommitRecord, CommitTable, as_commit_table, parse_timestamp
+
+SECONDS_PER_DAY = 86400
+
+# Topic words: four or more word characters
+_TOPIC_WORD = re.compile(r"\b\w{4,}\b")
+
+
+def timestamps_of(commits: Union[CommitTable, Sequence[int]]) -> np.ndarray:
+    """Commit timestamps as an int64 array (zero-copy for a CommitTable)."""
+    if isinstance(commits, CommitTable):
+        return np.frombuffer(commits.timestamp, dtype=np.int64) if len(commits) else np.empty(0, np.int64)
+    return np.asarray(commits, dtype=np.int64)
+
+
+def parse_iso_timestamps(dates: Sequence[str]) -> np.ndarray:
+    """Parse ISO 8601 dates to an int64 array of epoch seconds.
+
+    ``datetime.fromisoformat`` is implemented in C and outruns NumPy's
+    string-to-datetime64 conversion, so this batches the scalar parser.
+    Prefer the timestamps a CommitTable already holds; this is for legacy
+    date lists. Unparsable dates become 0.
+
+    Args:
+        dates: ISO 8601 date strings
+
+    Returns:
+        np.ndarray: int64 seconds since the epoch
+    """
+    return np.fromiter((_parse_one(date) for date in dates), dtype=np.int64, count=len(dates))
+
+
+def _parse_one(date: str) -> int:
+    try:
+        return parse_timestamp(date)
+    except (TypeError, ValueError):
+        return 0
+
+
+def daily_histogram(timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Commits per UTC day between the first and last commit.
+
+    Args:
+        timestamps: Epoch seconds; zeros (unknown dates) are ignored
+
+    Returns:
+        Tuple of (days as datetime64[D], counts), including empty days
+    """
+    days = timestamps[timestamps != 0] // SECONDS_PER_DAY
+    if days.size == 0:
+        return np.empty(0, "datetime64[D]"), np.empty(0, np.int64)
+    first = days.min()
+    counts = np.bincount(days - first)
+    return (first + np.arange(counts.size)).astype("datetime64[D]"), counts
+
+
+def week_index(timestamps: np.ndarray) -> np.ndarray:
+    """Index of the ISO week (starting Monday) of each timestamp."""
+    # 1970-01-01 was a Thursday; shifting by 3 days aligns weeks to Mondays
+    return (timestamps // SECONDS_PER_DAY + 3) // 7
+
+
+def week_start(weeks: np.ndarray) -> np.ndarray:
+    """First day (Monday) of week indices from week_index(), as datetime64[D]."""
+    return (np.asarray(weeks, dtype=np.int64) * 7 - 3).astype("datetime64[D]")
+
+
+def weekly_histogram(timestamps: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Commits per ISO week (starting Monday) between the first and last commit.
+
+    Returns:
+        Tuple of (week start days as datetime64[D], counts)
+    """
+    weeks = week_index(timestamps[timestamps != 0])
+    if weeks.size == 0:
+        return np.empty(0, "datetime64[D]"), np.empty(0, np.int64)
+    first = weeks.min()
+    counts = np.bincount(weeks - first)
+    return week_start(first + np.arange(counts.size)), counts
+
+
+def classify_messages(messages: Sequence[str]) -> np.ndarray:
+    """Category code of every message, as an index into category_labels()."""
+    return get_commit_classifier().classify(messages)
+
+
+def category_labels() -> np.ndarray:
+    """Labels indexed by the codes classify_messages returns."""
+    return get_commit_classifier().labels
+
+
+def categorize_messages(messages: Sequence[str]) -> np.ndarray:
+    """Category label of every message."""
+    return category_labels()[classify_messages(messages)]
+
+
+def category_counts(codes: np.ndarray) -> Dict[str, int]:
+    """Count commits per category from classify_messages codes, most frequent first."""
+    labels = category_labels()
+    counts = np.bincount(codes, minlength=len(labels))
+    order = np.argsort(-counts, kind="stable")
+    return {str(labels[i]): int(counts[i]) for i in order if counts[i]}
+
+
+def factorize(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Integer code of each value and the distinct values, in first-seen order."""
+    # A dict is much cheaper than sorting strings in np.unique
+    index: Dict[str, int] = {}
+    codes = np.fromiter((index.setdefault(value, len(index)) for value in values),
+                        dtype=np.int64, count=len(values))
+    return codes, list(index)
+
+
+def author_stats(commits: CommitTable) -> List[Dict[str, Any]]:
+    """Per-author commit counts and activity span.
+
+    Returns:
+        List of dicts with author, commits, first and last (epoch
+        seconds), most active author first
+    """
+    if not len(commits):
+        return []
+    codes, authors = factorize(commits.author)
+    counts = np.bincount(codes, minlength=len(authors))
+
+    timestamps = timestamps_of(commits)
+    first = np.full(len(authors), np.iinfo(np.int64).max)
+    last = np.zeros(len(authors), np.int64)
+    np.minimum.at(first, codes, timestamps)
+    np.maximum.at(last, codes, timestamps)
+
+    order = np.argsort(-counts, kind="stable")
+    return [
+        {'author': authors[i], 'commits': int(counts[i]), 'first': int(first[i]), 'last': int(last[i])}
+        for i in order
+    ]
+
+
+def bus_factor(counts: np.ndarray, share: float = CONTRIBUTOR_BUS_FACTOR_SHARE) -> int:
+    """Fewest authors who together made ``share`` of the commits.
+
+    Args:
+        counts: Commits per author, in any order
+        share: Fraction of all commits to cover
+    """
+    counts = np.sort(np.asarray(counts, dtype=np.int64))[::-1]
+    if not counts.size or not counts[0]:
+        return 0
+    covered = np.cumsum(counts)
+    return int(np.searchsorted(covered, share * covered[-1])) + 1
+
+
+def summarize_contributors(names: Sequence[str], counts: np.ndarray, first_weeks: np.ndarray,
+                           active_weeks: np.ndarray) -> Dict[str, Any]:
+    """Contributor metrics from per-author aggregates.
+
+    Args:
+        names: Author names
+        counts: Commits per author
+        first_weeks: week_index() of each author's first commit (-1 if unknown)
+        active_weeks: week_index() of every distinct (author, week) pair
+
+    Returns:
+        Dict with contributors, bus_factor, weeks (week starts as
+        datetime64[D]), active and first_time (contributors per week, as
+        arrays over ``weeks``) and new_contributors (authors whose first
+        commit falls in the last CONTRIBUTOR_RECENT_WEEKS weeks, most
+        active first)
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    first_weeks = np.asarray(first_weeks, dtype=np.int64)
+    active_weeks = np.asarray(active_weeks, dtype=np.int64)
+    summary = {
+        'contributors': len(names),
+        'bus_factor': bus_factor(counts),
+        'weeks': np.empty(0, "datetime64[D]"),
+        'active': np.empty(0, np.int64),
+        'first_time': np.empty(0, np.int64),
+        'new_contributors': []
+    }
+    if not active_weeks.size:
+        return summary
+
+    first, last = int(active_weeks.min()), int(active_weeks.max())
+    span = last - first + 1
+    known = first_weeks >= 0
+    summary['weeks'] = week_start(first + np.arange(span))
+    summary['active'] = np.bincount(active_weeks - first, minlength=span)
+    summary['first_time'] = np.bincount(first_weeks[known] - first, minlength=span)[:span]
+
+    recent = np.flatnonzero(known & (first_weeks > last - CONTRIBUTOR_RECENT_WEEKS))
+    recent = recent[np.argsort(-counts[recent], kind="stable")]
+    summary['new_contributors'] = [names[i] for i in recent]
+    return summary
+
+
+def _author_weeks(codes: np.ndarray, timestamps: np.ndarray,
+                  authors: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First week per author and the distinct (author, week) pairs of dated commits.
+
+    Returns:
+        Tuple of (first week per author, -1 if unknown; author code and
+        week of each distinct pair)
+    """
+    dated = timestamps != 0
+    weeks, codes = week_index(timestamps[dated]), codes[dated]
+    first_weeks = np.full(authors, -1, dtype=np.int64)
+    if not weeks.size:
+        return first_weeks, codes, weeks
+    earliest = np.full(authors, np.iinfo(np.int64).max)
+    np.minimum.at(earliest, codes, weeks)
+    seen = earliest != np.iinfo(np.int64).max
+    first_weeks[seen] = earliest[seen]
+    # One key per distinct (week, author) pair
+    base = weeks.min()
+    pairs = np.unique((weeks - base) * authors + codes)
+    return first_weeks, pairs % authors, pairs // authors + base
+
+
+def contributor_stats(commits: CommitTable) -> Dict[str, Any]:
+    """Contributor metrics of a commit table (see summarize_contributors).
+
+    Commits without an author are left out. Everything is computed with
+    group-by aggregates over factorized authors and week indices.
+    """
+    codes, names = factorize(commits.author)
+    timestamps = timestamps_of(commits)
+    if '' in names:
+        anonymous = names.index('')
+        keep = codes != anonymous
+        codes, timestamps = codes[keep], timestamps[keep]
+        # Renumber so the remaining codes are contiguous
+        codes = codes - (codes > anonymous)
+        names = names[:anonymous] + names[anonymous + 1:]
+    counts = np.bincount(codes, minlength=len(names))
+    first_weeks, _, active_weeks = _author_weeks(codes, timestamps, len(names))
+    return summarize_contributors(names, counts, first_weeks, active_weeks)
+
+
+def token_counts(messages: Sequence[str]) -> Counter:
+    """Count topic words (4+ characters, lowercased) across messages.
+
+    Messages are joined with a newline, which is not a word character, so a
+    single scan finds exactly the words a per-message scan would.
+    """
+    return Counter(_TOPIC_WORD.findall("\n".join(messages).lower()))
+
+
+class CommitAnalysis:
+    """Per-run analysis of a commit history, computed in one pass.
+
+    Attributes:
+        commits: The analyzed CommitTable
+        timestamps: int64 epoch seconds per commit (0 when unknown)
+        categories: Category code per commit (index into ``labels``)
+        category_counts: Category label -> commits, most frequent first
+        token_counts: Topic word -> occurrences across all messages
+        authors: author_stats() of the commits
+        contributors: contributor_stats() of the commits
+        days: Days covered by the history, as datetime64[D]
+        daily_counts: Commits per entry of ``days``
+    """
+
+    __slots__ = ("commits", "timestamps", "categories", "category_counts", "token_counts",
+                 "authors", "contributors", "days", "daily_counts")
+
+    def __init__(self, commits: CommitTable):
+        """Analyze a commit table.
+
+        Args:
+            commits: Commits to analyze
+        """
+        self.commits = commits
+        self.timestamps = timestamps_of(commits)
+        self.categories = classify_messages(commits.message)
+        self.category_counts = category_counts(self.categories)
+        self.token_counts = token_counts(commits.message)
+        self.authors = author_stats(commits)
+        self.contributors = contributor_stats(commits)
+        self.days, self.daily_counts = daily_histogram(self.timestamps)
+
+    def __len__(self) -> int:
+        return len(self.commits)
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Labels indexed by the codes in ``categories``."""
+        return category_labels()
+
+    @property
+    def top_category(self) -> str:
+        """Label of the most frequent category, or "N/A" without commits."""
+        return next(iter(self.category_counts), "N/A")
+
+    def categories_by_recency(self) -> List[int]:
+        """Category codes ordered by their newest commit."""
+        codes, first_seen = np.unique(self.categories, return_index=True)
+        return codes[np.argsort(first_seen)].tolist()
+
+    def commits_in(self, code: int, limit: Optional[int] = None) -> List[int]:
+        """Indices of the commits in a category, newest first."""
+        return np.flatnonzero(self.categories == code)[:limit].tolist()
+
+    def examples(self, code: int, limit: int = 3) -> List[Tuple[str, str]]:
+        """(sha, message) of the newest commits in a category."""
+        return [(self.commits.sha[i], self.commits.message[i]) for i in self.commits_in(code, limit)]
+
+
+class MisraGries:
+    """Heavy hitters of a stream in at most ``capacity`` counters.
+
+    Every item seen more than ``total / (capacity + 1)`` times is kept, and a
+    kept count is low by at most that much; with no more distinct items than
+    counters the counts are exact. Batches are merged and then reduced by the
+    (capacity + 1)-th largest count, which keeps the same guarantee.
+    """
+
+    __slots__ = ("capacity", "counts", "total")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.total = 0
+
+    def update(self, counts: Mapping[str, int]) -> List[str]:
+        """Add a batch of counts.
+
+        Returns:
+            List[str]: Items dropped from the summary by this update
+        """
+        for item, count in counts.items():
+            self.counts[item] = self.counts.get(item, 0) + count
+            self.total += count
+        if len(self.counts) <= self.capacity:
+            return []
+        cut = heapq.nlargest(self.capacity + 1, self.counts.values())[-1]
+        dropped = [item for item, count in self.counts.items() if count <= cut]
+        self.counts = {item: count - cut for item, count in self.counts.items() if count > cut}
+        return dropped
+
+    def most_common(self, n: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Tracked items, most frequent first."""
+        return Counter(self.counts).most_common(n)
+
+
+class OnlineCommitAggregator:
+    """Streaming counterpart of CommitAnalysis with bounded memory.
+
+    Commits are consumed newest first, in chunks, from any iterable of
+    commit dicts (as yielded by ``iter_commits``) or CommitRecords. Counts
+    per day, per category and the per-category examples are exact; topic
+    words and authors are summarized by Misra-Gries sketches, so they are
+    exact until the number of distinct words or authors exceeds the sketch
+    capacity. Contributor statistics cover the tracked authors only. Memory
+    grows with the number of days covered, not commits or authors.
+
+    Example:
+        aggregator = OnlineCommitAggregator().consume(iter_commits(repo_url))
+        insights, charts = analyze_code_activity({}, commit_analysis=aggregator)
+    """
+
+    def __init__(self, token_capacity: int = ONLINE_TOKEN_CAPACITY,
+                 author_capacity: int = ONLINE_AUTHOR_CAPACITY, examples: int = 3):
+        """Create an empty aggregator.
+
+        Args:
+            token_capacity: Topic words tracked by the token sketch
+            author_capacity: Authors tracked by the author sketch
+            examples: Newest commits kept per category
+        """
+        self.count = 0
+        self.max_examples = examples
+        self._daily: Counter = Counter()
+        self._categories = np.zeros(len(category_labels()), dtype=np.int64)
+        self._category_order: List[int] = []
+        self._examples: Dict[int, List[Tuple[str, str]]] = {}
+        self._tokens = MisraGries(token_capacity)
+        self._authors = MisraGries(author_capacity)
+        self._author_span: Dict[str, List[int]] = {}
+        self._first_week: Dict[str, int] = {}
+        # Weeks with commits of each tracked author
+        self._active_weeks: Dict[str, set] = {}
+
+    def consume(self, commits: Iterable[Union[Dict[str, Any], CommitRecord]],
+                chunk_size: int = ONLINE_AGGREGATION_CHUNK) -> "OnlineCommitAggregator":
+        """Aggregate a stream of commits, ``chunk_size`` at a time.
+
+        Commit dicts whose date cannot be parsed are skipped, as in
+        ``CommitTable.from_commits``.
+
+        Returns:
+            OnlineCommitAggregator: self, for chaining
+        """
+        commits = iter(commits)
+        while True:
+            chunk = list(islice(commits, chunk_size))
+            if not chunk:
+                return self
+            if isinstance(chunk[0], CommitRecord):
+                table = CommitTable()
+                for record in chunk:
+                    table.append(record.sha, record.author, record.timestamp, record.message)
+            else:
+                table = CommitTable.from_commits(chunk)
+            self.update(table)
+
+    def update(self, table: CommitTable):
+        """Aggregate one chunk of commits; chunks must arrive newest first."""
+        if not len(table):
+            return
+        self.count += len(table)
+
+        timestamps = timestamps_of(table)
+        days, counts = np.unique(timestamps[timestamps != 0] // SECONDS_PER_DAY, return_counts=True)
+        self._daily.update(dict(zip(days.tolist(), counts.tolist())))
+
+        codes = classify_messages(table.message)
+        self._categories += np.bincount(codes, minlength=self._categories.size)
+        for i, code in enumerate(codes.tolist()):
+            examples = self._examples.setdefault(code, [])
+            if not examples:
+                self._category_order.append(code)
+            if len(examples) < self.max_examples:
+                examples.append((table.sha[i], table.message[i]))
+
+        self._tokens.update(token_counts(table.message))
+
+        # Counter keeps first-appearance order, which breaks ties as author_stats() does
+        for dropped in self._authors.update(Counter(table.author)):
+            self._author_span.pop(dropped, None)
+            self._first_week.pop(dropped, None)
+            self._active_weeks.pop(dropped, None)
+        for s in author_stats(table):
+            if s['author'] not in self._authors.counts:
+                continue
+            span = self._author_span.setdefault(s['author'], [s['first'], s['last']])
+            span[0] = min(span[0], s['first'])
+            span[1] = max(span[1], s['last'])
+
+        codes, names = factorize(table.author)
+        first_weeks, pair_codes, pair_weeks = _author_weeks(codes, timestamps, len(names))
+        for code, week in zip(pair_codes.tolist(), pair_weeks.tolist()):
+            if names[code] in self._authors.counts:
+                self._active_weeks.setdefault(names[code], set()).add(week)
+        for name, week in zip(names, first_weeks.tolist()):
+            if week >= 0 and name in self._authors.counts:
+                self._first_week[name] = min(week, self._first_week.get(name, week))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def labels(self) -> np.ndarray:
+        """Labels indexed by category code."""
+        return category_labels()
+
+    @property
+    def category_counts(self) -> Dict[str, int]:
+        """Category label -> commits, most frequent first."""
+        labels = self.labels
+        order = np.argsort(-self._categories, kind="stable")
+        return {str(labels[i]): int(self._categories[i]) for i in order if self._categories[i]}
+
+    @property
+    def top_category(self) -> str:
+        """Label of the most frequent category, or "N/A" without commits."""
+        return next(iter(self.category_counts), "N/A")
+
+    @property
+    def token_counts(self) -> Counter:
+        """Topic word counts tracked by the token sketch."""
+        return Counter(self._tokens.counts)
+
+    @property
+    def authors(self) -> List[Dict[str, Any]]:
+        """Tracked authors in author_stats() form, most active first."""
+        return [
+            {'author': author, 'commits': count,
+             'first': self._author_span[author][0], 'last': self._author_span[author][1]}
+            for author, count in self._authors.most_common()
+        ]
+
+    @property
+    def contributors(self) -> Dict[str, Any]:
+        """contributor_stats() equivalent over the tracked authors."""
+        names = [author for author, _ in self._authors.most_common() if author]
+        counts = np.array([self._authors.counts[name] for name in names], dtype=np.int64)
+        first_weeks = np.array([self._first_week.get(name, -1) for name in names], dtype=np.int64)
+        active_weeks = np.fromiter((week for name in names for week in self._active_weeks.get(name, ())),
+                                   dtype=np.int64)
+        return summarize_contributors(names, counts, first_weeks, active_weeks)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Days covered by the history, as datetime64[D]."""
+        if not self._daily:
+            return np.empty(0, "datetime64[D]")
+        first, last = min(self._daily), max(self._daily)
+        return np.arange(first, last + 1).astype("datetime64[D]")
+
+    @property
+    def daily_counts(self) -> np.ndarray:
+        """Commits per entry of ``days``."""
+        if not self._daily:
+            return np.empty(0, np.int64)
+        first = min(self._daily)
+        counts = np.zeros(max(self._daily) - first + 1, dtype=np.int64)
+        for day, count in self._daily.items():
+            counts[day - first] = count
+        return counts
+
+    def categories_by_recency(self) -> List[int]:
+        """Category codes ordered by their newest commit."""
+        return list(self._category_order)
+
+    def examples(self, code: int, limit: int = 3) -> List[Tuple[str, str]]:
+        """(sha, message) of the newest commits in a category."""
+        return self._examples.get(code, [])[:limit]
+
+
+def analyze_commits(commits: Union[CommitAnalysis, OnlineCommitAggregator, CommitTable, Sequence[str], None],
+                    commit_dates: Optional[Sequence[str]] = None) -> Union[CommitAnalysis, OnlineCommitAggregator]:
+    """Analyze commits once, reusing an existing analysis as is.
+
+    Args:
+        commits: CommitAnalysis or OnlineCommitAggregator (returned as is),
+            CommitTable or legacy formatted commit strings
+        commit_dates: Commit dates for a legacy string list
+
+    Returns:
+        Shared intermediate result for charts and insights
+    """
+    if isinstance(commits, (CommitAnalysis, OnlineCommitAggregator)):
+        return commits
+    return CommitAnalysis(as_commit_table(commits, commit_dates))
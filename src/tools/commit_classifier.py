@@ -0,0 +1,192 @@
+"""Commit message classifier compiled from COMMIT_CATEGORIES.
+
+Each category is compiled into a regular expression shaped like a trie
+(``d(?:e(?:lete|ploy|ps)|oc(?:s|umentation|))``...), and a message takes the
+first category, in priority order, whose expression matches it.
+
+Batches skip the regex engine: the joined, lowercased messages are viewed as
+one byte array, word starts are found with NumPy and sorted by their first
+two bytes, and each keyword only compares its remaining bytes against its
+slice of word starts. A NumPy minimum then picks the best category per
+message. Messages with non-ASCII characters next to a word fall back to the
+regexes, since Unicode decides where their words start.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.config.tools import (
+    COMMIT_CATEGORIES,
+    COMMIT_CATEGORY_LABELS,
+    COMMIT_DEFAULT_CATEGORY_LABEL
+)
+
+# Keywords shorter than this must match a whole word ("ci" but not "circle")
+_MIN_PREFIX_LENGTH = 3
+
+# Joins the messages of a batch; a non-word byte, so it also ends words
+_SEPARATOR = "\x00"
+
+# Keywords the batch path can match on bytes
+_ASCII_KEYWORD = re.compile(r"[a-z0-9_]+")
+
+
+def _trie_pattern(keywords: Sequence[str]) -> str:
+    """Regex alternation of keywords factored into a trie."""
+    root: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict], depth: int) -> str:
+        alternatives = [re.escape(char) + emit(child, depth + 1) for char, child in sorted(node.items()) if char]
+        if "" in node:
+            # Empty (or boundary) alternative last, so longer keywords win
+            alternatives.append(r"\b" if depth < _MIN_PREFIX_LENGTH else "")
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return "(?:" + "|".join(alternatives) + ")"
+
+    return emit(root, 0)
+
+
+def _is_ascii_word(data: np.ndarray) -> np.ndarray:
+    """Mask of the bytes ``\\w`` matches in ASCII text."""
+    return ((data | 0x20) - ord("a") < 26) | (data - ord("0") < 10) | (data == ord("_"))
+
+
+def _key_range(keyword: bytes) -> Tuple[int, int]:
+    """Two-byte word-start keys (first byte << 8 | second) starting with keyword."""
+    if len(keyword) == 1:
+        return keyword[0] << 8, (keyword[0] + 1) << 8
+    key = keyword[0] << 8 | keyword[1]
+    return key, key + 1
+
+
+class CommitClassifier:
+    """Priority-ordered commit message classifier."""
+
+    def __init__(self, categories: Optional[Dict[str, List[str]]] = None,
+                 labels: Optional[Dict[str, str]] = None,
+                 default_label: str = COMMIT_DEFAULT_CATEGORY_LABEL):
+        """Compile the classifier.
+
+        Args:
+            categories: Category name -> keywords, in priority order
+            labels: Category name -> display label (defaults to the name)
+            default_label: Label of messages matching no category
+        """
+        categories = COMMIT_CATEGORIES if categories is None else categories
+        labels = COMMIT_CATEGORY_LABELS if labels is None else labels
+
+        self.categories = list(categories)
+        # Index len(categories) is the default category
+        self.labels = np.array([labels.get(name, name) for name in self.categories] + [default_label],
+                               dtype=object)
+        self.default_code = len(self.categories)
+
+        # Code and pattern of each category with keywords, in priority order
+        self._patterns = [(code, re.compile(r"\b" + _trie_pattern([keyword.lower() for keyword in keywords])))
+                          for code, keywords in enumerate(categories.values()) if keywords]
+
+        # Keyword -> code of the highest-priority category listing it
+        codes: Dict[str, int] = {}
+        for code, keywords in enumerate(categories.values()):
+            for keyword in keywords:
+                codes.setdefault(keyword.lower(), code)
+        # Batch matching compares the bytes at word starts, so it takes
+        # keywords made of ASCII word characters only. A keyword extending
+        # another one of the same or higher priority can never decide a match
+        self._keywords: Optional[List[Tuple[bytes, int]]] = None
+        if codes and all(_ASCII_KEYWORD.fullmatch(keyword) for keyword in codes):
+            self._keywords = [
+                (keyword.encode(), code) for keyword, code in codes.items()
+                if not any(keyword != other and keyword.startswith(other) and codes[other] <= code
+                           and len(other) >= _MIN_PREFIX_LENGTH for other in codes)
+            ]
+            # Range of two-byte word-start keys beginning with each keyword
+            self._key_ranges = np.array([_key_range(keyword) for keyword, _ in self._keywords], dtype=np.uint16)
+        self._padding = b"\0" * (max(map(len, codes), default=0) + 1)
+
+    def classify_one(self, message: str) -> int:
+        """Category code (index into ``labels``) of one message."""
+        lowered = message.lower()
+        for code, pattern in self._patterns:
+            if pattern.search(lowered):
+                return code
+        return self.default_code
+
+    def categorize(self, message: str) -> str:
+        """Category label of one message."""
+        return self.labels[self.classify_one(message)]
+
+    def classify(self, messages: Sequence[str]) -> np.ndarray:
+        """Category codes of a batch of messages.
+
+        Returns:
+            np.ndarray: int16 index into ``labels`` per message
+        """
+        count = len(messages)
+        if count == 0 or self._keywords is None:
+            return np.fromiter(map(self.classify_one, messages), dtype=np.int16, count=count)
+
+        # A leading separator makes every message start after one
+        encoded = (_SEPARATOR + _SEPARATOR.join(messages).lower()).encode("utf-8", "replace")
+        data = np.frombuffer(encoded + self._padding, dtype=np.uint8)
+        bounds = np.flatnonzero(data[:len(encoded)] == 0)
+        if bounds.size != count:
+            # A message contained the separator itself
+            return np.fromiter(map(self.classify_one, messages), dtype=np.int16, count=count)
+
+        is_ascii_word = _is_ascii_word(data)
+        is_high = data >= 0x80
+        is_word = is_ascii_word | is_high
+        word_starts = np.flatnonzero(is_ascii_word[1:] & ~is_word[:-1]) + 1
+
+        # Sort word starts by their first two bytes, so the candidates of a
+        # keyword are one slice and only its remaining bytes are compared
+        keys = data[word_starts].astype(np.uint16) << 8 | data[word_starts + 1]
+        order = np.argsort(keys, kind="stable")
+        keys, word_starts = keys[order], word_starts[order]
+        slices = np.searchsorted(keys, self._key_ranges).tolist()
+
+        positions, codes = [], []
+        for (keyword, code), (low, high) in zip(self._keywords, slices):
+            candidates = word_starts[low:high]
+            for offset in range(2, len(keyword)):
+                candidates = candidates[data[candidates + offset] == keyword[offset]]
+            if len(keyword) < _MIN_PREFIX_LENGTH:
+                candidates = candidates[~is_word[candidates + len(keyword)]]
+            positions.append(candidates)
+            codes.append(np.full(candidates.size, code, dtype=np.int16))
+
+        result = np.full(count, self.default_code, dtype=np.int16)
+        positions = np.concatenate(positions)
+        np.minimum.at(result, np.searchsorted(bounds, positions) - 1, np.concatenate(codes))
+
+        # Word boundaries next to non-ASCII characters depend on the Unicode
+        # category of the character; such messages go through the regexes
+        mixed = np.flatnonzero((is_high[:-1] & is_ascii_word[1:]) | (is_ascii_word[:-1] & is_high[1:]))
+        for index in np.unique(np.searchsorted(bounds, mixed, side="right") - 1).tolist():
+            result[index] = self.classify_one(messages[index])
+        return result
+
+    def categorize_all(self, messages: Sequence[str]) -> List[str]:
+        """Category labels of a batch of messages."""
+        return self.labels[self.classify(messages)].tolist()
+
+
+_classifier: Optional[CommitClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_commit_classifier() -> CommitClassifier:
+    """Get the shared classifier compiled from the configured categories."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = CommitClassifier()
+        return _classifier
@@ -0,0 +1,97 @@
+"""Persistent per-repository commit history with a high-water mark.
+
+The store remembers every commit already fetched for a repository together
+with the newest commit seen (the high-water mark). Later runs only ask
+GitHub for commits after that mark and merge them in front of the stored
+history, so fetch cost scales with new activity instead of total history.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from typing import Any, Dict, List, Optional
+import logging
+from src.config.tools import COMMIT_STORE_DIR, COMMIT_STORE_MAX_COMMITS
+
+logger = logging.getLogger(__name__)
+
+
+class CommitStore:
+    """JSON-file store of commit histories keyed by repository URL."""
+
+    def __init__(self, store_dir: str = COMMIT_STORE_DIR, max_commits: int = COMMIT_STORE_MAX_COMMITS):
+        self.store_dir = store_dir
+        self.max_commits = max_commits
+
+    def _path(self, repo_url: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', "_".join(repo_url.rstrip('/').split('/')[-2:]))
+        digest = hashlib.sha256(repo_url.rstrip('/').lower().encode()).hexdigest()[:12]
+        return os.path.join(self.store_dir, f"{name}-{digest}.json")
+
+    def load(self, repo_url: str) -> Dict[str, Any]:
+        """Load the stored history of a repository.
+
+        Returns:
+            Dict with ``commits`` (newest first) and ``high_water`` (the
+            newest commit's sha and committer date, or None when nothing
+            is stored)
+        """
+        try:
+            with open(self._path(repo_url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'repo_url': repo_url, 'high_water': None, 'commits': []}
+
+    def high_water(self, repo_url: str) -> Optional[Dict[str, str]]:
+        """Newest commit recorded for a repository, if any."""
+        return self.load(repo_url).get('high_water')
+
+    def merge(self, repo_url: str, new_commits: List[Dict[str, str]], replace: bool = False) -> List[Dict[str, str]]:
+        """Merge newly fetched commits in front of the stored history.
+
+        Args:
+            repo_url: Repository URL
+            new_commits: Commits fetched since the high-water mark, newest first
+            replace: Discard the stored history, e.g. when the new commits
+                do not reach back to the old mark and would leave a gap
+
+        Returns:
+            List of commits, newest first, as now stored
+        """
+        stored = [] if replace else self.load(repo_url).get('commits', [])
+
+        seen = set()
+        merged = []
+        for commit in new_commits + stored:
+            if commit['sha'] in seen:
+                continue
+            seen.add(commit['sha'])
+            merged.append(commit)
+        merged = merged[:self.max_commits]
+
+        state = {
+            'repo_url': repo_url,
+            # GitHub's since= filter compares committer dates, which for rebased
+            # or cherry-picked commits are newer than their author dates
+            'high_water': {'sha': merged[0]['sha'], 'date': _committed_date(merged[0])} if merged else None,
+            'commits': merged
+        }
+        self._write(repo_url, state)
+        return merged
+
+    def _write(self, repo_url: str, state: Dict[str, Any]):
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._path(repo_url))
+        except OSError as e:
+            logger.warning(f"Could not persist commit history for {repo_url}: {e}")
+
+
+def _committed_date(commit: Dict[str, str]) -> str:
+    # Records stored before committer dates were kept only have the author date
+    return commit.get('committed_date') or commit['date']
@@ -0,0 +1,172 @@
+"""Columnar commit records shared by the scraping and analysis tools.
+
+Commits are kept as parallel columns rather than formatted strings: SHAs,
+authors and messages as lists, timestamps (seconds since the epoch, UTC) in
+an ``int64`` array, and optional line statistics. Analysis code reads the
+columns directly; the ``"[sha] message — author @ date"`` form is only
+produced when a report renders a commit.
+"""
+
+from array import array
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+
+def parse_timestamp(date: str) -> int:
+    """Convert an ISO 8601 date (``Z`` or offset) to epoch seconds."""
+    return int(datetime.fromisoformat(date.replace('Z', '+00:00')).timestamp())
+
+
+def format_timestamp(timestamp: int) -> str:
+    """Render epoch seconds in GitHub's ISO 8601 UTC form."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class CommitRecord(NamedTuple):
+    """One row of a CommitTable, rendered lazily by ``str()``."""
+    sha: str
+    author: str
+    timestamp: int
+    message: str
+    additions: Optional[int] = None
+    deletions: Optional[int] = None
+
+    @property
+    def date(self) -> str:
+        """Commit date in ISO 8601 UTC form."""
+        return format_timestamp(self.timestamp)
+
+    def __str__(self) -> str:
+        return f"[{self.sha[:7]}] {self.message} — {self.author} @ {self.date}"
+
+
+class CommitTable:
+    """Compact column store of commits, newest first."""
+
+    __slots__ = ("sha", "author", "timestamp", "message", "additions", "deletions")
+
+    def __init__(self, with_stats: bool = False):
+        self.sha: List[str] = []
+        self.author: List[str] = []
+        self.timestamp = array('q')
+        self.message: List[str] = []
+        self.additions: Optional[array] = array('q') if with_stats else None
+        self.deletions: Optional[array] = array('q') if with_stats else None
+
+    @property
+    def has_stats(self) -> bool:
+        """Whether additions/deletions columns are present."""
+        return self.additions is not None
+
+    def append(self, sha: str, author: str, timestamp: int, message: str,
+               additions: Optional[int] = None, deletions: Optional[int] = None):
+        """Append one commit."""
+        self.sha.append(sha)
+        self.author.append(author)
+        self.timestamp.append(timestamp)
+        self.message.append(message)
+        if self.additions is not None:
+            self.additions.append(additions or 0)
+            self.deletions.append(deletions or 0)
+
+    @classmethod
+    def from_commits(cls, commits: Iterable[Dict[str, Any]], with_stats: bool = False) -> "CommitTable":
+        """Build a table from commit dicts with sha, author, date and message keys.
+
+        Commits whose date cannot be parsed are skipped.
+        """
+        table = cls(with_stats=with_stats)
+        for commit in commits:
+            try:
+                timestamp = parse_timestamp(commit['date'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            table.append(commit['sha'], commit['author'], timestamp, commit['message'],
+                         commit.get('additions'), commit.get('deletions'))
+        return table
+
+    @classmethod
+    def from_formatted(cls, commits: Iterable[str]) -> "CommitTable":
+        """Build a table from legacy ``"[sha] message — author @ date"`` strings.
+
+        Author and date are split off from the right, so ``@`` or ``—`` inside
+        messages are kept intact. Strings without those parts keep the whole
+        text as message with an empty author and a zero timestamp.
+        """
+        table = cls()
+        for text in commits:
+            head, sep, date = text.rpartition(' @ ')
+            timestamp = 0
+            if sep:
+                try:
+                    timestamp = parse_timestamp(date.strip())
+                except ValueError:
+                    head = text
+            else:
+                head = text
+            message, sep, author = head.rpartition(' — ')
+            if not sep:
+                message, author = head, ''
+            sha = ''
+            if message.startswith('[') and '] ' in message:
+                sha, message = message[1:].split('] ', 1)
+            table.append(sha, author.strip(), timestamp, message.strip())
+        return table
+
+    def record(self, index: int) -> CommitRecord:
+        """Row ``index`` as a CommitRecord."""
+        return CommitRecord(
+            self.sha[index],
+            self.author[index],
+            self.timestamp[index],
+            self.message[index],
+            self.additions[index] if self.additions is not None else None,
+            self.deletions[index] if self.deletions is not None else None
+        )
+
+    def dates(self) -> List[str]:
+        """ISO 8601 dates of all commits."""
+        return [format_timestamp(ts) for ts in self.timestamp]
+
+    def __len__(self) -> int:
+        return len(self.sha)
+
+    def __iter__(self) -> Iterator[CommitRecord]:
+        return (self.record(i) for i in range(len(self.sha)))
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[CommitRecord, "CommitTable"]:
+        if isinstance(key, slice):
+            table = CommitTable(with_stats=self.has_stats)
+            table.sha = self.sha[key]
+            table.author = self.author[key]
+            table.timestamp = self.timestamp[key]
+            table.message = self.message[key]
+            if self.has_stats:
+                table.additions = self.additions[key]
+                table.deletions = self.deletions[key]
+            return table
+        return self.record(key)
+
+    def __repr__(self) -> str:
+        return f"CommitTable({len(self)} commits)"
+
+
+def as_commit_table(commits: Union[CommitTable, Iterable[str], None],
+                    dates: Optional[List[str]] = None) -> CommitTable:
+    """Accept a CommitTable or a legacy list of formatted commit strings.
+
+    Args:
+        commits: CommitTable, or formatted strings as produced before tables
+        dates: Legacy ``commit_dates`` list, used for strings without a date
+    """
+    if isinstance(commits, CommitTable):
+        return commits
+    table = CommitTable.from_formatted(commits or [])
+    if dates and len(dates) == len(table):
+        for i, date in enumerate(dates):
+            if not table.timestamp[i]:
+                try:
+                    table.timestamp[i] = parse_timestamp(date)
+                except (TypeError, ValueError):
+                    pass
+    return table
@@ -1,46 +1,160 @@
 """Decorator utilities for LangManus Demo tools."""
 
 import functools
+import random
 import time
 import logging
-from typing import Any, Callable, Dict, Optional
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 import threading
+from src.tools.metrics import get_histogram
 
 logger = logging.getLogger(__name__)
 
 
-def retry(max_attempts: int = 3, delay: float = 1.0, exponential_backoff: bool = True):
+class RetryPolicy:
+    """Retry schedule with full-jitter backoff and server-directed delays.
+    
+    Only errors classified as transient are retried: connection problems,
+    timeouts and HTTP 408/425/429/5xx responses, plus 403 responses that
+    GitHub uses for exhausted rate limits. Other 4xx responses are raised
+    immediately. When the server sends ``Retry-After`` or, with no quota
+    left, ``X-RateLimit-Reset``, that delay is used instead of the backoff;
+    a server delay longer than ``max_delay`` raises the error instead of
+    sleeping, since retrying any earlier would only be refused again. The
+    whole call, including sleeps, is bounded by ``deadline`` seconds.
+    
+    Instances can be used as decorators or through ``call()``.
+    """
+    
+    RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+    
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 deadline: Optional[float] = None, exponential_backoff: bool = True,
+                 retry_on: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError, OSError),
+                 retryable_status_codes: Optional[frozenset] = None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.exponential_backoff = exponential_backoff
+        self.retry_on = retry_on
+        self.retryable_status_codes = (
+            self.RETRYABLE_STATUS_CODES if retryable_status_codes is None else retryable_status_codes
+        )
+    
+    @staticmethod
+    def _response_of(exc: BaseException) -> Any:
+        return getattr(exc, "response", None)
+    
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Classify an exception as transient (retry) or permanent (raise)."""
+        if isinstance(exc, CircuitOpenError):
+            return False
+        
+        response = self._response_of(exc)
+        status = getattr(response, "status_code", None)
+        if status is not None:
+            if status == 403:
+                headers = getattr(response, "headers", None) or {}
+                return headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers
+            return status in self.retryable_status_codes
+        
+        return isinstance(exc, self.retry_on)
+    
+    def server_delay(self, exc: BaseException) -> Optional[float]:
+        """Delay requested by the server through rate-limit headers, if any."""
+        headers = getattr(self._response_of(exc), "headers", None) or {}
+        
+        retry_after = headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        
+        reset = headers.get("X-RateLimit-Reset")
+        if reset and headers.get("X-RateLimit-Remaining") == "0":
+            try:
+                return max(0.0, float(reset) - time.time())
+            except ValueError:
+                pass
+        
+        return None
+    
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff for a zero-based attempt number."""
+        ceiling = self.base_delay * (2 ** attempt if self.exponential_backoff else 1)
+        return random.uniform(0, min(self.max_delay, ceiling))
+    
+    def next_delay(self, attempt: int, exc: BaseException) -> float:
+        """Delay before the next attempt after ``exc``."""
+        delay = self.server_delay(exc)
+        return self.backoff(attempt) if delay is None else delay
+    
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """Call ``func`` with retries according to this policy."""
+        deadline_at = time.monotonic() + self.deadline if self.deadline is not None else None
+        
+        for attempt in range(self.max_attempts):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if not self.is_retryable(e):
+                    raise
+                if attempt == self.max_attempts - 1:
+                    logger.error(f"All {self.max_attempts} attempts failed for {func.__name__}")
+                    raise
+                
+                delay = self.next_delay(attempt, e)
+                if delay > self.max_delay:
+                    logger.error(f"Server asked to wait {delay:.0f}s before retrying {func.__name__}, "
+                                 f"more than the {self.max_delay}s maximum delay")
+                    raise
+                if deadline_at is not None and time.monotonic() + delay > deadline_at:
+                    logger.error(f"Retry deadline of {self.deadline}s exceeded for {func.__name__}")
+                    raise
+                
+                logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+    
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        
+        return wrapper
+
+
+def retry(max_attempts: int = 3, delay: float = 1.0, exponential_backoff: bool = True,
+          policy: Optional[RetryPolicy] = None):
     """Decorator to retry function execution on failure.
     
+    Delays use full jitter and HTTP errors are classified as in RetryPolicy,
+    so permanent 4xx responses are not retried. Any other exception is
+    retried. Pass ``policy`` for full control over classification,
+    server-directed delays and the deadline budget.
+    
     Args:
         max_attempts: Maximum number of retry attempts
         delay: Initial delay between retries in seconds
         exponential_backoff: Whether to use exponential backoff
+        policy: Retry policy to use instead of the arguments above
     """
-    def decorator(func: Callable) -> Callable:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
-            current_delay = delay
-            
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        logger.warning(f"Attempt {attempt + 1} failed for {func.__name__}: {e}, retrying in {current_delay}s")
-                        time.sleep(current_delay)
-                        if exponential_backoff:
-                            current_delay *= 2
-                    else:
-                        logger.error(f"All {max_attempts} attempts failed for {func.__name__}")
-            
-            # If we get here, all attempts failed
-            raise last_exception
-        
-        return wrapper
-    return decorator
+    if policy is None:
+        policy = RetryPolicy(
+            max_attempts=max_attempts,
+            base_delay=delay,
+            max_delay=delay * 2 ** max(max_attempts - 1, 0),
+            exponential_backoff=exponential_backoff,
+            retry_on=(Exception,)
+        )
+    return policy
 
 
 def timeout(seconds: float):
@@ -79,26 +193,67 @@ def timeout(seconds: float):
     return decorator
 
 
+def instrument(name: str = "tool_call_duration_seconds", buckets: Optional[Tuple[float, ...]] = None,
+               **labels):
+    """Decorator to record call latency into the in-process histogram registry.
+    
+    Histograms are resolved once at decoration time (one for successful
+    calls, one for failures), so each call only costs two clock reads and a
+    bucket increment.
+    
+    Args:
+        name: Metric name
+        buckets: Bucket upper bounds in seconds (defaults to DEFAULT_BUCKETS)
+        **labels: Extra labels; ``function`` defaults to the function name
+    """
+    def decorator(func: Callable) -> Callable:
+        base_labels = {"function": func.__name__, **labels}
+        ok_histogram = get_histogram(name, {**base_labels, "outcome": "ok"}, buckets)
+        error_histogram = get_histogram(name, {**base_labels, "outcome": "error"}, buckets)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                error_histogram.observe(time.perf_counter() - start_time)
+                raise
+            ok_histogram.observe(time.perf_counter() - start_time)
+            return result
+        
+        return wrapper
+    return decorator
+
+
 def log_execution(level: int = logging.INFO):
     """Decorator to log function execution.
     
+    Durations are also recorded in the ``tool_call_duration_seconds``
+    histogram, labelled with the function name and outcome.
+    
     Args:
         level: Logging level
     """
     def decorator(func: Callable) -> Callable:
+        func_name = func.__name__
+        ok_histogram = get_histogram("tool_call_duration_seconds", {"function": func_name, "outcome": "ok"})
+        error_histogram = get_histogram("tool_call_duration_seconds", {"function": func_name, "outcome": "error"})
+        
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            func_name = func.__name__
-            logger.log(level, f"Starting execution of {func_name}")
+            logger.log(level, "Starting execution of %s", func_name)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             try:
                 result = func(*args, **kwargs)
-                execution_time = time.time() - start_time
-                logger.log(level, f"Completed {func_name} in {execution_time:.2f} seconds")
+                execution_time = time.perf_counter() - start_time
+                ok_histogram.observe(execution_time)
+                logger.log(level, "Completed %s in %.2f seconds", func_name, execution_time)
                 return result
             except Exception as e:
-                execution_time = time.time() - start_time
+                execution_time = time.perf_counter() - start_time
+                error_histogram.observe(execution_time)
                 logger.error(f"Failed {func_name} after {execution_time:.2f} seconds: {e}")
                 raise
         
@@ -218,3 +373,194 @@ def rate_limit(calls_per_second: float):
         
         return wrapper
     return decorator
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker shared by every call to one endpoint.
+    
+    The breaker tracks the outcome of the most recent calls. Once at least
+    ``minimum_calls`` have been recorded and the failure rate reaches
+    ``failure_threshold`` it opens and rejects calls for ``recovery_timeout``
+    seconds. It then lets ``half_open_max_calls`` trial calls through: a
+    success closes the circuit again, a failure re-opens it.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, name: str, failure_threshold: float = 0.5, minimum_calls: int = 5,
+                 window_size: int = 20, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.minimum_calls = minimum_calls
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the timeout elapsed."""
+        with self._lock:
+            return self._current_state()
+    
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit '{self.name}' half-open, allowing trial calls")
+        return self._state
+    
+    def allow_request(self) -> bool:
+        """Return whether a call may proceed right now."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            return False
+    
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                logger.info(f"Circuit '{self.name}' closed after successful trial call")
+                self._state = self.CLOSED
+                self._outcomes.clear()
+            self._outcomes.append(True)
+    
+    def record_failure(self):
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if len(self._outcomes) < self.minimum_calls:
+                return
+            failures = self._outcomes.count(False)
+            if failures / len(self._outcomes) >= self.failure_threshold:
+                self._open()
+    
+    def record_ignored(self):
+        """Record a call whose outcome says nothing about the endpoint.
+        
+        A half-open trial slot taken by the call is released, so the next
+        call can be the trial instead.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+    
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        logger.warning(f"Circuit '{self.name}' opened, failing fast for {self.recovery_timeout}s")
+    
+    def reset(self):
+        """Force the circuit back to the closed state."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._outcomes.clear()
+            self._half_open_calls = 0
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Get the shared circuit breaker for an endpoint, creating it on first use.
+    
+    Args:
+        name: Endpoint name shared by every caller of the same service
+        **kwargs: CircuitBreaker settings, only used when the breaker is created
+        
+    Returns:
+        CircuitBreaker: The breaker registered under ``name``
+    """
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, **kwargs)
+            _circuit_breakers[name] = breaker
+        return breaker
+
+
+def circuit_breaker(name: str, failure_threshold: float = 0.5, minimum_calls: int = 5,
+                    window_size: int = 20, recovery_timeout: float = 30.0,
+                    fallback: Optional[Callable] = None,
+                    expected_exceptions: Tuple[Type[BaseException], ...] = (Exception,),
+                    excluded_exceptions: Tuple[Type[BaseException], ...] = (),
+                    is_failure: Optional[Callable[[BaseException], bool]] = None):
+    """Decorator to stop calling an endpoint while it keeps failing.
+    
+    All functions decorated with the same ``name`` share one breaker, so a
+    failing endpoint is detected once for every tool that talks to it.
+    
+    Args:
+        name: Endpoint name used to share breaker state
+        failure_threshold: Failure rate (0-1) over the window that opens the circuit
+        minimum_calls: Calls required in the window before the rate is evaluated
+        window_size: Number of recent calls the failure rate is computed over
+        recovery_timeout: Seconds to stay open before allowing a trial call
+        fallback: Called with the original arguments instead of raising
+            CircuitOpenError while the circuit is open
+        expected_exceptions: Exceptions counted as endpoint failures
+        excluded_exceptions: Exceptions raised without counting as failures,
+            e.g. client-side refusals that say nothing about endpoint health
+        is_failure: Optional classifier for expected exceptions; those it
+            rejects (e.g. a 404 for a mistyped repository) are raised without
+            counting as failures. ``RetryPolicy.is_retryable`` counts only
+            transient errors.
+    """
+    breaker = get_circuit_breaker(
+        name,
+        failure_threshold=failure_threshold,
+        minimum_calls=minimum_calls,
+        window_size=window_size,
+        recovery_timeout=recovery_timeout
+    )
+    
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not breaker.allow_request():
+                logger.debug(f"Circuit '{name}' open, skipping {func.__name__}")
+                if fallback is not None:
+                    return fallback(*args, **kwargs)
+                raise CircuitOpenError(f"Circuit '{name}' is open, not calling {func.__name__}")
+            
+            recorded = False
+            try:
+                result = func(*args, **kwargs)
+            except excluded_exceptions:
+                raise
+            except expected_exceptions as e:
+                if is_failure is None or is_failure(e):
+                    breaker.record_failure()
+                    recorded = True
+                raise
+            else:
+                breaker.record_success()
+                recorded = True
+                return result
+            finally:
+                if not recorded:
+                    breaker.record_ignored()
+        
+        wrapper.circuit_breaker = breaker
+        return wrapper
+    return decorator
@@ -0,0 +1,160 @@
+"""Local git-clone backend for analyzing large commit histories.
+
+Repositories are mirrored into a local cache with a blobless partial clone
+(``--filter=blob:none``), so only commits and trees are transferred. Later
+runs update the mirror with an incremental ``git fetch``. History is read by
+streaming ``git log`` output, which keeps memory flat even for repositories
+with hundreds of thousands of commits.
+"""
+
+import hashlib
+import os
+import re
+import subprocess
+from typing import Dict, Iterator, List, Optional
+import logging
+from src.config.tools import GIT_CACHE_DIR, GIT_COMMAND_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Unit and record separators never occur in commit metadata
+_FIELD_SEP = "\x1f"
+_RECORD_SEP = "\x1e"
+_LOG_FORMAT = f"%H{_FIELD_SEP}%an{_FIELD_SEP}%aI{_FIELD_SEP}%B{_RECORD_SEP}"
+
+
+def _clone_url(repo_url: str) -> str:
+    """URL to clone from; local paths become file:// URLs so filters apply."""
+    if os.path.isdir(repo_url):
+        return "file://" + os.path.abspath(repo_url)
+    return repo_url
+
+
+def _mirror_path(repo_url: str, cache_dir: str) -> str:
+    """Cache directory for a repository, readable but unique per URL."""
+    name = re.sub(r'[^A-Za-z0-9_.-]+', '_', "_".join(repo_url.rstrip('/').split('/')[-2:]))
+    digest = hashlib.sha256(repo_url.encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{name}-{digest}.git")
+
+
+def _run_git(args: List[str]):
+    """Run a git command, raising RuntimeError with its stderr on failure."""
+    result = subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        timeout=GIT_COMMAND_TIMEOUT
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+
+
+def sync_repository(repo_url: str, cache_dir: str = GIT_CACHE_DIR) -> str:
+    """Clone a repository into the cache, or fetch new commits if already cloned.
+
+    Args:
+        repo_url: Remote URL or local repository path
+        cache_dir: Directory holding the bare partial clones
+
+    Returns:
+        str: Path of the bare mirror
+    """
+    path = _mirror_path(repo_url, cache_dir)
+
+    if os.path.isdir(path):
+        logger.info(f"Fetching new commits for {repo_url}")
+        _run_git(["-C", path, "fetch", "--quiet", "--prune", "origin", "+refs/heads/*:refs/heads/*"])
+    else:
+        logger.info(f"Cloning {repo_url} (blobless) into {path}")
+        os.makedirs(cache_dir, exist_ok=True)
+        _run_git(["clone", "--quiet", "--bare", "--filter=blob:none", _clone_url(repo_url), path])
+
+    return path
+
+
+def iter_git_log(repo_path: str, max_commits: Optional[int] = None, since: Optional[str] = None,
+                 until: Optional[str] = None, ref: str = "HEAD") -> Iterator[Dict[str, str]]:
+    """Stream commits from ``git log``, newest first.
+
+    Args:
+        repo_path: Path of a (bare) git repository
+        max_commits: Maximum number of commits to yield
+        since: Only commits after this date
+        until: Only commits before this date
+        ref: Revision to walk from
+
+    Yields:
+        Dict with sha, message, author and date of each commit
+    """
+    args = ["git", "-C", repo_path, "log", f"--format={_LOG_FORMAT}"]
+    if max_commits:
+        args.append(f"--max-count={max_commits}")
+    if since:
+        args.append(f"--since={since}")
+    if until:
+        args.append(f"--until={until}")
+    args.append(ref)
+
+    process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, encoding="utf-8", errors="replace")
+    try:
+        buffer = ""
+        while True:
+            chunk = process.stdout.read(65536)
+            if not chunk:
+                break
+            buffer += chunk
+            *records, buffer = buffer.split(_RECORD_SEP)
+            for record in records:
+                commit = _parse_record(record)
+                if commit:
+                    yield commit
+
+        commit = _parse_record(buffer)
+        if commit:
+            yield commit
+
+        if process.wait() != 0:
+            raise RuntimeError(f"git log failed: {process.stderr.read().strip()}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+
+def _parse_record(record: str) -> Optional[Dict[str, str]]:
+    """Parse one ``git log`` record produced with _LOG_FORMAT."""
+    record = record.lstrip("\n")
+    if not record:
+        return None
+    fields = record.split(_FIELD_SEP, 3)
+    if len(fields) != 4:
+        logger.warning(f"Skipping malformed git log record: {record[:80]!r}")
+        return None
+    sha, author, date, message = fields
+    return {
+        'sha': sha,
+        'message': message.rstrip("\n"),
+        'author': author,
+        'date': date
+    }
+
+
+def iter_git_commits(repo_url: str, max_commits: Optional[int] = None, since: Optional[str] = None,
+                     until: Optional[str] = None, cache_dir: str = GIT_CACHE_DIR) -> Iterator[Dict[str, str]]:
+    """Sync the local mirror of a repository and stream its history.
+
+    Args:
+        repo_url: Remote URL or local repository path
+        max_commits: Maximum number of commits to yield
+        since: Only commits after this date
+        until: Only commits before this date
+        cache_dir: Directory holding the bare partial clones
+
+    Yields:
+        Dict with sha, message, author and date of each commit
+    """
+    path = sync_repository(repo_url, cache_dir)
+    yield from iter_git_log(path, max_commits=max_commits, since=since, until=until)
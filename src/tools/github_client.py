@@ -0,0 +1,302 @@
+"""Pooled HTTP client shared by all GitHub tools.
+
+Every GitHub call goes through one long-lived client so connections are
+kept alive and reused across requests and threads. When ``httpx`` and
+``h2`` are installed the client speaks HTTP/2; otherwise it falls back to a
+pooled ``requests.Session``. API responses are revalidated with ETags
+against an on-disk cache so unchanged data costs no rate-limit quota.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+import logging
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from src.config.env import GITHUB_TOKEN, GITHUB_TOKENS
+from src.config.tools import (
+    GITHUB_API_URL,
+    GITHUB_POOL_SIZE,
+    GITHUB_HTTP2,
+    GITHUB_REQUEST_TIMEOUT,
+    GITHUB_HTTP_CACHE_DIR,
+    GITHUB_HTTP_CACHE_ENABLED,
+    GITHUB_RATE_LIMIT_ENABLED
+)
+from src.tools.github_ratelimit import PRIORITY_HIGH, RateLimitScheduler
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    _http2_available = True
+except ImportError:
+    httpx = None
+    _http2_available = False
+
+# Exceptions that mean the request never got a response and may be retried
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, OSError) + (
+    (httpx.TransportError,) if httpx is not None else ()
+)
+
+
+class GitHubResponse:
+    """Transport-independent view of a GitHub response."""
+
+    __slots__ = ("status_code", "data", "headers", "links", "url", "from_cache")
+
+    def __init__(self, status_code: int, data: Any, headers: CaseInsensitiveDict,
+                 links: Dict[str, Any], url: str, from_cache: bool = False):
+        self.status_code = status_code
+        self.data = data
+        self.headers = headers
+        self.links = links
+        self.url = url
+        self.from_cache = from_cache
+
+
+class ConditionalCache:
+    """On-disk store of validators and bodies for conditional GitHub requests.
+    
+    GitHub answers a request carrying a matching ``If-None-Match`` with
+    ``304 Not Modified``, which does not count against the rate limit. Each
+    entry holds the ETag/Last-Modified validators together with the decoded
+    body and pagination links so a 304 can be served from disk.
+    """
+    
+    # Response headers that are part of the cached representation
+    STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+    
+    def __init__(self, cache_dir: str = GITHUB_HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    @staticmethod
+    def key_for(url: str, params: Optional[Dict[str, Any]], scope: str) -> str:
+        """Cache key for a request; ``scope`` identifies the credentials in use."""
+        raw = json.dumps([url, sorted((params or {}).items()), scope], default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load a stored entry, or None when missing or unreadable."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def store(self, key: str, response: "GitHubResponse"):
+        """Store a response that carries validators, replacing the file atomically."""
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+        
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": headers,
+            "links": response.links,
+            "data": response.data
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Could not write GitHub cache entry: {e}")
+    
+    @staticmethod
+    def validators(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Conditional request headers for a stored entry."""
+        headers = {}
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return headers
+
+
+class GitHubClient:
+    """Keep-alive HTTP client for github.com and the GitHub REST API."""
+
+    def __init__(self, token: Optional[str] = GITHUB_TOKEN, timeout: float = GITHUB_REQUEST_TIMEOUT,
+                 pool_size: int = GITHUB_POOL_SIZE, http2: bool = GITHUB_HTTP2,
+                 cache: Optional[ConditionalCache] = None,
+                 scheduler: Optional[RateLimitScheduler] = None):
+        self.token = token
+        self.timeout = timeout
+        self.http2 = http2 and _http2_available
+        self.cache = cache
+        self.scheduler = scheduler
+        
+        # Tokens rotated by the scheduler see the same data, so they share cache entries
+        tokens = scheduler.tokens if scheduler is not None else [token]
+        self._cache_scope = ",".join(sorted(RateLimitScheduler.token_id(t) for t in tokens))
+
+        if self.http2:
+            # requests follows redirects (e.g. GitHub's 301 for a renamed
+            # repository) by default, httpx does not
+            self._client = httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            )
+        else:
+            self._client = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
+
+        logger.debug(f"GitHub client using {'HTTP/2 (httpx)' if self.http2 else 'HTTP/1.1 (requests)'}")
+
+    def _acquire_token(self, resource: str, priority: str) -> Optional[str]:
+        if self.scheduler is None:
+            return self.token
+        return self.scheduler.acquire(resource, priority)
+    
+    def _record_budget(self, token: Optional[str], response: Any):
+        if self.scheduler is not None:
+            self.scheduler.update(token, response.headers)
+    
+    def _headers(self, url: str, extra: Optional[Dict[str, str]], token: Optional[str]) -> Dict[str, str]:
+        headers = {}
+        if url.startswith(GITHUB_API_URL):
+            headers["Accept"] = "application/vnd.github+json"
+            if token:
+                headers["Authorization"] = f"Bearer {token}"
+        if extra:
+            headers.update(extra)
+        return headers
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, priority: str = PRIORITY_HIGH) -> GitHubResponse:
+        """Send a GET request, raising the transport's HTTP error on 4xx/5xx.
+
+        Args:
+            url: Absolute URL, or a path relative to the GitHub API root
+            params: Query parameters
+            headers: Extra request headers
+            priority: Scheduling priority of an API call when budget runs low
+
+        Returns:
+            GitHubResponse with JSON-decoded data for JSON responses and
+            text otherwise
+        """
+        if not url.startswith("http"):
+            url = f"{GITHUB_API_URL}/{url.lstrip('/')}"
+        
+        is_api = url.startswith(GITHUB_API_URL)
+        token = self._acquire_token("core", priority) if is_api else None
+        request_headers = self._headers(url, headers, token)
+        cache_key = entry = None
+        if self.cache is not None and is_api:
+            cache_key = self.cache.key_for(url, params, self._cache_scope)
+            entry = self.cache.load(cache_key)
+            if entry:
+                request_headers.update(self.cache.validators(entry))
+
+        response = self._client.get(url, params=params, headers=request_headers, timeout=self.timeout)
+        if is_api:
+            self._record_budget(token, response)
+        
+        # httpx's raise_for_status() rejects 304, so the cache hit comes first
+        if response.status_code == 304 and entry:
+            # Keep fresh rate-limit headers, serve the body from the store
+            cached_headers = CaseInsensitiveDict(entry["headers"])
+            cached_headers.update(response.headers)
+            return GitHubResponse(
+                status_code=entry["status_code"],
+                data=entry["data"],
+                headers=cached_headers,
+                links=entry["links"],
+                url=url,
+                from_cache=True
+            )
+        if response.status_code >= 400:
+            response.raise_for_status()
+
+        is_json = "json" in response.headers.get("Content-Type", "")
+        links = _links_of(response)
+        result = GitHubResponse(
+            status_code=response.status_code,
+            data=response.json() if is_json and response.content else response.text,
+            headers=CaseInsensitiveDict(response.headers),
+            links=links,
+            url=url
+        )
+        if cache_key is not None and is_json:
+            self.cache.store(cache_key, result)
+        return result
+
+    def post_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None,
+                     priority: str = PRIORITY_HIGH) -> GitHubResponse:
+        """Run a GraphQL query against the GitHub API.
+        
+        Args:
+            query: GraphQL query document
+            variables: Query variables
+            priority: Scheduling priority when budget runs low
+            
+        Returns:
+            GitHubResponse whose data is the ``data`` object of the reply
+            
+        Raises:
+            ValueError: If the reply contains GraphQL errors
+        """
+        url = f"{GITHUB_API_URL}/graphql"
+        token = self._acquire_token("graphql", priority)
+        response = self._client.post(url, json={"query": query, "variables": variables or {}},
+                                     headers=self._headers(url, None, token), timeout=self.timeout)
+        self._record_budget(token, response)
+        response.raise_for_status()
+        
+        payload = response.json()
+        if payload.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in payload["errors"])
+            raise ValueError(f"GitHub GraphQL error: {messages}")
+        
+        return GitHubResponse(
+            status_code=response.status_code,
+            data=payload.get("data") or {},
+            headers=CaseInsensitiveDict(response.headers),
+            links={},
+            url=url
+        )
+    
+    def close(self):
+        """Close pooled connections."""
+        self._client.close()
+
+
+def _links_of(response: Any) -> Dict[str, Any]:
+    """Parsed ``Link`` header in the ``requests`` format for either transport."""
+    links = response.links
+    # httpx keys links by rel but stores the URL under "url" as requests does
+    return {rel: {"url": str(link.get("url"))} for rel, link in links.items()} if links else {}
+
+
+_client: Optional[GitHubClient] = None
+_client_lock = threading.Lock()
+
+
+def get_github_client() -> GitHubClient:
+    """Get the process-wide GitHub client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                tokens = GITHUB_TOKENS or ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
+                cache = ConditionalCache() if GITHUB_HTTP_CACHE_ENABLED else None
+                scheduler = RateLimitScheduler(tokens) if GITHUB_RATE_LIMIT_ENABLED else None
+                _client = GitHubClient(token=tokens[0] if tokens else None, cache=cache, scheduler=scheduler)
+    return _client
@@ -0,0 +1,180 @@
+"""Rate-limit-aware token scheduling for GitHub API calls.
+
+GitHub reports the remaining request budget of a token in the
+``X-RateLimit-*`` response headers. The scheduler records those budgets in a
+small SQLite database so every process sharing the tokens sees the same
+numbers, hands out the token with the most budget left, and holds back or
+rejects low-priority calls once the budget runs low.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Dict, List, Mapping, Optional
+import logging
+from src.config.tools import (
+    GITHUB_RATE_LIMIT_STORE,
+    GITHUB_RATE_LIMIT_RESERVE,
+    GITHUB_RATE_LIMIT_MAX_WAIT
+)
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+
+# Budgets assumed before GitHub has reported one for a token
+DEFAULT_AUTHENTICATED_LIMIT = 5000
+DEFAULT_ANONYMOUS_LIMIT = 60
+
+
+class RateLimitExhausted(Exception):
+    """Raised when no token has budget left for a call."""
+
+
+class RateLimitScheduler:
+    """Hand out GitHub tokens according to their shared remaining budget."""
+
+    def __init__(self, tokens: List[str], store_path: str = GITHUB_RATE_LIMIT_STORE,
+                 reserve: int = GITHUB_RATE_LIMIT_RESERVE, max_wait: float = GITHUB_RATE_LIMIT_MAX_WAIT):
+        """Initialize the scheduler.
+
+        Args:
+            tokens: Tokens to rotate across; empty for anonymous access
+            store_path: SQLite file shared by all processes using these tokens
+            reserve: Budget kept for high-priority calls, capped at a tenth
+                of each token's quota so small (anonymous) quotas stay usable
+            max_wait: Longest time a call may wait for a budget reset
+        """
+        # Anonymous access is tracked like a token with a smaller limit
+        self.tokens: List[Optional[str]] = list(dict.fromkeys(tokens)) or [None]
+        self.store_path = store_path
+        self.reserve = reserve
+        self.max_wait = max_wait
+        self._init_store()
+
+    @staticmethod
+    def token_id(token: Optional[str]) -> str:
+        """Stable identifier for a token that does not reveal it."""
+        if not token:
+            return "anonymous"
+        return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.store_path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def _init_store(self):
+        directory = os.path.dirname(self.store_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS budgets ("
+                " token_id TEXT NOT NULL,"
+                " resource TEXT NOT NULL,"
+                " remaining INTEGER NOT NULL,"
+                " quota INTEGER NOT NULL,"
+                " reset_at REAL NOT NULL,"
+                " PRIMARY KEY (token_id, resource))"
+            )
+
+    def _budgets(self, connection: sqlite3.Connection, resource: str) -> Dict[str, tuple]:
+        rows = connection.execute(
+            "SELECT token_id, remaining, quota, reset_at FROM budgets WHERE resource = ?", (resource,)
+        ).fetchall()
+        return {row[0]: row[1:] for row in rows}
+
+    def _floor(self, priority: str, quota: int) -> int:
+        """Requests a token must keep back for a call of this priority."""
+        return 0 if priority == PRIORITY_HIGH else min(self.reserve, quota // 10)
+
+    def acquire(self, resource: str = "core", priority: str = PRIORITY_HIGH) -> Optional[str]:
+        """Reserve one request from the token with the most budget left.
+
+        High-priority calls may use the whole budget. Low-priority calls
+        only run while more than ``reserve`` requests remain, or a tenth of
+        the token's quota if that is smaller. When no token
+        qualifies, the call waits for the earliest reset if that is within
+        ``max_wait`` and raises RateLimitExhausted otherwise.
+
+        Args:
+            resource: GitHub rate-limit resource ("core", "graphql", ...)
+            priority: PRIORITY_HIGH or PRIORITY_LOW
+
+        Returns:
+            The token to authenticate with (None for anonymous access)
+        """
+        while True:
+            with closing(self._connect()) as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    now = time.time()
+                    budgets = self._budgets(connection, resource)
+                    current = {}
+                    for token in self.tokens:
+                        default_limit = DEFAULT_AUTHENTICATED_LIMIT if token else DEFAULT_ANONYMOUS_LIMIT
+                        remaining, quota, reset_at = budgets.get(
+                            self.token_id(token), (default_limit, default_limit, 0.0)
+                        )
+                        if reset_at <= now:
+                            # Window has rolled over (or was never reported)
+                            remaining, reset_at = quota, 0.0
+                        current[token] = (remaining, quota, reset_at)
+
+                    usable = [t for t in self.tokens if current[t][0] > self._floor(priority, current[t][1])]
+                    if usable:
+                        best_token = max(usable, key=lambda t: current[t][0])
+                        remaining, quota, reset_at = current[best_token]
+                        connection.execute(
+                            "INSERT OR REPLACE INTO budgets VALUES (?, ?, ?, ?, ?)",
+                            (self.token_id(best_token), resource, remaining - 1, quota, reset_at)
+                        )
+                        connection.execute("COMMIT")
+                        return best_token
+
+                    resets = [state[2] for state in current.values() if state[2] > now]
+                    earliest_reset = min(resets) if resets else None
+                    connection.execute("COMMIT")
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+
+            wait = (earliest_reset - time.time()) if earliest_reset else None
+            if wait is None or wait > self.max_wait:
+                raise RateLimitExhausted(
+                    f"GitHub {resource} budget exhausted for {priority}-priority calls"
+                    + (f", resets in {wait:.0f}s" if wait is not None else "")
+                )
+            logger.warning(f"GitHub {resource} budget low, waiting {wait:.1f}s for reset")
+            time.sleep(max(wait, 0) + 0.5)
+
+    def update(self, token: Optional[str], headers: Mapping[str, str]):
+        """Record the budget GitHub reported in a response's rate-limit headers."""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            quota = int(headers["X-RateLimit-Limit"])
+            reset_at = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO budgets VALUES (?, ?, ?, ?, ?)",
+                (self.token_id(token), resource, remaining, quota, reset_at)
+            )
+
+    def status(self) -> List[Dict[str, object]]:
+        """Current recorded budgets, for diagnostics."""
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT token_id, resource, remaining, quota, reset_at FROM budgets ORDER BY token_id, resource"
+            ).fetchall()
+        return [
+            {"token_id": row[0], "resource": row[1], "remaining": row[2], "limit": row[3], "reset_at": row[4]}
+            for row in rows
+        ]
@@ -1,32 +1,239 @@
 """GitHub-related tools for repository analysis."""
 
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Any
+import math
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from urllib.parse import parse_qs, urlparse
 import logging
-from src.config.env import GITHUB_TOKEN
-from src.config.tools import GITHUB_MAX_COMMITS
+from src.config.tools import (
+    GITHUB_BACKEND,
+    GITHUB_MAX_COMMITS,
+    GITHUB_COMMITS_PER_PAGE,
+    COMMIT_STORE_ENABLED,
+    GITHUB_FETCH_CONCURRENCY,
+    GITHUB_RESULT_CACHE_TTL,
+    GITHUB_RETRY_MAX_ATTEMPTS,
+    GITHUB_RETRY_BASE_DELAY,
+    GITHUB_RETRY_MAX_DELAY,
+    GITHUB_RETRY_DEADLINE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MINIMUM_CALLS,
+    CIRCUIT_WINDOW_SIZE,
+    CIRCUIT_RECOVERY_TIMEOUT,
+    TRENDING_BACKGROUND_REFRESH
+)
+from src.tools.decorators import RetryPolicy, cache_result, circuit_breaker, instrument
+from src.tools.commit_store import CommitStore
+from src.tools.commit_table import CommitTable, parse_timestamp
+from src.tools.git_backend import iter_git_commits
+from src.tools.github_client import TRANSIENT_ERRORS, get_github_client
+from src.tools.github_ratelimit import PRIORITY_HIGH, PRIORITY_LOW, RateLimitExhausted
+from src.tools.trending import TrendingIndex, parse_trending_page, trending_url
 
 logger = logging.getLogger(__name__)
 
+# Retries wrap the breaker, so an open circuit is never retried
+_RETRY_POLICY = RetryPolicy(
+    max_attempts=GITHUB_RETRY_MAX_ATTEMPTS,
+    base_delay=GITHUB_RETRY_BASE_DELAY,
+    max_delay=GITHUB_RETRY_MAX_DELAY,
+    deadline=GITHUB_RETRY_DEADLINE,
+    retry_on=TRANSIENT_ERRORS
+)
 
-def find_trending_repo() -> str:
+# Shared breaker settings; every call to the same host shares one circuit
+_CIRCUIT_SETTINGS = {
+    "failure_threshold": CIRCUIT_FAILURE_THRESHOLD,
+    "minimum_calls": CIRCUIT_MINIMUM_CALLS,
+    "window_size": CIRCUIT_WINDOW_SIZE,
+    "recovery_timeout": CIRCUIT_RECOVERY_TIMEOUT,
+    # Running out of quota is a local decision, not a sign the endpoint is down
+    "excluded_exceptions": (RateLimitExhausted,),
+    # Only transient errors count; a 404 for a mistyped repository does not
+    "is_failure": _RETRY_POLICY.is_retryable
+}
+
+
+@instrument(endpoint="github.com")
+@_RETRY_POLICY
+@circuit_breaker("github.com", **_CIRCUIT_SETTINGS)
+def _fetch_trending_page(language: str, since: str) -> List[Dict[str, Any]]:
+    """Fetch and parse the ranked repositories of one trending page."""
+    response = get_github_client().get(trending_url(language, since))
+    return parse_trending_page(response.data)
+
+
+_trending_index: Optional[TrendingIndex] = None
+_trending_index_lock = threading.Lock()
+
+
+def get_trending_index() -> TrendingIndex:
+    """Get the shared trending index, starting its refresh thread on first use."""
+    global _trending_index
+    with _trending_index_lock:
+        if _trending_index is None:
+            _trending_index = TrendingIndex(_fetch_trending_page)
+            if TRENDING_BACKGROUND_REFRESH:
+                _trending_index.start()
+        return _trending_index
+
+
+@cache_result(ttl=GITHUB_RESULT_CACHE_TTL)
+@instrument(endpoint="api.github.com")
+@_RETRY_POLICY
+@circuit_breaker("api.github.com", **_CIRCUIT_SETTINGS)
+def _fetch_repo_json(user_repo: str) -> Dict[str, Any]:
+    """Fetch the raw repository object from the GitHub API."""
+    return get_github_client().get(f"repos/{user_repo}").data
+
+
+@instrument(endpoint="api.github.com")
+@_RETRY_POLICY
+@circuit_breaker("api.github.com", **_CIRCUIT_SETTINGS)
+def _fetch_commits_page(user_repo: str, params: Dict[str, Any],
+                        priority: str = PRIORITY_HIGH) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Fetch one page of commits and the pagination links that came with it."""
+    response = get_github_client().get(f"repos/{user_repo}/commits", params=params, priority=priority)
+    return response.data, response.links
+
+
+def _last_page(links: Dict[str, Any]) -> int:
+    """Read the last page number from a parsed ``Link`` header."""
+    last_url = links.get('last', {}).get('url')
+    if not last_url:
+        return 1
+    pages = parse_qs(urlparse(last_url).query).get('page')
+    return int(pages[0]) if pages else 1
+
+
+def _parse_commit(item: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """Extract the fields used for analysis from a commit API object."""
+    try:
+        author_date = item['commit']['author']['date']
+        return {
+            'sha': item['sha'],
+            'message': item['commit']['message'],
+            'author': item['commit']['author']['name'],
+            'date': author_date,
+            # The since= filter applies to this date, not the author date
+            'committed_date': (item['commit'].get('committer') or {}).get('date') or author_date
+        }
+    except KeyError as e:
+        logger.warning(f"Missing key in commit data: {e}")
+        return None
+
+
+def iter_commits(repo_url: str, max_commits: Optional[int] = None, since: Optional[str] = None,
+                 until: Optional[str] = None) -> Iterator[Dict[str, str]]:
+    """Stream parsed commits of a repository, newest first.
+    
+    The first page is fetched on its own to learn the page count from the
+    ``Link`` header. Remaining pages are fetched in parallel, with at most
+    GITHUB_FETCH_CONCURRENCY requests in flight, and yielded in order as
+    soon as each page arrives. Pages after the first are low-priority, so
+    pagination stops early instead of draining a nearly exhausted quota.
+    
+    Args:
+        repo_url: GitHub repository URL
+        max_commits: Maximum number of commits to yield (None for no limit)
+        since: Only commits after this ISO 8601 timestamp
+        until: Only commits before this ISO 8601 timestamp
+        
+    Yields:
+        Dict with sha, message, author and date of each commit
+    """
+    user_repo = "/".join(repo_url.rstrip('/').split('/')[-2:])
+    per_page = min(GITHUB_COMMITS_PER_PAGE, max_commits) if max_commits else GITHUB_COMMITS_PER_PAGE
+    params: Dict[str, Any] = {'per_page': per_page}
+    if since:
+        params['since'] = since
+    if until:
+        params['until'] = until
+    
+    remaining = max_commits if max_commits else float('inf')
+    
+    data, links = _fetch_commits_page(user_repo, {**params, 'page': 1})
+    for item in data:
+        if remaining <= 0:
+            return
+        commit = _parse_commit(item)
+        if commit:
+            remaining -= 1
+            yield commit
+    
+    last_page = _last_page(links)
+    if max_commits:
+        last_page = min(last_page, math.ceil(max_commits / per_page))
+    if remaining <= 0 or last_page <= 1:
+        return
+    
+    with ThreadPoolExecutor(max_workers=GITHUB_FETCH_CONCURRENCY) as executor:
+        pending = deque()
+        next_page = 2
+        try:
+            while pending or next_page <= last_page:
+                while next_page <= last_page and len(pending) < GITHUB_FETCH_CONCURRENCY:
+                    # Deeper history is optional and yields first when quota runs low
+                    pending.append(executor.submit(
+                        _fetch_commits_page, user_repo, {**params, 'page': next_page}, PRIORITY_LOW
+                    ))
+                    next_page += 1
+                
+                try:
+                    data, _ = pending.popleft().result()
+                except Exception as e:
+                    logger.warning(f"Stopping commit pagination for {user_repo}: {e}")
+                    return
+                
+                for item in data:
+                    if remaining <= 0:
+                        return
+                    commit = _parse_commit(item)
+                    if commit:
+                        remaining -= 1
+                        yield commit
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def find_trending_repos(k: int = 10, language: str = "python", since: str = "daily") -> List[Dict[str, Any]]:
+    """Find the top trending repositories on GitHub.
+    
+    Args:
+        k: Number of repositories to return
+        language: Trending language ("" for all languages)
+        since: Time window ("daily", "weekly" or "monthly")
+        
+    Returns:
+        List of dicts with rank, full_name, url, description, language,
+        stars and period_stars; empty if the trending page is unavailable
+    """
+    try:
+        return get_trending_index().top(k, language=language, since=since)
+    except Exception as e:
+        logger.error(f"Error finding trending repos: {e}")
+        return []
+
+
+def find_trending_repo(language: str = "python", since: str = "daily") -> str:
     """Find a trending Python repository on GitHub.
     
+    Args:
+        language: Trending language ("" for all languages)
+        since: Time window ("daily", "weekly" or "monthly")
+        
     Returns:
         str: URL of a trending repository
     """
     try:
-        url = "https://github.com/trending/python"
-        response = requests.get(url)
-        response.raise_for_status()
+        repos = get_trending_index().top(1, language=language, since=since)
         
-        soup = BeautifulSoup(response.text, 'html.parser')
-        repo_element = soup.select_one('article h2 a')
-        
-        if repo_element:
-            repo_path = repo_element['href'].strip()
-            return f"https://github.com{repo_path}"
+        if repos:
+            return repos[0]['url']
         else:
             # Fallback to a known popular repository
             return "https://github.com/python/cpython"
@@ -47,17 +254,8 @@ def get_repo_metadata(repo_url: str) -> Dict[str, Any]:
         Dict containing repository metadata
     """
     try:
-        headers = {}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
-            
         user_repo = "/".join(repo_url.split('/')[-2:])
-        api_url = f"https://api.github.com/repos/{user_repo}"
-        
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = _fetch_repo_json(user_repo)
         
         return {
             'name': data.get('name', ''),
@@ -81,58 +279,199 @@ def get_repo_metadata(repo_url: str) -> Dict[str, Any]:
         }
 
 
-def scrape_github_activity(repo_url: str) -> Dict[str, Any]:
-    """Scrape GitHub repository activity data.
-    
-    Args:
-        repo_url: GitHub repository URL
+def _collect_repo_data(repo_url: str, commit_iter: Iterator[Dict[str, str]],
+                       fetch_metadata: bool = True) -> Dict[str, Any]:
+    """Build repo_data from a commit stream, fetching metadata alongside it."""
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        metadata_future = executor.submit(get_repo_metadata, repo_url) if fetch_metadata else None
         
-    Returns:
-        Dict containing repository activity data
-    """
-    try:
-        headers = {}
-        if GITHUB_TOKEN:
-            headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+        commits = CommitTable.from_commits(commit_iter)
+        
+        if metadata_future is not None:
+            metadata = metadata_future.result()
+        else:
+            metadata = {'name': os.path.basename(repo_url.rstrip('/')), 'url': repo_url}
+    
+    return {
+        'repo_url': repo_url,
+        'commits': commits,
+        'metadata': metadata
+    }
+
+
+def _incremental_commits(repo_url: str, max_commits: int) -> Iterator[Dict[str, str]]:
+    """Fetch only commits after the stored high-water mark and merge them in."""
+    store = CommitStore()
+    state = store.load(repo_url)
+    mark = state.get('high_water')
+    
+    if mark and len(state.get('commits', [])) >= max_commits:
+        # GitHub's since filter is inclusive and compares committer dates, as
+        # the mark does, so the mark itself comes back when nothing was missed
+        new_commits = list(iter_commits(repo_url, max_commits=max_commits, since=mark['date']))
+        reaches_mark = len(new_commits) < max_commits or any(c['sha'] == mark['sha'] for c in new_commits)
+        logger.info(f"Fetched {len(new_commits)} commits since {mark['date']} for {repo_url}")
+        merged = store.merge(repo_url, new_commits, replace=not reaches_mark)
+    else:
+        merged = store.merge(repo_url, list(iter_commits(repo_url, max_commits=max_commits)), replace=True)
+    
+    return iter(merged[:max_commits])
+
+
+def _scrape_rest(repo_url: str, max_commits: Optional[int], since: Optional[str],
+                 until: Optional[str]) -> Dict[str, Any]:
+    """Build repo_data from the REST API, fetching metadata alongside commits."""
+    if COMMIT_STORE_ENABLED and max_commits and not (since or until):
+        commit_iter = _incremental_commits(repo_url, max_commits)
+    else:
+        commit_iter = iter_commits(repo_url, max_commits=max_commits, since=since, until=until)
+    return _collect_repo_data(repo_url, commit_iter)
+
+
+def _scrape_git(repo_url: str, max_commits: Optional[int], since: Optional[str],
+                until: Optional[str]) -> Dict[str, Any]:
+    """Build repo_data from a local partial clone of the repository."""
+    commit_iter = iter_git_commits(repo_url, max_commits=max_commits, since=since, until=until)
+    # API metadata only exists for GitHub repositories, not local paths or other hosts
+    return _collect_repo_data(repo_url, commit_iter, fetch_metadata="github.com" in repo_url)
+
+
+_REPO_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String,
+      $since: GitTimestamp, $until: GitTimestamp) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    stargazerCount
+    forkCount
+    createdAt
+    updatedAt
+    primaryLanguage { name }
+    issues(states: OPEN) { totalCount }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $first, after: $after, since: $since, until: $until) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              message
+              additions
+              deletions
+              author { name date }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
 
-        user_repo = "/".join(repo_url.split('/')[-2:])
-        api_url = f"https://api.github.com/repos/{user_repo}/commits"
 
-        response = requests.get(api_url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
+@instrument(endpoint="api.github.com/graphql")
+@_RETRY_POLICY
+@circuit_breaker("api.github.com", **_CIRCUIT_SETTINGS)
+def _fetch_history_page(variables: Dict[str, Any]) -> Dict[str, Any]:
+    """Fetch repository metadata and one page of commit history via GraphQL."""
+    return get_github_client().post_graphql(_REPO_HISTORY_QUERY, variables).data
 
-        commits = []
-        commit_dates = []
 
-        for item in data[:GITHUB_MAX_COMMITS]:
+def _scrape_graphql(repo_url: str, max_commits: Optional[int], since: Optional[str],
+                    until: Optional[str]) -> Dict[str, Any]:
+    """Build repo_data from GraphQL, one round trip per 100 commits."""
+    owner, name = repo_url.rstrip('/').split('/')[-2:]
+    variables: Dict[str, Any] = {'owner': owner, 'name': name, 'since': since, 'until': until}
+    remaining = max_commits if max_commits else float('inf')
+    
+    commits = CommitTable(with_stats=True)
+    metadata: Dict[str, Any] = {}
+    cursor = None
+    
+    while remaining > 0:
+        page_size = int(min(GITHUB_COMMITS_PER_PAGE, remaining))
+        repository = _fetch_history_page({**variables, 'first': page_size, 'after': cursor}).get('repository')
+        if not repository:
+            raise ValueError(f"Repository not found: {owner}/{name}")
+        
+        if not metadata:
+            metadata = {
+                'name': repository.get('name', ''),
+                'full_name': repository.get('nameWithOwner', ''),
+                'description': repository.get('description', ''),
+                'language': (repository.get('primaryLanguage') or {}).get('name', ''),
+                'stars': repository.get('stargazerCount', 0),
+                'forks': repository.get('forkCount', 0),
+                'issues': (repository.get('issues') or {}).get('totalCount', 0),
+                'created_at': repository.get('createdAt', ''),
+                'updated_at': repository.get('updatedAt', ''),
+                'url': repo_url
+            }
+        
+        history = (((repository.get('defaultBranchRef') or {}).get('target') or {}).get('history')) or {}
+        for node in history.get('nodes', []):
+            author = node.get('author') or {}
             try:
-                message = item['commit']['message']
-                author = item['commit']['author']['name']
-                date = item['commit']['author']['date']
-                sha = item['sha'][:7]
-
-                commits.append(f"[{sha}] {message} — {author} @ {date}")
-                commit_dates.append(date)
-            except KeyError as e:
-                logger.warning(f"Missing key in commit data: {e}")
+                timestamp = parse_timestamp(author.get('date', ''))
+            except ValueError:
+                logger.warning(f"Skipping commit {node.get('oid', '')[:7]} without a valid date")
                 continue
+            commits.append(node['oid'], author.get('name', ''), timestamp, node['message'],
+                           node.get('additions', 0), node.get('deletions', 0))
+            remaining -= 1
+        
+        page_info = history.get('pageInfo') or {}
+        if not page_info.get('hasNextPage'):
+            break
+        cursor = page_info.get('endCursor')
+    
+    return {
+        'repo_url': repo_url,
+        'commits': commits,
+        'metadata': metadata
+    }
 
-        # Get repository metadata
-        metadata = get_repo_metadata(repo_url)
 
-        return {
-            'repo_url': repo_url,
-            'commits': commits,
-            'commit_dates': commit_dates,
-            'metadata': metadata
-        }
+def scrape_github_activity(repo_url: str, max_commits: Optional[int] = None, since: Optional[str] = None,
+                           until: Optional[str] = None, backend: Optional[str] = None) -> Dict[str, Any]:
+    """Scrape GitHub repository activity data.
+    
+    Without a time window the latest GITHUB_MAX_COMMITS commits are fetched.
+    With ``since``/``until`` every commit in the window is fetched unless
+    ``max_commits`` is also given.
+    
+    Args:
+        repo_url: GitHub repository URL
+        max_commits: Maximum number of commits to fetch
+        since: Only commits after this ISO 8601 timestamp
+        until: Only commits before this ISO 8601 timestamp
+        backend: "rest", "graphql" or "git" (defaults to GITHUB_BACKEND).
+            GraphQL needs a GITHUB_TOKEN and falls back to REST without one.
+            "git" analyzes a local blobless clone and also accepts local paths
+        
+    Returns:
+        Dict containing repository activity data; ``commits`` is a
+        CommitTable, newest first
+    """
+    try:
+        if max_commits is None and not (since or until):
+            max_commits = GITHUB_MAX_COMMITS
+        
+        backend = backend or GITHUB_BACKEND
+        if backend == "graphql":
+            if get_github_client().token:
+                return _scrape_graphql(repo_url, max_commits, since, until)
+            logger.warning("GraphQL backend requires GITHUB_TOKEN, using REST API")
+        elif backend == "git":
+            return _scrape_git(repo_url, max_commits, since, until)
+        
+        return _scrape_rest(repo_url, max_commits, since, until)
         
     except Exception as e:
         logger.error(f"Error scraping GitHub activity: {e}")
         return {
             'repo_url': repo_url,
-            'commits': [],
-            'commit_dates': [],
+            'commits': CommitTable(),
             'error': str(e)
         } 
\ No newline at end of file
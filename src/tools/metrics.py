@@ -0,0 +1,189 @@
+"""In-process latency histograms for LangManus Demo tools.
+
+Histograms use fixed, preallocated buckets so that recording a value is a
+bisect plus a few integer increments. Snapshots and exports are computed on
+demand for the CLI summary and the server's metrics endpoints.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in seconds, covering fast local calls to slow LLM/API calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram for one metric name and label set."""
+
+    __slots__ = ("name", "labels", "bounds", "counts", "total", "count", "_lock")
+
+    def __init__(self, name: str, labels: LabelKey, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.labels = labels
+        self.bounds = tuple(bounds)
+        # One slot per bound plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """Record one observation."""
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by interpolating inside the matching bucket."""
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+        if not count:
+            return 0.0
+
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def reset(self):
+        """Clear all observations, keeping the histogram registered."""
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)
+            self.total = 0.0
+            self.count = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time copy of the histogram."""
+        with self._lock:
+            counts = list(self.counts)
+            total = self.total
+            count = self.count
+        return {
+            "name": self.name,
+            "labels": dict(self.labels),
+            "buckets": list(zip(self.bounds + (float("inf"),), counts)),
+            "count": count,
+            "sum": total,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class HistogramRegistry:
+    """Registry of histograms keyed by metric name and labels."""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, labels: Optional[Dict[str, Any]] = None,
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        """Get or create the histogram for a name and label set.
+
+        Callers on a hot path should resolve their histogram once and keep
+        the reference rather than looking it up per observation.
+        """
+        label_key = tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+        key = (name, label_key)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram(name, label_key, buckets or DEFAULT_BUCKETS)
+                    self._histograms[key] = histogram
+        return histogram
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Snapshot every histogram that has recorded at least one value."""
+        with self._lock:
+            histograms = list(self._histograms.values())
+        return [h.snapshot() for h in histograms if h.count]
+
+    def export_prometheus(self) -> str:
+        """Render all histograms in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for snap in self.snapshot():
+            name = snap["name"]
+            if name not in described:
+                lines.append(f"# TYPE {name} histogram")
+                described.add(name)
+
+            labels = snap["labels"]
+            cumulative = 0
+            for bound, bucket_count in snap["buckets"]:
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{name}_bucket{_format_labels(labels, le=le)} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {snap['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {snap['count']}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def format_summary(self) -> str:
+        """Render a short latency table for terminal output."""
+        rows = []
+        for snap in sorted(self.snapshot(), key=lambda s: (s["name"], sorted(s["labels"].items()))):
+            label_text = ",".join(f"{k}={v}" for k, v in sorted(snap["labels"].items()))
+            rows.append(
+                f"{label_text or snap['name']:<50} n={snap['count']:<6} "
+                f"p50={snap['p50']:.3f}s p95={snap['p95']:.3f}s p99={snap['p99']:.3f}s"
+            )
+        return "\n".join(rows)
+
+    def reset(self):
+        """Clear every histogram's observations.
+
+        Histograms are reset in place rather than dropped, because decorated
+        functions keep the Histogram objects they were created with.
+        """
+        with self._lock:
+            histograms = list(self._histograms.values())
+        for histogram in histograms:
+            histogram.reset()
+
+
+def _format_labels(labels: Dict[str, str], **extra: str) -> str:
+    items = list(sorted(labels.items())) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+# Process-wide registry shared by the CLI and the server
+registry = HistogramRegistry()
+
+
+def get_histogram(name: str, labels: Optional[Dict[str, Any]] = None,
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+    """Get or create a histogram in the default registry."""
+    return registry.histogram(name, labels, buckets)
+
+
+def snapshot() -> List[Dict[str, Any]]:
+    """Snapshot the default registry."""
+    return registry.snapshot()
+
+
+def export_prometheus() -> str:
+    """Export the default registry in Prometheus text format."""
+    return registry.export_prometheus()
+
+
+def format_summary() -> str:
+    """Format the default registry as a terminal latency table."""
+    return registry.format_summary()
@@ -0,0 +1,502 @@
+"""Warm worker pool for running Python code.
+
+Starting a fresh interpreter for every execute_python_code call costs the
+interpreter start-up plus every import the code makes (NumPy, pandas and
+matplotlib add up to more than a second). Here a fork server imports the
+configured modules once and forks a small pool of workers from it; each
+submitted snippet runs in one of them, in a new ``__main__`` namespace, with
+its stdout and stderr captured at the file-descriptor level.
+
+A call that exceeds its timeout kills its worker. Workers are also replaced
+after a number of runs or once their peak memory passes a threshold, so
+state leaked by one snippet (monkeypatched modules, changed environment
+variables, memory held by caches) does not live forever.
+
+REPL sessions get kernels of their own: a worker per session that keeps one
+namespace across calls. Kernels idle for too long are stopped, and past a
+cap on live kernels the least recently used idle session is reclaimed.
+
+As with any multiprocessing code, scripts using the pool must guard their
+entry point with ``if __name__ == '__main__':``, since workers import the
+main module when they start.
+"""
+
+import atexit
+import builtins
+import multiprocessing
+# Registers multiprocessing's exit handler (which joins child processes)
+# now, so the shutdown handlers registered below run before it
+import multiprocessing.util
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import logging
+from src.config.tools import (
+    PYTHON_POOL_SIZE,
+    PYTHON_POOL_PRELOAD,
+    PYTHON_POOL_MAX_RUNS,
+    PYTHON_POOL_MAX_MEMORY_MB,
+    REPL_MAX_KERNELS,
+    REPL_IDLE_TIMEOUT
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def _peak_memory_mb() -> float:
+    """Peak resident set size of the current process in MB."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _exit_code(code: Any) -> int:
+    """Process exit status for a SystemExit code, as the interpreter computes it."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _main_namespace() -> Dict[str, Any]:
+    return {'__name__': '__main__', '__builtins__': builtins}
+
+
+def _run_isolated(code: str, cwd: str, namespace: Optional[Dict[str, Any]] = None,
+                  filename: str = "<string>") -> Dict[str, Any]:
+    """Run ``code`` as a ``__main__`` script, capturing fds 1 and 2.
+
+    A new namespace is used unless one is given; REPL kernels pass the same
+    namespace to every call.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved = os.dup(1), os.dup(2)
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        os.dup2(out.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+        return_code = 0
+        try:
+            os.chdir(cwd)
+            if namespace is None:
+                namespace = _main_namespace()
+            exec(compile(code, filename, "exec"), namespace)
+        except SystemExit as e:
+            return_code = _exit_code(e.code)
+        except BaseException:
+            etype, value, tb = sys.exc_info()
+            # Drop this function's frame so the traceback starts at the snippet
+            traceback.print_exception(etype, value, tb.tb_next)
+            return_code = 1
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            os.close(saved[0])
+            os.close(saved[1])
+            pyplot = sys.modules.get("matplotlib.pyplot")
+            if pyplot is not None:
+                pyplot.close("all")
+        out.seek(0)
+        err.seek(0)
+        return {
+            "stdout": out.read().decode("utf-8", "replace"),
+            "stderr": err.read().decode("utf-8", "replace"),
+            "return_code": return_code,
+            "peak_memory_mb": _peak_memory_mb()
+        }
+
+
+def _worker_main(conn, persistent: bool = False):
+    """Worker loop: run each received request until told to stop.
+
+    A persistent worker (a REPL kernel) keeps one namespace across requests.
+    """
+    namespace = _main_namespace() if persistent else None
+    filename = "<repl>" if persistent else "<string>"
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return
+        if request is None:
+            return
+        conn.send(_run_isolated(request['code'], request['cwd'], namespace, filename))
+
+
+_context = None
+_context_lock = threading.Lock()
+
+
+def _get_context(preload: List[str]):
+    """Multiprocessing context shared by the pool and the REPL kernels.
+
+    The fork server is started once per process, so the preload list of
+    whichever caller starts it first applies to every worker.
+    """
+    global _context
+    with _context_lock:
+        if _context is None:
+            if "forkserver" in multiprocessing.get_all_start_methods():
+                _context = multiprocessing.get_context("forkserver")
+                # Workers unpickle _worker_main from this module, so the
+                # fork server imports it too; pyplot needs a headless backend
+                os.environ.setdefault("MPLBACKEND", "Agg")
+                _context.set_forkserver_preload([__name__] + list(preload))
+            else:
+                _context = multiprocessing.get_context("spawn")
+        return _context
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, persistent: bool = False):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, persistent),
+                                       name="python-repl-kernel" if persistent else "python-pool-worker")
+        self.process.start()
+        child_conn.close()
+        self.runs = 0
+        self.peak_memory_mb = 0.0
+
+    @property
+    def alive(self) -> bool:
+        """False once the worker has been stopped or killed."""
+        return not self.conn.closed
+
+    def execute(self, code: str, timeout: float) -> Dict[str, Any]:
+        """Run code in the worker, killing it on timeout or if it dies.
+
+        Returns:
+            Dict with success, stdout, stderr, return_code and executed_code
+        """
+        try:
+            self.conn.send({'code': code, 'cwd': os.getcwd()})
+            if not self.conn.poll(timeout):
+                logger.error(f"Python code execution timeout after {timeout}s")
+                self.kill()
+                return {
+                    "success": False,
+                    "stdout": "",
+                    "stderr": f"Execution timeout after {timeout} seconds",
+                    "return_code": -1,
+                    "executed_code": code
+                }
+            reply = self.conn.recv()
+        except (EOFError, OSError):
+            # The code took the worker down (os._exit, a crash in C code)
+            self.kill()
+            return_code = self.process.exitcode
+            return {
+                "success": False,
+                "stdout": "",
+                "stderr": f"Python worker exited unexpectedly with code {return_code}",
+                "return_code": return_code if return_code else -1,
+                "executed_code": code
+            }
+        self.runs += 1
+        self.peak_memory_mb = reply['peak_memory_mb']
+        return {
+            "success": reply['return_code'] == 0,
+            "stdout": reply['stdout'],
+            "stderr": reply['stderr'],
+            "return_code": reply['return_code'],
+            "executed_code": code
+        }
+
+    def stop(self):
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+    def kill(self):
+        """Kill the worker immediately."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        if not self.conn.closed:
+            self.conn.close()
+
+
+class PythonWorkerPool:
+    """Pool of pre-forked workers that execute Python snippets."""
+
+    def __init__(self, size: int = PYTHON_POOL_SIZE, preload: Optional[List[str]] = None,
+                 max_runs: int = PYTHON_POOL_MAX_RUNS, max_memory_mb: float = PYTHON_POOL_MAX_MEMORY_MB):
+        """Create a pool; workers are forked by start() or on first use.
+
+        Args:
+            size: Number of workers
+            preload: Modules imported by the fork server so every worker
+                starts with them loaded (default PYTHON_POOL_PRELOAD)
+            max_runs: Runs after which a worker is replaced
+            max_memory_mb: Peak worker memory after which it is replaced
+        """
+        self.size = size
+        self.preload = PYTHON_POOL_PRELOAD if preload is None else preload
+        self.max_runs = max_runs
+        self.max_memory_mb = max_memory_mb
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle: List[_Worker] = []
+        self._closed = False
+
+    def _spawn(self) -> _Worker:
+        return _Worker(_get_context(self.preload))
+
+    def start(self):
+        """Fork every worker now instead of on first use."""
+        with self._lock:
+            while len(self._idle) < self.size and not self._closed:
+                self._idle.append(self._spawn())
+
+    def _acquire(self) -> _Worker:
+        self._slots.acquire()
+        try:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Python worker pool is shut down")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.process.is_alive():
+                        return worker
+                    worker.kill()
+                return self._spawn()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _release(self, worker: Optional[_Worker]):
+        """Return a worker to the pool; None replaces a worker that was retired."""
+        try:
+            with self._lock:
+                if worker is None and not self._closed:
+                    try:
+                        worker = self._spawn()
+                    except Exception as e:
+                        logger.warning(f"Could not replace Python pool worker: {e}")
+                if worker is not None:
+                    if self._closed:
+                        worker.stop()
+                    else:
+                        self._idle.append(worker)
+        finally:
+            self._slots.release()
+
+    def run(self, code: str, timeout: float = 30) -> Dict[str, Any]:
+        """Execute code in a worker.
+
+        Args:
+            code: Python source, run as a ``__main__`` script in the caller's
+                working directory
+            timeout: Seconds before the worker is killed
+
+        Returns:
+            Dict with success, stdout, stderr, return_code and executed_code,
+            as execute_python_code returns
+        """
+        worker = self._acquire()
+        try:
+            return worker.execute(code, timeout)
+        finally:
+            if worker.alive and (worker.runs >= self.max_runs or worker.peak_memory_mb > self.max_memory_mb):
+                worker.stop()
+            self._release(worker if worker.alive else None)
+
+    def shutdown(self):
+        """Stop all idle workers; busy ones stop when their run completes."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+_pool: Optional[PythonWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_python_pool() -> PythonWorkerPool:
+    """Get the shared worker pool, forking its workers on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            pool = PythonWorkerPool()
+            pool.start()
+            atexit.register(pool.shutdown)
+            _pool = pool
+        return _pool
+
+
+class _Kernel:
+    """A REPL session: its worker, started on first use, and its bookkeeping."""
+
+    def __init__(self):
+        self.worker: Optional[_Worker] = None
+        self.lock = threading.Lock()  # Serializes the session's calls
+        self.users = 0  # Calls checked out, guarded by the manager's lock
+        self.last_used = time.monotonic()
+
+    def stop(self):
+        with self.lock:
+            if self.worker is not None and self.worker.alive:
+                self.worker.stop()
+            self.worker = None
+
+
+class ReplKernelManager:
+    """Session-scoped REPL kernels, each a worker process with its own namespace."""
+
+    def __init__(self, max_kernels: int = REPL_MAX_KERNELS, idle_timeout: float = REPL_IDLE_TIMEOUT,
+                 preload: Optional[List[str]] = None):
+        """Create a manager; kernels are started on a session's first call.
+
+        Args:
+            max_kernels: Live kernels kept before idle sessions are reclaimed,
+                least recently used first
+            idle_timeout: Seconds of inactivity after which a session's kernel
+                is stopped and its state discarded
+            preload: Modules imported by the fork server (default
+                PYTHON_POOL_PRELOAD)
+        """
+        self.max_kernels = max_kernels
+        self.idle_timeout = idle_timeout
+        self.preload = PYTHON_POOL_PRELOAD if preload is None else preload
+        self._sessions: "OrderedDict[str, _Kernel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    def _checkout(self, session_id: str) -> _Kernel:
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name="repl-kernel-reaper", daemon=True)
+                self._reaper.start()
+            kernel = self._sessions.get(session_id)
+            if kernel is None:
+                kernel = self._sessions[session_id] = _Kernel()
+            self._sessions.move_to_end(session_id)
+            kernel.users += 1
+            reclaimed = self._take(lambda sid, k: sid != session_id,
+                                   len(self._sessions) - self.max_kernels)
+        for sid, victim in reclaimed:
+            logger.info(f"Reclaiming REPL session {sid} (more than {self.max_kernels} live kernels)")
+            victim.stop()
+        return kernel
+
+    def _take(self, predicate, limit: int):
+        """Remove up to ``limit`` unused sessions matching ``predicate``, least recently used first."""
+        taken = []
+        for sid, kernel in list(self._sessions.items()):
+            if len(taken) >= limit:
+                break
+            if kernel.users == 0 and predicate(sid, kernel):
+                taken.append((sid, self._sessions.pop(sid)))
+        return taken
+
+    def _reap(self):
+        while not self._stop.wait(min(self.idle_timeout, 60)):
+            self.evict_idle()
+
+    def evict_idle(self) -> int:
+        """Stop the kernels of sessions idle for longer than idle_timeout.
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = self._take(lambda sid, k: k.last_used < deadline, len(self._sessions))
+        for sid, kernel in idle:
+            logger.info(f"Stopping idle REPL session {sid}")
+            kernel.stop()
+        return len(idle)
+
+    def execute(self, session_id: str, code: str, timeout: float = 30) -> Dict[str, Any]:
+        """Run code in a session's kernel, starting the kernel if needed.
+
+        A timeout or crash kills the kernel, so the session starts over with
+        an empty namespace on its next call.
+
+        Args:
+            session_id: Session whose variables the code sees and updates
+            code: Python source
+            timeout: Seconds before the kernel is killed
+
+        Returns:
+            Dict with success, stdout, stderr and executed_code
+        """
+        kernel = self._checkout(session_id)
+        try:
+            with kernel.lock:
+                if kernel.worker is None or not kernel.worker.alive:
+                    kernel.worker = _Worker(_get_context(self.preload), persistent=True)
+                result = kernel.worker.execute(code, timeout)
+                if not kernel.worker.alive:
+                    result["stderr"] += f"\nREPL session {session_id} was restarted; its variables are lost"
+        finally:
+            with self._lock:
+                kernel.users -= 1
+                kernel.last_used = time.monotonic()
+        del result["return_code"]
+        return result
+
+    def reset(self, session_id: str) -> bool:
+        """Stop a session's kernel, discarding its variables.
+
+        Returns:
+            bool: Whether the session existed
+        """
+        with self._lock:
+            kernel = self._sessions.pop(session_id, None)
+        if kernel is None:
+            return False
+        kernel.stop()
+        return True
+
+    def shutdown(self):
+        """Stop every kernel and the idle reaper."""
+        self._stop.set()
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), OrderedDict()
+        for kernel in sessions:
+            kernel.stop()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+_kernels: Optional[ReplKernelManager] = None
+_kernels_lock = threading.Lock()
+
+
+def get_repl_kernels() -> ReplKernelManager:
+    """Get the shared REPL kernel manager."""
+    global _kernels
+    with _kernels_lock:
+        if _kernels is None:
+            _kernels = ReplKernelManager()
+            atexit.register(_kernels.shutdown)
+        return _kernels
@@ -6,6 +6,8 @@ import tempfile
 import os
 from typing import Dict, Any, Tuple
 import logging
+from src.config.tools import PYTHON_POOL_ENABLED
+from .python_pool import get_python_pool, get_repl_kernels
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,9 @@ logger = logging.getLogger(__name__)
 def execute_python_code(code: str, timeout: int = 30) -> Dict[str, Any]:
     """Execute Python code in a safe environment.
     
+    The code runs in a warm worker of the shared pool when PYTHON_POOL_ENABLED,
+    and in a fresh interpreter otherwise or if the pool cannot be started.
+    
     Args:
         code: Python code to execute
         timeout: Maximum execution time in seconds
@@ -20,6 +25,16 @@ def execute_python_code(code: str, timeout: int = 30) -> Dict[str, Any]:
     Returns:
         Dict containing execution results
     """
+    if PYTHON_POOL_ENABLED:
+        try:
+            return get_python_pool().run(code, timeout)
+        except Exception as e:
+            logger.warning(f"Python worker pool unavailable, running in a new interpreter: {e}")
+    return _execute_in_subprocess(code, timeout)
+
+
+def _execute_in_subprocess(code: str, timeout: int) -> Dict[str, Any]:
+    """Execute Python code in a new interpreter process."""
     try:
         # Create a temporary file for the code
         with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
@@ -190,78 +205,37 @@ def check_python_environment() -> Dict[str, Any]:
         }
 
 
-class PythonREPL:
-    """Simple Python REPL for interactive code execution."""
+def execute_repl_code(code: str, session_id: str = "default", timeout: int = 30) -> Dict[str, Any]:
+    """Execute code in a persistent REPL session.
     
-    def __init__(self):
-        self.globals = {}
-        self.locals = {}
-    
-    def execute(self, code: str) -> Dict[str, Any]:
-        """Execute code in the REPL environment.
-        
-        Args:
-            code: Python code to execute
-            
-        Returns:
-            Dict containing execution results
-        """
-        try:
-            # Try to compile and execute the code
-            compiled_code = compile(code, '<repl>', 'exec')
-            
-            # Capture stdout
-            import io
-            import contextlib
-            
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            
-            with contextlib.redirect_stdout(stdout_capture), \
-                 contextlib.redirect_stderr(stderr_capture):
-                exec(compiled_code, self.globals, self.locals)
-            
-            stdout = stdout_capture.getvalue()
-            stderr = stderr_capture.getvalue()
-            
-            return {
-                "success": True,
-                "stdout": stdout,
-                "stderr": stderr,
-                "executed_code": code
-            }
-            
-        except Exception as e:
-            return {
-                "success": False,
-                "stdout": "",
-                "stderr": str(e),
-                "executed_code": code
-            }
-    
-    def reset(self):
-        """Reset the REPL environment."""
-        self.globals.clear()
-        self.locals.clear()
-
-
-# Global REPL instance for maintaining state
-_repl = PythonREPL()
-
-
-def execute_repl_code(code: str) -> Dict[str, Any]:
-    """Execute code in a persistent REPL environment.
+    Each session runs in a kernel process of its own, so variables persist
+    between calls of the same session and never leak into other sessions.
     
     Args:
         code: Python code to execute
+        session_id: Session whose variables the code sees and updates
+        timeout: Maximum execution time in seconds
         
     Returns:
         Dict containing execution results
     """
-    return _repl.execute(code)
+    try:
+        return get_repl_kernels().execute(session_id, code, timeout)
+    except Exception as e:
+        logger.error(f"Error executing REPL code: {e}")
+        return {
+            "success": False,
+            "stdout": "",
+            "stderr": str(e),
+            "executed_code": code
+        }
 
 
-def reset_repl():
-    """Reset the REPL environment."""
-    _repl.reset()
-    return {"success": True, "message": "REPL environment reset"} 
\ No newline at end of file
+def reset_repl(session_id: str = "default"):
+    """Reset a REPL session, discarding its variables.
+    
+    Args:
+        session_id: Session to reset
+    """
+    get_repl_kernels().reset(session_id)
+    return {"success": True, "message": "REPL environment reset"}
@@ -0,0 +1,151 @@
+"""TF-IDF topic extraction over the corpus of analyzed repositories.
+
+Raw word counts surface the words every project uses ("merge", "update",
+"release"). Here each analyzed repository is one document: its topic word
+counts are stored on disk, one JSON file per repository, and document
+frequencies are kept as a NumPy array over a shared vocabulary. Adding or
+re-analyzing a repository only adjusts the frequencies of its own terms,
+and ranking a repository's terms is a vectorized pass over its terms alone.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import logging
+from src.config.tools import TOPIC_CORPUS_DIR, TOPIC_TERMS_PER_REPO
+
+logger = logging.getLogger(__name__)
+
+
+class TopicCorpus:
+    """Incremental TF-IDF corpus with one document per repository."""
+
+    def __init__(self, store_dir: Optional[str] = TOPIC_CORPUS_DIR, max_terms: int = TOPIC_TERMS_PER_REPO):
+        """Create a corpus backed by ``store_dir``.
+
+        Args:
+            store_dir: Directory of per-repository term files (None keeps the
+                corpus in memory only)
+            max_terms: Most frequent terms kept per repository
+        """
+        self.store_dir = store_dir
+        self.max_terms = max_terms
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._vocabulary: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._df = np.zeros(0, dtype=np.int64)
+        # Repository URL -> (term ids, term counts)
+        self._documents: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _path(self, repo_url: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', "_".join(repo_url.rstrip('/').split('/')[-2:]))
+        digest = hashlib.sha256(repo_url.rstrip('/').lower().encode()).hexdigest()[:12]
+        return os.path.join(self.store_dir, f"{name}-{digest}.json")
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.store_dir or not os.path.isdir(self.store_dir):
+            return
+        for filename in os.listdir(self.store_dir):
+            if not filename.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.store_dir, filename), 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+                self._set_document(document['repo_url'], document['terms'])
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping unreadable topic document {filename}: {e}")
+
+    def _term_ids(self, terms: List[str]) -> np.ndarray:
+        """Vocabulary ids of terms, adding unseen ones."""
+        ids = np.fromiter((self._vocabulary.setdefault(term, len(self._vocabulary)) for term in terms),
+                          dtype=np.int64, count=len(terms))
+        if len(self._vocabulary) > len(self._terms):
+            self._terms.extend(list(self._vocabulary)[len(self._terms):])
+            self._df = np.concatenate([self._df, np.zeros(len(self._terms) - self._df.size, dtype=np.int64)])
+        return ids
+
+    def _set_document(self, repo_url: str, counts: Mapping[str, int]):
+        previous = self._documents.get(repo_url)
+        if previous is not None:
+            self._df[previous[0]] -= 1
+        terms = list(counts)
+        ids = self._term_ids(terms)
+        self._df[ids] += 1
+        self._documents[repo_url] = (ids, np.fromiter(counts.values(), dtype=np.int64, count=len(terms)))
+
+    def _write(self, repo_url: str, counts: Dict[str, int]):
+        try:
+            os.makedirs(self.store_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'repo_url': repo_url, 'terms': counts}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(repo_url))
+        except OSError as e:
+            logger.warning(f"Could not persist topics for {repo_url}: {e}")
+
+    def add(self, repo_url: str, counts: Mapping[str, int]):
+        """Add or replace a repository's document.
+
+        Args:
+            repo_url: Repository URL identifying the document
+            counts: Topic word counts of its commit messages
+        """
+        top = sorted(counts.items(), key=lambda item: -item[1])[:self.max_terms]
+        document = {term: int(count) for term, count in top if count > 0}
+        with self._lock:
+            self._ensure_loaded()
+            self._set_document(repo_url, document)
+            if self.store_dir:
+                self._write(repo_url, document)
+
+    def top_terms(self, repo_url: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Most distinctive terms of a repository.
+
+        Terms are scored by sublinear term frequency times smoothed inverse
+        document frequency, ``(1 + ln tf) * (ln((1 + N) / (1 + df)) + 1)``.
+
+        Args:
+            repo_url: Repository added with add()
+            k: Number of terms
+
+        Returns:
+            List of (term, score), highest score first; empty for an
+            unknown repository
+        """
+        with self._lock:
+            self._ensure_loaded()
+            document = self._documents.get(repo_url)
+            if document is None or not document[0].size:
+                return []
+            ids, counts = document
+            idf = np.log((1 + len(self._documents)) / (1 + self._df[ids])) + 1
+            scores = (1 + np.log(counts)) * idf
+            top = np.argsort(-scores, kind="stable")[:k]
+            return [(self._terms[ids[i]], round(float(scores[i]), 4)) for i in top]
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._documents)
+
+
+_corpus: Optional[TopicCorpus] = None
+_corpus_lock = threading.Lock()
+
+
+def get_topic_corpus() -> TopicCorpus:
+    """Get the shared corpus stored under TOPIC_CORPUS_DIR."""
+    global _corpus
+    with _corpus_lock:
+        if _corpus is None:
+            _corpus = TopicCorpus()
+        return _corpus
@@ -0,0 +1,239 @@
+"""Background-refreshed index of GitHub trending repositories.
+
+GitHub only publishes trending repositories as an HTML page per language
+and time window. The index keeps the full ranked list of every configured
+page in memory, persists it to disk so a restart starts warm, and refreshes
+it on an interval from a daemon thread. Lookups never touch the network
+unless a page has not been fetched yet.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+import logging
+from src.config.tools import (
+    TRENDING_LANGUAGES,
+    TRENDING_WINDOWS,
+    TRENDING_REFRESH_INTERVAL,
+    TRENDING_INDEX_PATH
+)
+
+logger = logging.getLogger(__name__)
+
+TRENDING_URL = "https://github.com/trending"
+
+# Only the repository rows are parsed, not the rest of the page
+_ARTICLES = SoupStrainer("article")
+
+
+def trending_url(language: str = "", since: str = "daily") -> str:
+    """URL of the trending page for a language ("" for all) and time window."""
+    path = f"{TRENDING_URL}/{language}" if language else TRENDING_URL
+    return f"{path}?since={since}"
+
+
+def _count(text: Optional[str]) -> int:
+    """Parse counts such as "12,345" or "1,024 stars today"."""
+    match = re.search(r'[\d,]+', text or "")
+    return int(match.group().replace(",", "")) if match else 0
+
+
+def parse_trending_page(html: str) -> List[Dict[str, Any]]:
+    """Extract the ranked repositories from a trending page.
+
+    Args:
+        html: Trending page HTML
+
+    Returns:
+        List of repository dicts in page order
+    """
+    soup = BeautifulSoup(html, "html.parser", parse_only=_ARTICLES)
+    repos = []
+
+    for article in soup.find_all("article"):
+        link = article.select_one("h2 a")
+        if not link or not link.get("href"):
+            continue
+        full_name = re.sub(r'\s+', '', link["href"]).strip("/")
+        description = article.find("p")
+        language = article.select_one('[itemprop="programmingLanguage"]')
+        stars = article.select_one('a[href$="/stargazers"]')
+        period_stars = article.find(string=re.compile(r'stars? (today|this week|this month)'))
+
+        repos.append({
+            'rank': len(repos) + 1,
+            'full_name': full_name,
+            'url': f"https://github.com/{full_name}",
+            'description': description.get_text(" ", strip=True) if description else "",
+            'language': language.get_text(strip=True) if language else "",
+            'stars': _count(stars.get_text() if stars else None),
+            'period_stars': _count(period_stars)
+        })
+
+    return repos
+
+
+class TrendingIndex:
+    """Ranked trending lists keyed by (language, time window)."""
+
+    def __init__(self, fetch: Callable[[str, str], List[Dict[str, Any]]],
+                 languages: Optional[List[str]] = None, windows: Optional[List[str]] = None,
+                 refresh_interval: float = TRENDING_REFRESH_INTERVAL,
+                 store_path: Optional[str] = TRENDING_INDEX_PATH):
+        """Initialize the index and load the persisted copy, if any.
+
+        Args:
+            fetch: Callable returning the ranked repos for (language, since)
+            languages: Languages refreshed in the background
+            windows: Time windows ("daily", "weekly", "monthly") refreshed
+            refresh_interval: Seconds between refreshes of each page
+            store_path: JSON file the index is persisted to; None disables it
+        """
+        self.fetch = fetch
+        self.languages = list(TRENDING_LANGUAGES if languages is None else languages)
+        self.windows = list(TRENDING_WINDOWS if windows is None else windows)
+        self.refresh_interval = refresh_interval
+        self.store_path = store_path
+
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # One lock per page, so a reader and the refresh thread never fetch it twice
+        self._page_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._load()
+
+    @staticmethod
+    def _key(language: str, since: str) -> Tuple[str, str]:
+        return (language or "").lower(), since
+
+    def _load(self):
+        if not self.store_path:
+            return
+        try:
+            with open(self.store_path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            for entry in stored.get('entries', []):
+                self._entries[self._key(entry['language'], entry['since'])] = entry
+        except (OSError, ValueError, KeyError):
+            return
+
+    def _save(self):
+        if not self.store_path:
+            return
+        with self._lock:
+            state = {'entries': list(self._entries.values())}
+        try:
+            directory = os.path.dirname(self.store_path) or "."
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.store_path)
+        except OSError as e:
+            logger.warning(f"Could not persist trending index: {e}")
+
+    def refresh(self, language: str = "python", since: str = "daily") -> List[Dict[str, Any]]:
+        """Fetch one trending page and replace its entry in the index.
+
+        Returns:
+            The freshly fetched ranked list
+        """
+        repos = self.fetch(language, since)
+        with self._lock:
+            self._entries[self._key(language, since)] = {
+                'language': language,
+                'since': since,
+                'fetched_at': time.time(),
+                'repos': repos
+            }
+        self._save()
+        logger.info(f"Refreshed trending index for {language or 'all'}/{since}: {len(repos)} repos")
+        return repos
+
+    def _refresh_if_stale(self, language: str, since: str) -> List[Dict[str, Any]]:
+        """Refresh a page unless a concurrent refresh made it fresh meanwhile."""
+        key = self._key(language, since)
+        with self._lock:
+            page_lock = self._page_locks.setdefault(key, threading.Lock())
+        with page_lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self.is_stale(language, since):
+                return entry['repos']
+            return self.refresh(language, since)
+
+    def is_stale(self, language: str = "python", since: str = "daily") -> bool:
+        """Whether a page is missing or older than the refresh interval."""
+        entry = self._entries.get(self._key(language, since))
+        return entry is None or time.time() - entry['fetched_at'] >= self.refresh_interval
+
+    def top(self, k: int = 1, language: str = "python", since: str = "daily") -> List[Dict[str, Any]]:
+        """Top-k trending repositories for a language and time window.
+
+        Served from memory; a page that was never fetched is fetched
+        synchronously, sharing the fetch with the background thread if it
+        is loading the same page. Stale pages are still served while the
+        background thread refreshes them; pages it does not cover, or any
+        page when it is not running, are refreshed on lookup.
+
+        Args:
+            k: Number of repositories to return
+            language: Trending language ("" for all languages)
+            since: Time window ("daily", "weekly" or "monthly")
+
+        Returns:
+            Up to k repository dicts, best ranked first
+        """
+        entry = self._entries.get(self._key(language, since))
+        if entry is None:
+            return self._refresh_if_stale(language, since)[:k]
+        refreshed_in_background = self._thread is not None and self._covers(language, since)
+        if not refreshed_in_background and self.is_stale(language, since):
+            try:
+                return self._refresh_if_stale(language, since)[:k]
+            except Exception as e:
+                logger.warning(f"Serving stale trending data for {language or 'all'}/{since}: {e}")
+        return entry['repos'][:k]
+
+    def _covers(self, language: str, since: str) -> bool:
+        """Whether a page is one the background thread refreshes."""
+        key = self._key(language, since)
+        return any(key == self._key(lang, window) for lang in self.languages for window in self.windows)
+
+    def refresh_stale(self):
+        """Refresh every configured page that is due, logging failures."""
+        for language in self.languages:
+            for since in self.windows:
+                if self._stop.is_set():
+                    return
+                if self.is_stale(language, since):
+                    try:
+                        self._refresh_if_stale(language, since)
+                    except Exception as e:
+                        logger.warning(f"Trending refresh failed for {language or 'all'}/{since}: {e}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_stale()
+            # Wake up often enough to honour the interval of every page
+            self._stop.wait(min(self.refresh_interval, 60))
+
+    def start(self):
+        """Start the background refresh thread (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trending-index", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
@@ -1,9 +1,11 @@
 """Streamlit application for LangManus Demo."""
 
 import streamlit as st
+import json
 import os
 from PIL import Image
 from src.main_app import LangManusAgent
+from src.tools.chart_cache import chart_title
 
 st.set_page_config(page_title="LangManus GitHub Analyzer", layout="wide")
 st.title("🧠 LangManus GitHub Repo Analyzer")
@@ -80,12 +82,20 @@ if st.button("🔍 Run LangManus Analysis", type="primary"):
                         if os.path.exists(chart_path):
                             col_idx = i % len(cols)
                             with cols[col_idx]:
-                                chart_name = os.path.basename(chart_path).replace('_', ' ').replace('.png', '').title()
-                                st.image(
-                                    Image.open(chart_path), 
-                                    caption=chart_name,
-                                    use_container_width=True
-                                )
+                                chart_name = chart_title(chart_path)
+                                if chart_path.endswith('.json'):
+                                    with open(chart_path, encoding='utf-8') as f:
+                                        st.vega_lite_chart(json.load(f), use_container_width=True)
+                                    st.caption(chart_name)
+                                elif chart_path.endswith('.svg'):
+                                    with open(chart_path, encoding='utf-8') as f:
+                                        st.image(f.read(), caption=chart_name, use_container_width=True)
+                                else:
+                                    st.image(
+                                        Image.open(chart_path), 
+                                        caption=chart_name,
+                                        use_container_width=True
+                                    )
                         else:
                             st.warning(f"Chart file not found: {chart_path}")
                 
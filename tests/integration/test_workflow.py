@@ -2,7 +2,7 @@
 
 import pytest
 from unittest.mock import Mock, patch
-from src.core.workflow import create_workflow, WorkflowState
+from src.core.workflow import create_workflow, merge_repo_results, WorkflowState
 from src.main_app import LangManusAgent
 
 
@@ -54,4 +54,39 @@ class TestWorkflow:
         ]
         
         for field in required_fields:
-            assert field in state 
\ No newline at end of file
+            assert field in state 
+
+
+class TestMultiRepoWorkflow:
+    """Test suite for the map-reduce multi-repository mode."""
+
+    def test_merge_repo_results_is_idempotent(self):
+        """Test that re-merging the same results does not duplicate them."""
+        first = [{'repo_url': "u1", 'rank': 1}]
+        merged = merge_repo_results(first, [{'repo_url': "u2", 'rank': 2}])
+
+        assert merge_repo_results(merged, merged) == merged
+        assert [r['repo_url'] for r in merged] == ["u1", "u2"]
+
+    def test_fans_out_per_repo_and_reduces_report(self):
+        """Test that each repo is analyzed in its own branch and compared."""
+        llm = Mock()
+        llm.invoke.return_value = Mock(content="ok")
+        repos = [{'url': f"https://github.com/o/repo{i}"} for i in range(3)]
+
+        def scrape(repo_url):
+            return {'repo_url': repo_url, 'commits': ['fix bug'], 'metadata': {'full_name': repo_url[19:], 'stars': 1}}
+
+        with patch('src.core.workflow.basic_llm', llm), \
+             patch('src.core.workflow.reasoning_llm', llm), \
+             patch('src.core.workflow.find_trending_repos', return_value=repos), \
+             patch('src.core.workflow.scrape_github_activity', side_effect=scrape), \
+             patch('src.core.workflow.analyze_code_activity', return_value=(["Test analysis"], ["c.png"])) as mock_analyze:
+            agent = LangManusAgent(task="Compare", repo_count=3, max_concurrency=2)
+            result = agent.run()
+
+        assert not result['error']
+        assert [r['repo_url'] for r in result['repo_results']] == [repo['url'] for repo in repos]
+        assert len({call.kwargs['output_dir'] for call in mock_analyze.call_args_list}) == 3
+        assert "| 3 | [o/repo2](https://github.com/o/repo2) |" in result['report']
+        assert len(result['chart_paths']) == 3
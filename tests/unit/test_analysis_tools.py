@@ -0,0 +1,118 @@
+"""Unit tests for chart rendering."""
+
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import matplotlib.pyplot as plt
+import pytest
+from src.tools import analysis_tools
+from src.tools.analysis_tools import generate_charts, warm_up_charts
+from src.tools.chart_cache import chart_title, evict_charts, render_cached
+from src.tools.commit_analytics import analyze_commits
+from src.tools.commit_table import CommitTable
+
+
+def _analysis(seed: int):
+    table = CommitTable()
+    words = ["parser", "network", "cache", "docs", "tests"]
+    for i in range(10 + seed * 5):
+        message = f"{['Fix', 'Add', 'Update'][i % 3]} {words[(i + seed) % len(words)]} handling"
+        table.append(f"{i:040x}", f"dev{i % (seed + 1)}", 1704067200 + (i * (seed + 1)) * 3600, message)
+    return analyze_commits(table)
+
+
+class TestChartRendering:
+    """Test suite for the object-oriented, concurrent chart rendering."""
+
+    def test_concurrent_reports_match_serial_renders(self, tmp_path):
+        """Test that reports rendered at the same time do not draw into each other."""
+        analyses = [_analysis(seed) for seed in range(4)]
+        serial = [generate_charts(a, output_dir=str(tmp_path / f"serial{i}")) for i, a in enumerate(analyses)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            concurrent = list(executor.map(
+                lambda item: generate_charts(item[1], output_dir=str(tmp_path / f"parallel{item[0]}")),
+                enumerate(analyses)
+            ))
+
+        for expected, actual in zip(serial, concurrent):
+            assert len(actual) == 4
+            assert [os.path.basename(p) for p in actual] == [os.path.basename(p) for p in expected]
+            for expected_path, actual_path in zip(expected, actual):
+                with open(expected_path, "rb") as e, open(actual_path, "rb") as a:
+                    assert e.read() == a.read()
+        assert plt.get_fignums() == []
+
+    def test_charts_are_content_addressed_and_reused(self, tmp_path):
+        """Test that identical data reuses files and different data gets new names."""
+        first = generate_charts(_analysis(0), output_dir=str(tmp_path))
+        with patch.object(analysis_tools, '_new_figure') as new_figure:
+            again = generate_charts(_analysis(0), output_dir=str(tmp_path))
+        other = generate_charts(_analysis(1), output_dir=str(tmp_path))
+
+        assert again == first and not new_figure.called
+        assert os.path.basename(first[0]).startswith("commit_chart-")
+        assert not set(first) & set(other)
+
+    def test_failed_render_leaves_no_file(self, tmp_path):
+        """Test that a render error leaves neither the chart nor a temporary file."""
+        def render(target):
+            with open(target, "w") as f:
+                f.write("partial")
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            render_cached(str(tmp_path / "chart-0123456789abcdef.png"), render)
+        assert os.listdir(tmp_path) == []
+
+    def test_chart_titles_drop_hash_and_extension(self):
+        """Test that report and UI titles hide the content hash and file format."""
+        assert chart_title("output/a/commit_chart-3f2a9c0d1e2b4a5f.png") == "Commit Chart"
+        assert chart_title("category_chart-3f2a9c0d1e2b4a5f.svg") == "Category Chart"
+        assert chart_title("topics_chart-3f2a9c0d1e2b4a5f.json") == "Topics Chart"
+        assert chart_title("contributors_chart.png") == "Contributors Chart"
+
+    def test_eviction_drops_least_recently_used_charts(self, tmp_path):
+        """Test that eviction removes the oldest charts and ignores other files."""
+        for i, name in enumerate(["a-0000000000000000.png", "b-1111111111111111.png", "c-2222222222222222.png"]):
+            path = tmp_path / name
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (1000 + i, 1000 + i))
+        (tmp_path / "notes.txt").write_bytes(b"x" * 1000)
+
+        removed = evict_charts(str(tmp_path), 150, keep=[str(tmp_path / "a-0000000000000000.png")])
+
+        assert removed == 2
+        assert sorted(os.listdir(tmp_path)) == ["a-0000000000000000.png", "notes.txt"]
+
+    def test_vega_format_writes_specs_without_matplotlib(self, tmp_path):
+        """Test that spec mode emits Vega-Lite JSON with inline data and draws nothing."""
+        with patch.object(analysis_tools, '_new_figure') as new_figure:
+            charts = generate_charts(_analysis(0), output_dir=str(tmp_path), chart_format="vega")
+
+        assert not new_figure.called
+        assert [os.path.splitext(p)[1] for p in charts] == [".json"] * 4
+        with open(charts[1], encoding="utf-8") as f:
+            spec = json.load(f)
+        assert spec["$schema"].endswith("vega-lite/v5.json") and spec["mark"]["type"] == "bar"
+        assert sum(row["commits"] for row in spec["data"]["values"]) == 10
+
+    def test_svg_format_and_unknown_format(self, tmp_path):
+        """Test that svg mode writes vector images and unknown formats yield no charts."""
+        charts = generate_charts(_analysis(0), output_dir=str(tmp_path), chart_format="svg")
+
+        assert len(charts) == 4 and all(p.endswith(".svg") for p in charts)
+        assert generate_charts(_analysis(0), output_dir=str(tmp_path / "x"), chart_format="gif") == []
+
+    def test_matplotlib_is_imported_on_first_render(self):
+        """Test that importing the tools does not import matplotlib."""
+        code = "import sys, src.tools.analysis_tools; print('matplotlib' in sys.modules)"
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        output = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True,
+                                check=True).stdout
+
+        assert output.strip() == "False"
+        assert warm_up_charts() > 0
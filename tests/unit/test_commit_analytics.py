@@ -0,0 +1,152 @@
+"""Unit tests for the vectorized commit analytics."""
+
+import re
+import numpy as np
+from unittest.mock import patch
+from src.tools import commit_analytics
+from src.tools.analysis_tools import analyze_code_activity, categorize_commit
+from benchmarks.bench_commit_analytics import synthetic_history
+from src.tools.commit_analytics import (
+    MisraGries,
+    OnlineCommitAggregator,
+    analyze_commits,
+    author_stats,
+    bus_factor,
+    categorize_messages,
+    category_counts,
+    classify_messages,
+    contributor_stats,
+    daily_histogram,
+    parse_iso_timestamps,
+    timestamps_of,
+    token_counts,
+    weekly_histogram
+)
+from src.tools.commit_table import CommitTable, parse_timestamp
+
+
+class TestCommitAnalytics:
+    """Test suite for the NumPy analytics layer."""
+
+    def test_parse_iso_timestamps_matches_scalar_parser(self):
+        """Test UTC, offset and invalid dates against the per-date parser."""
+        dates = ["2024-01-02T10:00:00Z", "2024-01-02T12:00:00+02:00", "2024-01-02T05:00:00-05:30"]
+
+        assert parse_iso_timestamps(dates).tolist() == [parse_timestamp(d) for d in dates]
+        assert parse_iso_timestamps(["garbage", dates[0]]).tolist() == [0, parse_timestamp(dates[0])]
+
+    def test_histograms_bin_by_day_and_week(self):
+        """Test that empty days are kept and weeks start on Monday."""
+        timestamps = parse_iso_timestamps(["2024-01-01T23:00:00Z", "2024-01-03T00:00:00Z",
+                                           "2024-01-08T00:00:00Z", "2024-01-01T01:00:00Z"])
+        days, counts = daily_histogram(np.append(timestamps, 0))
+        assert str(days[0]) == "2024-01-01" and counts.tolist() == [2, 0, 1, 0, 0, 0, 0, 1]
+
+        weeks, counts = weekly_histogram(timestamps)
+        assert [str(w) for w in weeks] == ["2024-01-01", "2024-01-08"]
+        assert counts.tolist() == [3, 1]
+
+    def test_vectorized_categories_match_categorize_commit(self):
+        """Test that batch categorization agrees with the scalar function."""
+        messages = ["Fix crash", "Add docs", "Update README", "Merge pull request", "misc", "Remove it"]
+
+        categories = categorize_messages(messages)
+        assert categories.tolist() == [categorize_commit(m) for m in messages]
+        assert category_counts(classify_messages(messages))["📦 Others"] == 1
+
+    def test_author_stats(self):
+        """Test per-author counts and activity span."""
+        table = CommitTable()
+        for author, timestamp in [("ann", 300), ("bob", 200), ("ann", 100)]:
+            table.append("0" * 40, author, timestamp, "change")
+
+        assert timestamps_of(table).tolist() == [300, 200, 100]
+        assert author_stats(table)[0] == {'author': "ann", 'commits': 2, 'first': 100, 'last': 300}
+
+    def test_token_counts_match_per_message_scan(self):
+        """Test that the joined scan finds the same words as one scan per message."""
+        messages = ["Fix parser", "parser: handle EOF", "Docs\nupdate"]
+        expected = [w for m in messages for w in re.findall(r'\b\w{4,}\b', m.lower())]
+
+        assert sorted(token_counts(messages).elements()) == sorted(expected)
+
+    def test_analysis_pass_runs_once_per_report(self, tmp_path):
+        """Test that charts and insights share one classification and tokenization."""
+        table = CommitTable()
+        for i, message in enumerate(["Fix crash", "Add parser feature", "Fix parser"]):
+            table.append(f"{i:040d}", "ann", 1704067200 + i * 86400, message)
+
+        with patch.object(commit_analytics, 'classify_messages', wraps=classify_messages) as classify, \
+             patch.object(commit_analytics, 'token_counts', wraps=token_counts) as tokenize:
+            insights, charts = analyze_code_activity({'commits': table}, output_dir=str(tmp_path))
+
+        assert classify.call_count == 1 and tokenize.call_count == 1
+        assert len(charts) == 4
+        assert "- Most active category: 🐛 Bug Fixes" in insights
+        assert analyze_commits(table).token_counts["parser"] == 2
+
+    def test_online_aggregator_matches_batch_analysis(self, tmp_path):
+        """Test that streaming in small chunks yields the same insights and chart inputs."""
+        table = synthetic_history(500)[0]
+        batch = analyze_commits(table)
+        online = OnlineCommitAggregator().consume(iter(table), chunk_size=64)
+
+        assert len(online) == len(batch)
+        assert online.category_counts == batch.category_counts
+        assert online.token_counts == batch.token_counts
+        assert online.authors == batch.authors
+        assert online.days.tolist() == batch.days.tolist()
+        assert online.daily_counts.tolist() == batch.daily_counts.tolist()
+        assert online.categories_by_recency() == batch.categories_by_recency()
+        for key, value in batch.contributors.items():
+            assert np.array_equal(online.contributors[key], value)
+
+        insights, _ = analyze_code_activity({}, output_dir=str(tmp_path), commit_analysis=online)
+        assert insights == analyze_code_activity({'commits': table}, output_dir=str(tmp_path))[0]
+
+    def test_online_contributors_stay_bounded(self):
+        """Test that per-author week sets are kept only for authors the sketch tracks."""
+        online = OnlineCommitAggregator(author_capacity=5)
+        for chunk in range(50):
+            table = CommitTable()
+            for i in range(40):
+                author = "core" if i % 2 else f"drive-by{chunk}-{i}"
+                table.append(f"{i:040x}", author, 1704067200 - (chunk * 40 + i) * 3600, "Fix parser")
+            online.update(table)
+
+        assert len(online._active_weeks) <= 5
+        assert "core" in online._active_weeks
+        assert set(online._active_weeks) <= set(online._authors.counts)
+        assert online.contributors['active'].max() <= 5
+
+    def test_misra_gries_keeps_heavy_hitters(self):
+        """Test that frequent items survive a sketch far smaller than the stream."""
+        sketch = MisraGries(capacity=4)
+        for i in range(100):
+            sketch.update({"hot": 3, f"cold{i}": 1, f"rare{i}": 1})
+
+        assert len(sketch.counts) <= 4
+        assert sketch.most_common(1)[0][0] == "hot"
+        assert 300 - sketch.total / 5 <= sketch.counts["hot"] <= 300
+
+    def test_bus_factor(self):
+        """Test the fewest authors covering half of the commits."""
+        assert bus_factor(np.array([1, 50, 30, 19])) == 1
+        assert bus_factor(np.array([10, 10, 10, 10])) == 2
+        assert bus_factor(np.array([], dtype=np.int64)) == 0
+
+    def test_contributor_stats_by_week(self):
+        """Test weekly active and first-time contributors, ignoring missing authors."""
+        monday = parse_timestamp("2024-01-01T12:00:00Z")
+        week = 7 * 86400
+        table = CommitTable()
+        for author, timestamp in [("cat", monday + 2 * week), ("ann", monday + 2 * week), ("", monday + week),
+                                  ("bob", monday + 2), ("ann", monday + 1), ("ann", monday)]:
+            table.append("0" * 40, author, timestamp, "change")
+
+        stats = contributor_stats(table)
+        assert stats['contributors'] == 3 and stats['bus_factor'] == 1
+        assert [str(w) for w in stats['weeks']] == ["2024-01-01", "2024-01-08", "2024-01-15"]
+        assert stats['active'].tolist() == [2, 0, 2]
+        assert stats['first_time'].tolist() == [2, 0, 1]
+        assert stats['new_contributors'] == ["ann", "cat", "bob"]
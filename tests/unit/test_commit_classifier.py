@@ -0,0 +1,42 @@
+"""Unit tests for the compiled commit classifier."""
+
+from src.tools.analysis_tools import categorize_commit
+from src.tools.commit_classifier import CommitClassifier
+
+
+class TestCommitClassifier:
+    """Test suite for CommitClassifier."""
+
+    def test_matches_keywords_at_word_start(self):
+        """Test prefix matching on word boundaries instead of substrings."""
+        assert categorize_commit("Fixed crash on startup") == "🐛 Bug Fixes"
+        assert categorize_commit("feat(api): paginate results") == "✨ Features"
+        assert categorize_commit("Increase padding of the prefix field") == "📦 Others"
+        assert categorize_commit("Handle circular imports") == "📦 Others"
+        assert categorize_commit("Run tests on CI") == "🧪 Tests"
+
+    def test_priority_follows_configuration_order(self):
+        """Test that the first configured category mentioned wins."""
+        classifier = CommitClassifier({'fix': ['fix'], 'docs': ['doc']}, {'fix': "Fix", 'docs': "Docs"}, "Other")
+
+        assert classifier.categorize("Update docs and fix typo") == "Fix"
+        assert classifier.categorize("Document the API") == "Docs"
+        assert classifier.categorize("Misc") == "Other"
+
+    def test_batch_matches_single_message_api(self):
+        """Test that batch classification agrees with per-message calls."""
+        classifier = CommitClassifier()
+        messages = ["Merge pull request #1 from fix/x", "Bump deps", "Remove dead code\n\nDrop it", "Rename", "",
+                    "Strip \x00 bytes from docs"]
+
+        assert classifier.categorize_all(messages) == [classifier.categorize(m) for m in messages]
+        assert classifier.categorize_all(messages)[:2] == ["🔀 Merges", "🔧 Updates"]
+        assert classifier.classify([]).size == 0
+
+    def test_batch_follows_priority_and_unicode_word_boundaries(self):
+        """Test overlapping keywords and non-ASCII neighbours in batches."""
+        classifier = CommitClassifier({'docs': ['doc'], 'ci': ['ci', 'docs']}, {}, "Other")
+        messages = ["Update docs", "Set up ci", "éfix ci", "Ci—build", "Über ci", "ciénaga"]
+
+        assert classifier.categorize_all(messages) == ["docs", "ci", "ci", "ci", "ci", "Other"]
+        assert classifier.categorize_all(messages) == [classifier.categorize(m) for m in messages]
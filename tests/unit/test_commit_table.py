@@ -0,0 +1,64 @@
+"""Unit tests for columnar commit records."""
+
+from src.tools.analysis_tools import analyze_code_activity
+from src.tools.commit_table import CommitTable, as_commit_table, parse_timestamp
+
+
+def _commits():
+    return [
+        {'sha': "a" * 40, 'message': "fix crash @ startup", 'author': "dev", 'date': "2024-01-02T10:00:00Z"},
+        {'sha': "b" * 40, 'message': "add feature", 'author': "ops", 'date': "2024-01-01T09:30:00+00:00"},
+        {'sha': "c" * 40, 'message': "bad date", 'author': "dev", 'date': "not a date"}
+    ]
+
+
+class TestCommitTable:
+    """Test suite for CommitTable."""
+
+    def test_from_commits_builds_columns(self):
+        """Test that commit dicts become columns and unparsable dates are skipped."""
+        table = CommitTable.from_commits(_commits())
+
+        assert len(table) == 2
+        assert table.author == ["dev", "ops"]
+        assert list(table.timestamp) == [parse_timestamp("2024-01-02T10:00:00Z"), parse_timestamp("2024-01-01T09:30:00Z")]
+        assert table.dates()[1] == "2024-01-01T09:30:00Z"
+        assert not table.has_stats
+
+    def test_record_renders_formatted_string(self):
+        """Test that records render in the legacy report format."""
+        record = CommitTable.from_commits(_commits())[0]
+        assert str(record) == "[aaaaaaa] fix crash @ startup — dev @ 2024-01-02T10:00:00Z"
+
+    def test_slice_returns_table(self):
+        """Test that slicing keeps the columnar form, including stats."""
+        table = CommitTable(with_stats=True)
+        for i in range(5):
+            table.append(f"{i:040d}", "dev", i * 86400, f"commit {i}", additions=i, deletions=1)
+
+        head = table[:2]
+        assert isinstance(head, CommitTable)
+        assert head.message == ["commit 0", "commit 1"]
+        assert list(head.additions) == [0, 1]
+
+    def test_from_formatted_keeps_separators_in_messages(self):
+        """Test that '@' and '—' inside messages survive legacy parsing."""
+        table = as_commit_table(["[abc1234] merge a — b @ c — dev @ 2024-01-02T10:00:00Z", "plain message"])
+
+        assert table.sha == ["abc1234", ""]
+        assert table.message == ["merge a — b @ c", "plain message"]
+        assert table.author == ["dev", ""]
+        assert table.timestamp[1] == 0
+
+    def test_analysis_accepts_table_and_legacy_lists(self, tmp_path, monkeypatch):
+        """Test that analysis gives the same insights for both input forms."""
+        monkeypatch.setattr("src.tools.analysis_tools.CHART_OUTPUT_DIR", str(tmp_path))
+        table = CommitTable.from_commits(_commits())
+        legacy = {'commits': [str(record) for record in table], 'commit_dates': table.dates()}
+
+        insights, charts = analyze_code_activity({'commits': table})
+        legacy_insights, _ = analyze_code_activity(legacy)
+
+        assert insights == legacy_insights
+        assert "- [aaaaaaa] fix crash @ startup" in insights
+        assert len(charts) == 4
@@ -0,0 +1,199 @@
+"""Unit tests for tool decorators."""
+
+import time
+import pytest
+from unittest.mock import Mock, patch
+from src.tools.decorators import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    circuit_breaker,
+    retry
+)
+
+
+def _http_error(status_code, headers=None):
+    """Build an exception carrying an HTTP response like requests.HTTPError."""
+    error = Exception(f"HTTP {status_code}")
+    error.response = Mock(status_code=status_code, headers=headers or {})
+    return error
+
+
+class TestCircuitBreaker:
+    """Test suite for the circuit breaker."""
+
+    def test_opens_after_failure_rate_reached(self):
+        """Test that the circuit opens once enough calls have failed."""
+        breaker = CircuitBreaker("test-open", failure_threshold=0.5, minimum_calls=4)
+        breaker.record_success()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test that a successful trial call closes an open circuit."""
+        breaker = CircuitBreaker("test-half-open", minimum_calls=1, recovery_timeout=0)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_decorator_fails_fast_and_uses_fallback(self):
+        """Test that an open circuit skips the call and serves the fallback."""
+        calls = []
+
+        @circuit_breaker("test-endpoint", minimum_calls=2, recovery_timeout=60,
+                         fallback=lambda x: f"fallback-{x}")
+        def flaky(x):
+            calls.append(x)
+            raise ConnectionError("endpoint down")
+
+        for i in range(2):
+            with pytest.raises(ConnectionError):
+                flaky(i)
+
+        assert flaky(3) == "fallback-3"
+        assert calls == [0, 1]
+
+    def test_excluded_exception_during_half_open_releases_trial(self):
+        """Test that an excluded exception in a trial call does not wedge the breaker."""
+        @circuit_breaker("test-excluded", minimum_calls=1, recovery_timeout=0,
+                         excluded_exceptions=(KeyError,))
+        def call(error):
+            if error:
+                raise error
+            return "ok"
+
+        with pytest.raises(ConnectionError):
+            call(ConnectionError("down"))
+        assert call.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+
+        with pytest.raises(KeyError):
+            call(KeyError("local refusal"))
+
+        assert call.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+        assert call(None) == "ok"
+        assert call.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_only_transient_errors_count_as_failures(self):
+        """Test that client errors pass through and interrupts release the trial slot."""
+        @circuit_breaker("test-transient", minimum_calls=2, recovery_timeout=0,
+                         is_failure=RetryPolicy().is_retryable)
+        def call(error):
+            raise error
+
+        for status_code in (404, 401, 422):
+            with pytest.raises(Exception):
+                call(_http_error(status_code))
+        assert call.circuit_breaker.state == CircuitBreaker.CLOSED
+
+        for _ in range(2):
+            with pytest.raises(Exception):
+                call(_http_error(503))
+        assert call.circuit_breaker.state == CircuitBreaker.HALF_OPEN
+
+        with pytest.raises(KeyboardInterrupt):
+            call(KeyboardInterrupt())
+        assert call.circuit_breaker.allow_request()
+
+    def test_breaker_state_shared_per_endpoint(self):
+        """Test that functions using the same endpoint name share a breaker."""
+        @circuit_breaker("test-shared", minimum_calls=1, recovery_timeout=60)
+        def first():
+            raise TimeoutError("slow")
+
+        @circuit_breaker("test-shared")
+        def second():
+            return "ok"
+
+        with pytest.raises(TimeoutError):
+            first()
+        with pytest.raises(CircuitOpenError):
+            second()
+        assert first.circuit_breaker is second.circuit_breaker
+
+
+class TestRetryPolicy:
+    """Test suite for the retry policy."""
+
+    def test_permanent_client_errors_are_not_retried(self):
+        """Test that 4xx responses other than rate limits raise immediately."""
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        func = Mock(side_effect=_http_error(404), __name__="func")
+
+        with pytest.raises(Exception):
+            policy.call(func)
+        assert func.call_count == 1
+
+    def test_transient_errors_are_retried(self):
+        """Test that 5xx responses and connection errors are retried."""
+        policy = RetryPolicy(max_attempts=3, base_delay=0)
+        func = Mock(side_effect=[_http_error(503), ConnectionError("reset"), "ok"], __name__="func")
+
+        assert policy.call(func) == "ok"
+        assert func.call_count == 3
+
+    def test_server_directed_delays(self):
+        """Test that Retry-After and exhausted rate limits set the delay."""
+        policy = RetryPolicy()
+        assert policy.server_delay(_http_error(429, {"Retry-After": "7"})) == 7.0
+
+        reset = str(int(time.time()) + 60)
+        rate_limited = _http_error(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset})
+        assert policy.is_retryable(rate_limited)
+        assert 55 <= policy.server_delay(rate_limited) <= 60
+        assert not policy.is_retryable(_http_error(403))
+
+    def test_backoff_uses_full_jitter(self):
+        """Test that backoff delays stay within the exponential ceiling."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+        for attempt in range(6):
+            assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** attempt)
+
+    @patch('src.tools.decorators.time.sleep')
+    def test_deadline_budget_stops_retries(self, mock_sleep):
+        """Test that a delay beyond the deadline raises instead of sleeping."""
+        policy = RetryPolicy(max_attempts=5, deadline=1.0)
+        func = Mock(side_effect=_http_error(429, {"Retry-After": "30"}), __name__="func")
+
+        with pytest.raises(Exception):
+            policy.call(func)
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+
+    @patch('src.tools.decorators.time.sleep')
+    def test_server_delay_beyond_max_delay_raises(self, mock_sleep):
+        """Test that a Retry-After longer than max_delay raises instead of sleeping."""
+        policy = RetryPolicy(max_attempts=5, max_delay=10.0)
+        func = Mock(side_effect=_http_error(429, {"Retry-After": "3600"}), __name__="func")
+
+        with pytest.raises(Exception):
+            policy.call(func)
+        assert func.call_count == 1
+        mock_sleep.assert_not_called()
+
+        func = Mock(side_effect=[_http_error(429, {"Retry-After": "5"}), "ok"], __name__="func")
+        assert policy.call(func) == "ok"
+        mock_sleep.assert_called_once_with(5.0)
+
+    def test_retry_decorator_still_retries_generic_errors(self):
+        """Test that retry() keeps retrying arbitrary exceptions."""
+        attempts = []
+
+        @retry(max_attempts=3, delay=0)
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ValueError("not yet")
+            return "done"
+
+        assert flaky() == "done"
+        assert len(attempts) == 3
@@ -0,0 +1,76 @@
+"""Unit tests for the local git-clone backend."""
+
+import os
+import subprocess
+from src.tools import github_tools
+from src.tools.git_backend import iter_git_commits, sync_repository
+
+
+def _git(repo, *args, date="2024-01-01T12:00:00+00:00"):
+    """Run git in a test repository with a fixed identity and date."""
+    env = {
+        **os.environ,
+        "GIT_AUTHOR_NAME": "Test Author",
+        "GIT_AUTHOR_EMAIL": "author@example.com",
+        "GIT_COMMITTER_NAME": "Test Author",
+        "GIT_COMMITTER_EMAIL": "author@example.com",
+        "GIT_AUTHOR_DATE": date,
+        "GIT_COMMITTER_DATE": date
+    }
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True, env=env)
+
+
+def _make_repo(path, messages):
+    """Create a repository with one commit per message, oldest first."""
+    path.mkdir()
+    _git(path, "init", "--quiet", "--initial-branch=main")
+    for i, message in enumerate(messages):
+        _commit(path, message, day=i + 1)
+    return path
+
+
+def _commit(repo, message, day):
+    (repo / "file.txt").write_text(f"{message}\n")
+    _git(repo, "add", "file.txt")
+    _git(repo, "commit", "--quiet", "-m", message, date=f"2024-01-{day:02d}T12:00:00+00:00")
+
+
+class TestGitBackend:
+    """Test suite for partial-clone history extraction."""
+
+    def test_streams_history_newest_first(self, tmp_path):
+        """Test that commits, including multi-line messages, are parsed in order."""
+        repo = _make_repo(tmp_path / "origin", ["initial commit", "add feature\n\nwith a body", "fix bug @ core"])
+
+        commits = list(iter_git_commits(str(repo), cache_dir=str(tmp_path / "cache")))
+
+        assert [c['message'] for c in commits] == ["fix bug @ core", "add feature\n\nwith a body", "initial commit"]
+        assert commits[0]['author'] == "Test Author"
+        assert commits[0]['date'].startswith("2024-01-03T12:00:00")
+        assert len(commits[0]['sha']) == 40
+
+    def test_incremental_fetch_picks_up_new_commits(self, tmp_path):
+        """Test that a second sync fetches into the existing mirror."""
+        repo = _make_repo(tmp_path / "origin", ["one", "two"])
+        cache_dir = str(tmp_path / "cache")
+        mirror = sync_repository(str(repo), cache_dir)
+
+        _commit(repo, "three", day=3)
+        assert sync_repository(str(repo), cache_dir) == mirror
+
+        commits = list(iter_git_commits(str(repo), max_commits=2, cache_dir=cache_dir))
+        assert [c['message'] for c in commits] == ["three", "two"]
+
+    def test_scrape_with_git_backend(self, tmp_path, monkeypatch):
+        """Test that the git backend feeds the usual repo_data structure."""
+        repo = _make_repo(tmp_path / "origin", [f"commit {i}" for i in range(30)])
+        monkeypatch.setattr(github_tools, "iter_git_commits",
+                            lambda url, **kw: iter_git_commits(url, cache_dir=str(tmp_path / "cache"), **kw))
+
+        repo_data = github_tools.scrape_github_activity(str(repo), max_commits=25, backend="git")
+
+        assert 'error' not in repo_data
+        assert len(repo_data['commits']) == 25
+        assert repo_data['commits'][0].message == "commit 29"
+        assert str(repo_data['commits'][0]).startswith(f"[{repo_data['commits'].sha[0][:7]}] commit 29 — Test Author @ ")
+        assert repo_data['metadata']['name'] == "origin"
@@ -0,0 +1,417 @@
+"""Unit tests for GitHub tools."""
+
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from src.tools import github_tools
+from src.tools.commit_store import CommitStore
+from src.tools.github_client import ConditionalCache, GitHubClient
+from src.tools.github_ratelimit import PRIORITY_LOW, RateLimitExhausted, RateLimitScheduler
+from src.tools.trending import TrendingIndex, parse_trending_page
+
+
+@pytest.fixture(autouse=True)
+def isolated_commit_store(tmp_path, monkeypatch):
+    """Keep the incremental commit store out of the working directory."""
+    store_dir = str(tmp_path / "commits")
+    monkeypatch.setattr(github_tools, 'CommitStore', lambda: CommitStore(store_dir))
+    return store_dir
+
+
+def _commit_item(index):
+    """Build a commit object shaped like the GitHub REST API response."""
+    return {
+        'sha': f"{index:040x}",
+        'commit': {
+            'message': f"commit {index}",
+            'author': {'name': f"author{index % 3}", 'date': f"2024-01-{index % 28 + 1:02d}T00:00:00Z"}
+        }
+    }
+
+
+def _paged_api(total, per_page_cap=100):
+    """Fake _fetch_commits_page serving ``total`` commits with Link headers."""
+    calls = []
+
+    def fetch(user_repo, params, priority=None):
+        calls.append(params['page'])
+        per_page = min(params['per_page'], per_page_cap)
+        start = (params['page'] - 1) * per_page
+        items = [_commit_item(i) for i in range(start, min(start + per_page, total))]
+        last = max(1, -(-total // per_page))
+        links = {'last': {'url': f"https://api.github.com/repos/{user_repo}/commits?per_page={per_page}&page={last}"}}
+        return items, links
+
+    return fetch, calls
+
+
+class TestCommitPagination:
+    """Test suite for paginated commit fetching."""
+
+    def test_fetches_requested_depth_across_pages(self):
+        """Test that max_commits spanning several pages is honoured in order."""
+        fetch, calls = _paged_api(total=450)
+        with patch.object(github_tools, '_fetch_commits_page', side_effect=fetch):
+            commits = list(github_tools.iter_commits("https://github.com/o/r", max_commits=250))
+
+        assert len(commits) == 250
+        assert commits[0]['message'] == "commit 0"
+        assert commits[-1]['message'] == "commit 249"
+        assert sorted(calls) == [1, 2, 3]
+
+    def test_time_window_fetches_every_page(self):
+        """Test that a since window without a limit follows the Link header."""
+        fetch, calls = _paged_api(total=230)
+        with patch.object(github_tools, '_fetch_commits_page', side_effect=fetch):
+            commits = list(github_tools.iter_commits("https://github.com/o/r", since="2024-01-01T00:00:00Z"))
+
+        assert len(commits) == 230
+        assert sorted(calls) == [1, 2, 3]
+
+    def test_scrape_uses_default_depth(self):
+        """Test that scrape_github_activity keeps the configured default depth."""
+        fetch, calls = _paged_api(total=500)
+        with patch.object(github_tools, '_fetch_commits_page', side_effect=fetch), \
+             patch.object(github_tools, 'get_repo_metadata', return_value={'name': 'r'}):
+            repo_data = github_tools.scrape_github_activity("https://github.com/o/r")
+
+        assert len(repo_data['commits']) == github_tools.GITHUB_MAX_COMMITS
+        assert calls == [1]
+
+
+class TestIncrementalSync:
+    """Test suite for high-water-mark incremental commit sync."""
+
+    @staticmethod
+    def _api(items):
+        calls = []
+
+        def fetch(user_repo, params, priority=None):
+            calls.append(dict(params))
+            return items[:params['per_page']], {}
+
+        return fetch, calls
+
+    def test_second_run_fetches_only_since_mark(self, isolated_commit_store):
+        """Test that a later run asks for commits since the mark and merges them."""
+        history = [_commit_item(i) for i in range(5, 25)]
+        fetch, calls = self._api(history)
+        with patch.object(github_tools, '_fetch_commits_page', side_effect=fetch), \
+             patch.object(github_tools, 'get_repo_metadata', return_value={}):
+            github_tools.scrape_github_activity("https://github.com/o/r")
+
+        mark = CommitStore(isolated_commit_store).high_water("https://github.com/o/r")
+        assert mark['sha'] == history[0]['sha']
+
+        # Three new commits plus the (inclusive) mark itself
+        fetch, calls = self._api([_commit_item(i) for i in range(2, 6)])
+        with patch.object(github_tools, '_fetch_commits_page', side_effect=fetch), \
+             patch.object(github_tools, 'get_repo_metadata', return_value={}):
+            repo_data = github_tools.scrape_github_activity("https://github.com/o/r")
+
+        assert calls[0]['since'] == mark['date']
+        assert len(repo_data['commits']) == github_tools.GITHUB_MAX_COMMITS
+        assert str(repo_data['commits'][0]).startswith("[0000000] commit 2 ")
+        assert repo_data['commits'][4].message == "commit 6"
+
+    def test_merge_replaces_history_when_gap(self, tmp_path):
+        """Test that a merge that does not reach the old mark discards stale history."""
+        store = CommitStore(str(tmp_path))
+        store.merge("o/r", [{'sha': "old", 'date': "2024-01-01"}])
+        merged = store.merge("o/r", [{'sha': "new", 'date': "2024-02-01"}], replace=True)
+
+        assert [c['sha'] for c in merged] == ["new"]
+        assert store.high_water("o/r") == {'sha': "new", 'date': "2024-02-01"}
+
+
+    def test_mark_uses_committer_date(self, tmp_path):
+        """Test that a rebased commit moves the mark to its newer committer date."""
+        item = _commit_item(1)
+        item['commit']['committer'] = {'date': "2024-03-01T00:00:00Z"}
+        rebased = github_tools._parse_commit(item)
+        assert rebased['committed_date'] == "2024-03-01T00:00:00Z"
+
+        store = CommitStore(str(tmp_path))
+        store.merge("o/r", [{'sha': "old", 'date': "2024-02-01T00:00:00Z"}])
+        store.merge("o/r", [rebased])
+
+        assert store.high_water("o/r") == {'sha': rebased['sha'], 'date': "2024-03-01T00:00:00Z"}
+
+
+class TestGitHubClient:
+    """Test suite for the pooled GitHub client."""
+
+    def test_reuses_one_session_and_authenticates_api_calls(self):
+        """Test that API paths are resolved and only API calls carry the token."""
+        client = GitHubClient(token="secret", http2=False)
+        response = Mock(status_code=200, content=b"[]", links={'next': {'url': "u?page=2"}},
+                        headers={'Content-Type': "application/json"})
+        response.json.return_value = []
+        response.text = "<html></html>"
+
+        with patch.object(client._client, 'get', return_value=response) as mock_get:
+            result = client.get("repos/o/r/commits", params={'page': 1})
+            client.get("https://github.com/trending/python")
+
+        api_call, page_call = mock_get.call_args_list
+        assert api_call.args[0] == "https://api.github.com/repos/o/r/commits"
+        assert api_call.kwargs['headers']['Authorization'] == "Bearer secret"
+        assert 'Authorization' not in page_call.kwargs['headers']
+        assert result.links == {'next': {'url': "u?page=2"}}
+        assert result.data == []
+
+    def test_conditional_requests_served_from_cache(self, tmp_path):
+        """Test that a 304 is answered from the ETag cache on disk."""
+        client = GitHubClient(token="secret", http2=False, cache=ConditionalCache(str(tmp_path)))
+        fresh = Mock(status_code=200, content=b"{}", links={},
+                     headers={'Content-Type': "application/json", 'ETag': '"abc"'})
+        fresh.json.return_value = {'name': "repo"}
+        not_modified = Mock(status_code=304, content=b"", links={},
+                            headers={'X-RateLimit-Remaining': "4999"})
+
+        with patch.object(client._client, 'get', side_effect=[fresh, not_modified]) as mock_get:
+            first = client.get("repos/o/r")
+            second = client.get("repos/o/r")
+
+        assert mock_get.call_args_list[1].kwargs['headers']['If-None-Match'] == '"abc"'
+        assert not first.from_cache
+        assert second.from_cache
+        assert second.data == {'name': "repo"}
+        assert second.headers['X-RateLimit-Remaining'] == "4999"
+
+    def test_conditional_requests_with_httpx_responses(self, tmp_path):
+        """Test that a 304 from httpx, whose raise_for_status() rejects it, is a cache hit."""
+        httpx = pytest.importorskip("httpx")
+        client = GitHubClient(token="secret", http2=False, cache=ConditionalCache(str(tmp_path)))
+        request = httpx.Request("GET", "https://api.github.com/repos/o/r")
+        fresh = httpx.Response(200, json={'name': "repo"}, headers={'ETag': '"abc"'}, request=request)
+        not_modified = httpx.Response(304, headers={'X-RateLimit-Remaining': "4999"}, request=request)
+        missing = httpx.Response(404, json={'message': "Not Found"}, request=request)
+
+        with patch.object(client._client, 'get', side_effect=[fresh, not_modified, missing]):
+            client.get("repos/o/r")
+            second = client.get("repos/o/r")
+            with pytest.raises(httpx.HTTPStatusError):
+                client.get("repos/o/r")
+
+        assert second.from_cache and second.data == {'name': "repo"}
+
+    def test_http2_client_follows_renamed_repository_redirects(self):
+        """Test that the httpx transport follows a 301 as requests does."""
+        httpx = pytest.importorskip("httpx")
+        from src.tools import github_client
+
+        def handler(request):
+            if request.url.path == "/repos/old/r":
+                return httpx.Response(301, headers={'Location': "https://api.github.com/repositories/1"})
+            return httpx.Response(200, json={'full_name': "new/r"})
+
+        def make_client(http2, **kwargs):
+            # h2 may be missing; the transport is mocked either way
+            return httpx.Client(transport=httpx.MockTransport(handler), **kwargs)
+
+        fake_httpx = SimpleNamespace(Client=make_client, Limits=httpx.Limits)
+        with patch.object(github_client, '_http2_available', True), \
+             patch.object(github_client, 'httpx', fake_httpx):
+            client = GitHubClient(token="secret", http2=True)
+
+        assert client.get("repos/old/r").data == {'full_name': "new/r"}
+
+
+class TestGraphQLBackend:
+    """Test suite for the GraphQL repo_data backend."""
+
+    @staticmethod
+    def _history_page(start, count, has_next):
+        nodes = [{
+            'oid': f"{i:040x}",
+            'message': f"commit {i}",
+            'additions': i,
+            'deletions': 1,
+            'author': {'name': "dev", 'date': "2024-01-01T00:00:00Z"}
+        } for i in range(start, start + count)]
+        return {'repository': {
+            'name': "r",
+            'nameWithOwner': "o/r",
+            'stargazerCount': 10,
+            'primaryLanguage': {'name': "Python"},
+            'defaultBranchRef': {'target': {'history': {
+                'pageInfo': {'hasNextPage': has_next, 'endCursor': f"cursor{start + count}"},
+                'nodes': nodes
+            }}}
+        }}
+
+    def test_graphql_matches_rest_repo_data_shape(self):
+        """Test that paginated GraphQL history yields the REST repo_data shape."""
+        pages = [self._history_page(0, 100, True), self._history_page(100, 50, False)]
+        client = Mock(token="secret")
+
+        with patch.object(github_tools, 'get_github_client', return_value=client), \
+             patch.object(github_tools, '_fetch_history_page', side_effect=pages) as mock_fetch:
+            repo_data = github_tools.scrape_github_activity(
+                "https://github.com/o/r", max_commits=150, backend="graphql")
+
+        assert set(repo_data) >= {'repo_url', 'commits', 'metadata'}
+        assert len(repo_data['commits']) == 150
+        assert str(repo_data['commits'][0]).startswith("[0000000] commit 0 — dev @ ")
+        assert repo_data['commits'].has_stats
+        assert repo_data['metadata']['stars'] == 10
+        assert repo_data['metadata']['language'] == "Python"
+        assert mock_fetch.call_args_list[0].args[0]['after'] is None
+        assert mock_fetch.call_args_list[1].args[0]['after'] == "cursor100"
+        assert mock_fetch.call_args_list[1].args[0]['first'] == 50
+
+
+class TestRateLimitScheduler:
+    """Test suite for the shared rate-limit scheduler."""
+
+    @staticmethod
+    def _headers(remaining, reset_in=3600):
+        return {
+            'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Limit': "5000",
+            'X-RateLimit-Reset': str(int(time.time()) + reset_in),
+            'X-RateLimit-Resource': "core"
+        }
+
+    def test_rotates_to_token_with_most_budget(self, tmp_path):
+        """Test that the token with the largest remaining budget is used."""
+        scheduler = RateLimitScheduler(["a", "b"], store_path=str(tmp_path / "rl.sqlite"))
+        scheduler.update("a", self._headers(10))
+        scheduler.update("b", self._headers(900))
+
+        assert scheduler.acquire() == "b"
+
+    def test_budget_shared_through_store(self, tmp_path):
+        """Test that a second scheduler on the same store sees recorded budgets."""
+        store = str(tmp_path / "rl.sqlite")
+        RateLimitScheduler(["a", "b"], store_path=store).update("b", self._headers(0))
+        other = RateLimitScheduler(["a", "b"], store_path=store)
+
+        assert other.acquire() == "a"
+
+    def test_low_priority_degrades_when_budget_low(self, tmp_path):
+        """Test that low-priority calls are refused inside the reserve."""
+        scheduler = RateLimitScheduler(["a"], store_path=str(tmp_path / "rl.sqlite"),
+                                       reserve=100, max_wait=0)
+        scheduler.update("a", self._headers(50))
+
+        assert scheduler.acquire() == "a"
+        with pytest.raises(RateLimitExhausted):
+            scheduler.acquire(priority=PRIORITY_LOW)
+
+    def test_anonymous_pagination_fetches_every_page(self, tmp_path):
+        """Test that the reserve scales down to the 60-request anonymous quota."""
+        scheduler = RateLimitScheduler([], store_path=str(tmp_path / "rl.sqlite"))
+        client = GitHubClient(http2=False, scheduler=scheduler)
+        fetch, calls = _paged_api(total=250)
+
+        def get(url, params=None, headers=None, timeout=None):
+            items, links = fetch("o/r", params)
+            response = Mock(status_code=200, content=b"[]", links=links,
+                            headers={'Content-Type': "application/json"})
+            response.json.return_value = items
+            return response
+
+        with patch.object(client._client, 'get', side_effect=get), \
+             patch.object(github_tools, 'get_github_client', return_value=client):
+            commits = list(github_tools.iter_commits("https://github.com/o/r", max_commits=250))
+
+        assert len(commits) == 250
+        assert sorted(calls) == [1, 2, 3]
+
+
+_TRENDING_HTML = """
+<html><body><nav>ignored</nav>
+<article class="Box-row">
+  <h2><a href="/octo/first">octo / first</a></h2>
+  <p>The first repo</p>
+  <span itemprop="programmingLanguage">Python</span>
+  <a href="/octo/first/stargazers">12,345</a>
+  <span>1,024 stars today</span>
+</article>
+<article class="Box-row">
+  <h2><a href="/octo/second">octo / second</a></h2>
+  <a href="/octo/second/stargazers">99</a>
+</article>
+</body></html>
+"""
+
+
+class TestTrendingIndex:
+    """Test suite for the trending repository index."""
+
+    def test_parses_ranked_list(self):
+        """Test that every row of the page is kept with stars and description."""
+        repos = parse_trending_page(_TRENDING_HTML)
+
+        assert [r['full_name'] for r in repos] == ["octo/first", "octo/second"]
+        assert repos[0]['url'] == "https://github.com/octo/first"
+        assert repos[0]['description'] == "The first repo"
+        assert (repos[0]['stars'], repos[0]['period_stars']) == (12345, 1024)
+        assert repos[1]['rank'] == 2 and repos[1]['description'] == ""
+
+    def test_lookups_served_from_memory_and_disk(self, tmp_path):
+        """Test that a page is fetched once and reloaded from disk on restart."""
+        store_path = str(tmp_path / "trending.json")
+        fetch = Mock(return_value=parse_trending_page(_TRENDING_HTML))
+        index = TrendingIndex(fetch, store_path=store_path)
+
+        assert [r['full_name'] for r in index.top(2)] == ["octo/first", "octo/second"]
+        assert index.top(1)[0]['full_name'] == "octo/first"
+        fetch.assert_called_once_with("python", "daily")
+
+        restarted = TrendingIndex(Mock(side_effect=AssertionError("no fetch expected")), store_path=store_path)
+        assert restarted.top(1)[0]['stars'] == 12345
+
+    def test_stale_entry_served_when_refresh_fails(self, tmp_path):
+        """Test that a failed refresh falls back to the last known ranking."""
+        fetch = Mock(side_effect=[parse_trending_page(_TRENDING_HTML), ConnectionError("down")])
+        index = TrendingIndex(fetch, refresh_interval=0, store_path=None)
+
+        index.top(1)
+        assert index.top(1)[0]['full_name'] == "octo/first"
+        assert fetch.call_count == 2
+
+    def test_cold_start_fetches_each_page_once(self):
+        """Test that a first lookup racing the refresh thread shares its fetch."""
+        fetched = threading.Event()
+
+        def slow_fetch(language, since):
+            fetched.set()
+            time.sleep(0.2)
+            return parse_trending_page(_TRENDING_HTML)
+
+        fetch = Mock(side_effect=slow_fetch)
+        index = TrendingIndex(fetch, store_path=None)
+        index.start()
+        try:
+            fetched.wait(1)
+            assert index.top(1)[0]['full_name'] == "octo/first"
+        finally:
+            index.stop(1)
+        assert fetch.call_count == 1
+
+    def test_pages_outside_background_refresh_are_refreshed_on_lookup(self):
+        """Test that a stale page the refresh thread does not cover is refreshed by lookups."""
+        fetch = Mock(return_value=parse_trending_page(_TRENDING_HTML))
+        index = TrendingIndex(fetch, languages=["python"], windows=["daily"], refresh_interval=60, store_path=None)
+        index.top(1, language="rust")
+        index._entries[("rust", "daily")]['fetched_at'] -= 120
+
+        index.start()
+        try:
+            assert index.top(1, language="Rust")[0]['full_name'] == "octo/first"
+        finally:
+            index.stop(1)
+        assert [c.args for c in fetch.call_args_list].count(("Rust", "daily")) == 1
+        assert not index.is_stale("rust", "daily")
+
+    def test_find_trending_repos_uses_index(self, tmp_path):
+        """Test the top-k lookup and the single-repo helper built on it."""
+        index = TrendingIndex(Mock(return_value=parse_trending_page(_TRENDING_HTML)), store_path=None)
+        with patch.object(github_tools, 'get_trending_index', return_value=index):
+            assert len(github_tools.find_trending_repos(k=5)) == 2
+            assert github_tools.find_trending_repo() == "https://github.com/octo/first"
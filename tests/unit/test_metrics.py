@@ -0,0 +1,71 @@
+"""Unit tests for latency histograms."""
+
+from src.tools.decorators import instrument
+from src.tools.metrics import HistogramRegistry, get_histogram, registry
+
+
+class TestHistograms:
+    """Test suite for the histogram registry."""
+
+    def test_observe_fills_preallocated_buckets(self):
+        """Test that observations land in the right bucket."""
+        histogram = HistogramRegistry().histogram("latency", {"tool": "a"}, buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 1]
+        assert histogram.count == 4
+        assert 0.1 <= histogram.quantile(0.5) <= 1.0
+
+    def test_histograms_keyed_by_labels(self):
+        """Test that label sets get separate histograms regardless of order."""
+        metrics = HistogramRegistry()
+        first = metrics.histogram("latency", {"a": 1, "b": 2})
+        assert metrics.histogram("latency", {"b": 2, "a": 1}) is first
+        assert metrics.histogram("latency", {"a": 2, "b": 2}) is not first
+
+    def test_prometheus_export(self):
+        """Test that exported buckets are cumulative with a +Inf bucket."""
+        metrics = HistogramRegistry()
+        histogram = metrics.histogram("latency", {"tool": "x"}, buckets=(1.0,))
+        histogram.observe(0.5)
+        histogram.observe(2.0)
+
+        text = metrics.export_prometheus()
+        assert '# TYPE latency histogram' in text
+        assert 'latency_bucket{tool="x",le="1.0"} 1' in text
+        assert 'latency_bucket{tool="x",le="+Inf"} 2' in text
+        assert 'latency_count{tool="x"} 2' in text
+
+    def test_instrument_records_outcome(self):
+        """Test that the instrument decorator records ok and error calls."""
+        @instrument("test_instrument_seconds", stage="unit")
+        def maybe_fail(fail):
+            if fail:
+                raise RuntimeError("boom")
+            return "ok"
+
+        maybe_fail(False)
+        try:
+            maybe_fail(True)
+        except RuntimeError:
+            pass
+
+        labels = {"function": "maybe_fail", "stage": "unit"}
+        assert get_histogram("test_instrument_seconds", {**labels, "outcome": "ok"}).count == 1
+        assert get_histogram("test_instrument_seconds", {**labels, "outcome": "error"}).count == 1
+        assert any(s["name"] == "test_instrument_seconds" for s in registry.snapshot())
+
+    def test_reset_keeps_decorated_histograms_exported(self):
+        """Test that functions decorated before a reset still show up in the export."""
+        metrics = HistogramRegistry()
+        histogram = metrics.histogram("reset_seconds", {"tool": "x"}, buckets=(1.0,))
+        histogram.observe(0.5)
+
+        metrics.reset()
+        assert metrics.export_prometheus() == ""
+
+        histogram.observe(2.0)
+        text = metrics.export_prometheus()
+        assert 'reset_seconds_bucket{tool="x",le="1.0"} 0' in text
+        assert 'reset_seconds_count{tool="x"} 1' in text
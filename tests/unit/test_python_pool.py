@@ -0,0 +1,108 @@
+"""Unit tests for the warm Python worker pool and the REPL kernels."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from src.tools.python_pool import PythonWorkerPool, ReplKernelManager
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(size=1, preload=[], max_runs=3)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def kernels():
+    kernels = ReplKernelManager(max_kernels=2, idle_timeout=60, preload=[])
+    yield kernels
+    kernels.shutdown()
+
+
+class TestPythonWorkerPool:
+    """Test suite for PythonWorkerPool."""
+
+    def test_results_match_execute_python_code(self, pool):
+        """Test output capture, exit codes and tracebacks."""
+        result = pool.run("import sys\nprint('out')\nprint('err', file=sys.stderr)")
+        assert result == {"success": True, "stdout": "out\n", "stderr": "err\n", "return_code": 0,
+                          "executed_code": "import sys\nprint('out')\nprint('err', file=sys.stderr)"}
+
+        assert pool.run("import sys; sys.exit(3)")["return_code"] == 3
+        failed = pool.run("raise ValueError('bad input')")
+        assert not failed["success"] and failed["return_code"] == 1
+        assert failed["stderr"].startswith("Traceback") and "ValueError: bad input" in failed["stderr"]
+
+    def test_runs_do_not_share_namespaces(self, pool):
+        """Test that names defined by one run are gone in the next."""
+        assert pool.run("x = 1")["success"]
+        assert "NameError" in pool.run("print(x)")["stderr"]
+
+    def test_timeout_kills_worker_and_pool_recovers(self, pool):
+        """Test that a timed-out run is reported and the next run gets a new worker."""
+        pid = pool.run("import os; print(os.getpid())")["stdout"]
+
+        result = pool.run("import time; time.sleep(10)", timeout=0.5)
+
+        assert result["stderr"] == "Execution timeout after 0.5 seconds" and result["return_code"] == -1
+        after = pool.run("import os; print(os.getpid())")
+        assert after["success"] and after["stdout"] != pid
+
+    def test_workers_are_recycled_after_max_runs(self, pool):
+        """Test that a worker is replaced once it has served max_runs runs."""
+        pids = [pool.run("import os; print(os.getpid())")["stdout"] for _ in range(4)]
+
+        assert pids[0] == pids[1] == pids[2] != pids[3]
+
+
+class TestReplKernelManager:
+    """Test suite for session-scoped REPL kernels."""
+
+    def test_sessions_keep_their_own_state(self, kernels):
+        """Test that variables persist within a session and stay out of others."""
+        kernels.execute("a", "x = 1")
+        kernels.execute("b", "x = 2")
+
+        result = kernels.execute("a", "x += 10\nprint(x)")
+        assert result == {"success": True, "stdout": "11\n", "stderr": "", "executed_code": "x += 10\nprint(x)"}
+        assert kernels.execute("b", "print(x)")["stdout"] == "2\n"
+        assert not kernels.execute("a", "undefined_name")["success"]
+
+    def test_concurrent_sessions_do_not_mix_output(self, kernels):
+        """Test that sessions running at the same time capture only their own output."""
+        code = "import time\nfor i in range(5):\n    print(name)\n    time.sleep(0.01)"
+        kernels.execute("a", "name = 'a'")
+        kernels.execute("b", "name = 'b'")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            outputs = list(executor.map(lambda sid: kernels.execute(sid, code)["stdout"], ["a", "b"]))
+
+        assert outputs == ["a\n" * 5, "b\n" * 5]
+
+    def test_least_recently_used_session_is_reclaimed(self, kernels):
+        """Test that the cap on live kernels reclaims the oldest session."""
+        for session_id in ["a", "b"]:
+            kernels.execute(session_id, f"name = '{session_id}'")
+        kernels.execute("a", "pass")
+        kernels.execute("c", "name = 'c'")
+
+        assert len(kernels) == 2
+        assert kernels.execute("a", "print(name)")["stdout"] == "a\n"
+        assert "NameError" in kernels.execute("b", "print(name)")["stderr"]
+
+    def test_idle_eviction_reset_and_timeout(self, kernels):
+        """Test that idle, reset and timed-out sessions start over empty."""
+        kernels.execute("a", "x = 1")
+        kernels.execute("b", "x = 1")
+        kernels.idle_timeout = 0.05
+        time.sleep(0.1)
+        kernels.execute("b", "pass")
+
+        assert kernels.evict_idle() == 1 and len(kernels) == 1
+        assert kernels.reset("b") and not kernels.reset("b")
+
+        kernels.execute("a", "x = 1")
+        timed_out = kernels.execute("a", "import time; time.sleep(10)", timeout=0.5)
+        assert timed_out["stderr"].startswith("Execution timeout after 0.5 seconds")
+        assert "NameError" in kernels.execute("a", "print(x)")["stderr"]
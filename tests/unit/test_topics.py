@@ -0,0 +1,58 @@
+"""Unit tests for the TF-IDF topic corpus."""
+
+import os
+from collections import Counter
+from unittest.mock import patch
+from src.tools import analysis_tools
+from src.tools.analysis_tools import generate_topics_chart
+from src.tools.commit_table import CommitTable
+from src.tools.topics import TopicCorpus
+
+
+def _repos():
+    return {
+        "https://github.com/o/web": Counter(merge=40, update=30, router=12, template=6),
+        "https://github.com/o/db": Counter(merge=35, update=25, index=10, vacuum=8),
+        "https://github.com/o/ml": Counter(merge=50, update=20, tensor=9, gradient=5),
+    }
+
+
+class TestTopicCorpus:
+    """Test suite for TopicCorpus."""
+
+    def test_distinctive_terms_outrank_common_ones(self, tmp_path):
+        """Test that words every repository uses drop below its own terms."""
+        corpus = TopicCorpus(str(tmp_path))
+        for repo_url, counts in _repos().items():
+            corpus.add(repo_url, counts)
+
+        terms = [term for term, _ in corpus.top_terms("https://github.com/o/web", 4)]
+        assert terms[:2] == ["router", "template"]
+        assert corpus.top_terms("https://github.com/o/unknown") == []
+
+    def test_incremental_updates_and_persistence(self, tmp_path):
+        """Test that re-adding replaces a document and a new corpus reloads from disk."""
+        corpus = TopicCorpus(str(tmp_path))
+        for repo_url, counts in _repos().items():
+            corpus.add(repo_url, counts)
+        corpus.add("https://github.com/o/web", Counter(merge=5, websocket=3))
+
+        reloaded = TopicCorpus(str(tmp_path))
+        assert len(reloaded) == 3
+        assert reloaded.top_terms("https://github.com/o/web") == corpus.top_terms("https://github.com/o/web")
+        assert reloaded.top_terms("https://github.com/o/web")[0][0] == "websocket"
+        assert "router" not in dict(corpus.top_terms("https://github.com/o/web"))
+
+    def test_topics_chart_uses_corpus_for_known_repositories(self, tmp_path):
+        """Test that the chart ranks by TF-IDF when given a repository URL."""
+        corpus = TopicCorpus(None)
+        corpus.add("https://github.com/o/other", Counter(merge=9, update=9))
+        table = CommitTable()
+        for i, message in enumerate(["Merge update", "Merge parser", "Merge parser"]):
+            table.append(f"{i:040d}", "ann", 1704067200, message)
+
+        with patch.object(analysis_tools, 'get_topic_corpus', return_value=corpus):
+            path = generate_topics_chart(table, str(tmp_path), "vega", repo_url="https://github.com/o/repo")
+
+        assert os.path.exists(path)
+        assert corpus.top_terms("https://github.com/o/repo", 1)[0][0] == "parser"